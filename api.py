@@ -0,0 +1,353 @@
+"""Headless JSON API over the farming services, for SMS and IVR integrations.
+
+Run from the repository root:
+    python api.py
+"""
+
+import os
+import json
+import wave
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from dotenv import load_dotenv
+from PIL import Image
+import speech_recognition as sr
+import tornado.web
+import tornado.ioloop
+
+# Load environment variables
+load_dotenv()
+
+from config.languages import SUPPORTED_LANGUAGES
+from services.registry import SERVICES, load_service
+from utils.metrics import render_prometheus
+
+logger = logging.getLogger(__name__)
+
+class Overloaded(Exception):
+    """A worker pool has no room for another call."""
+
+class WorkerPool:
+    """Bounded thread pool for blocking service calls.
+    
+    At most `workers` calls run and `queue_size` more wait; beyond that a
+    call is refused at once, so overload turns into fast 503s instead of
+    an ever-growing queue. A call that times out keeps its slot until its
+    thread actually finishes.
+    """
+    
+    def __init__(self, name, workers, queue_size):
+        self.name = name
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f'api-{name}')
+        self.slots = threading.BoundedSemaphore(workers + queue_size)
+    
+    async def run(self, timeout, function, *args):
+        """Run function(*args) on the pool and await it for up to timeout seconds."""
+        if not self.slots.acquire(blocking=False):
+            raise Overloaded(self.name)
+        
+        try:
+            future = self.executor.submit(function, *args)
+        except BaseException:
+            self.slots.release()
+            raise
+        future.add_done_callback(lambda _: self.slots.release())
+        
+        return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+
+# Network-bound calls (weather, soil, chat, translation, speech) and
+# CPU-bound model inference get separate pools so one cannot starve the other
+POOLS = {
+    'io': WorkerPool('io', int(os.getenv('API_IO_WORKERS', '64')), int(os.getenv('API_IO_QUEUE', '256'))),
+    'model': WorkerPool('model', int(os.getenv('API_MODEL_WORKERS', '2')), int(os.getenv('API_MODEL_QUEUE', '16')))
+}
+
+class BaseHandler(tornado.web.RequestHandler):
+    """JSON request and error handling shared by every endpoint."""
+    
+    timeout = float(os.getenv('API_TIMEOUT', '30'))
+    
+    def set_default_headers(self):
+        self.set_header('Content-Type', 'application/json; charset=utf-8')
+    
+    def write_error(self, status_code, **kwargs):
+        if status_code == 503:
+            self.set_header('Retry-After', '1')
+        # Send the message the error was raised with, as Tornado does for a missing argument
+        error = kwargs.get('exc_info', (None, None, None))[1]
+        if isinstance(error, tornado.web.HTTPError) and error.log_message:
+            self.finish({'error': error.log_message % error.args})
+        else:
+            self.finish({'error': self._reason})
+    
+    def write_json(self, data):
+        self.finish(json.dumps(data, ensure_ascii=False, default=str))
+    
+    def json_body(self):
+        """Parse the JSON request body."""
+        try:
+            body = json.loads(self.request.body or b'{}')
+        except ValueError:
+            raise tornado.web.HTTPError(400, "Request body must be JSON")
+        if not isinstance(body, dict):
+            raise tornado.web.HTTPError(400, "Request body must be a JSON object")
+        return body
+    
+    def language(self, value=None):
+        """Validate a language code, defaulting to English."""
+        language = value or self.get_argument('lang', 'en')
+        if not isinstance(language, str) or language not in SUPPORTED_LANGUAGES:
+            raise tornado.web.HTTPError(400, f"Unsupported language: {language}")
+        return language
+    
+    def text_field(self, body, name, required=False):
+        """Read a string field of a JSON body, stripped; missing fields are ''."""
+        value = body.get(name)
+        if value is None:
+            value = ''
+        if not isinstance(value, str):
+            raise tornado.web.HTTPError(400, f"{name} must be a string")
+        value = value.strip()
+        if required and not value:
+            raise tornado.web.HTTPError(400, f"{name} is required")
+        return value
+    
+    def coordinates(self, lat=None, lon=None, names=('lat', 'lon')):
+        """Check a latitude and longitude, read from the lat and lon query arguments unless given."""
+        try:
+            if lat is None and lon is None:
+                lat, lon = self.get_argument('lat'), self.get_argument('lon')
+            lat, lon = float(lat), float(lon)
+        except (TypeError, ValueError):
+            raise tornado.web.HTTPError(400, "%s and %s must be numbers", *names)
+        if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+            raise tornado.web.HTTPError(400, "%s or %s out of range", *names)
+        return lat, lon
+    
+    async def call(self, pool, function, *args, timeout=None):
+        """Run a blocking service call, mapping overload and timeouts to HTTP errors."""
+        try:
+            return await POOLS[pool].run(timeout or self.timeout, function, *args)
+        except Overloaded:
+            raise tornado.web.HTTPError(503, "Server busy, retry shortly")
+        except asyncio.TimeoutError:
+            raise tornado.web.HTTPError(504, "Service timed out")
+
+class HealthHandler(BaseHandler):
+    async def get(self):
+        self.write_json({'status': 'ok'})
+
+class MetricsHandler(BaseHandler):
+    """Prometheus scrape endpoint."""
+    
+    async def get(self):
+        self.set_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.finish(render_prometheus())
+
+class WeatherHandler(BaseHandler):
+    async def get(self):
+        lat, lon = self.coordinates()
+        language = self.language()
+        weather_service = load_service('weather')
+        
+        def work():
+            weather_data = weather_service.get_current_weather(lat, lon)
+            if not weather_data:
+                return None
+            return {'weather': weather_data, 'summary': weather_service.format_weather_for_farmers(weather_data, language)}
+        
+        result = await self.call('io', work)
+        if result is None:
+            raise tornado.web.HTTPError(502, "Weather data unavailable")
+        self.write_json(result)
+
+class ForecastHandler(BaseHandler):
+    async def get(self):
+        lat, lon = self.coordinates()
+        try:
+            days = min(max(int(self.get_argument('days', '5')), 1), 5)
+        except ValueError:
+            raise tornado.web.HTTPError(400, "days must be a number")
+        
+        forecast_data = await self.call('io', load_service('weather').get_weather_forecast, lat, lon, days)
+        if not forecast_data:
+            raise tornado.web.HTTPError(502, "Forecast data unavailable")
+        self.write_json(forecast_data)
+
+class SoilHandler(BaseHandler):
+    async def get(self):
+        lat, lon = self.coordinates()
+        language = self.language()
+        soil_service = load_service('soil')
+        
+        def work():
+            soil_data = soil_service.get_soil_data(lat, lon)
+            if not soil_data:
+                return None
+            return {'soil': soil_data, 'summary': soil_service.interpret_soil_data(soil_data, language)}
+        
+        result = await self.call('io', work)
+        if result is None:
+            raise tornado.web.HTTPError(502, "Soil data unavailable")
+        self.write_json(result)
+
+class DiseaseHandler(BaseHandler):
+    """POST an image (raw body or multipart field "image")."""
+    
+    async def post(self):
+        language = self.language()
+        files = self.request.files.get('image')
+        data = files[0]['body'] if files else self.request.body
+        try:
+            image = Image.open(BytesIO(data))
+            image.load()
+        except Exception:
+            raise tornado.web.HTTPError(400, "Body must be a JPEG or PNG image")
+        
+        disease_detection_service = load_service('disease_detection')
+        predictions = await self.call('model', disease_detection_service.detect_disease, image)
+        if not predictions:
+            raise tornado.web.HTTPError(502, "Disease detection unavailable")
+        self.write_json({
+            'predictions': predictions,
+            'summary': disease_detection_service.format_detection_results(predictions, language)
+        })
+
+class ChatHandler(BaseHandler):
+    """POST {"query", "language", "history", "latitude", "longitude"}.
+    
+    history is earlier conversation text, as one string or a list of lines.
+    """
+    
+    async def post(self):
+        body = self.json_body()
+        query = self.text_field(body, 'query', required=True)
+        language = self.language(body.get('language'))
+        history = body.get('history')
+        if isinstance(history, list) and all(isinstance(line, str) for line in history):
+            history = '\n'.join(history)
+        elif history is not None and not isinstance(history, str):
+            raise tornado.web.HTTPError(400, "history must be a string or a list of strings")
+        location = None
+        if body.get('latitude') is not None and body.get('longitude') is not None:
+            lat, lon = self.coordinates(body['latitude'], body['longitude'], ('latitude', 'longitude'))
+            location = {'latitude': lat, 'longitude': lon}
+        
+        ai_chat_service = load_service('ai_chat')
+        context_assembler = load_service('context')
+        
+        def work():
+            intent = ai_chat_service.detect_intent(query)
+            context = context_assembler.gather(intent, location)
+            response = ai_chat_service.get_farming_response(query, language, context, None, history or None)
+            return {'response': response, 'intent': intent}
+        
+        self.write_json(await self.call('io', work))
+
+class TranslateHandler(BaseHandler):
+    """POST {"text", "target", "source"}."""
+    
+    async def post(self):
+        body = self.json_body()
+        text = self.text_field(body, 'text', required=True)
+        target = self.language(body.get('target'))
+        source = body.get('source') or 'auto'
+        if source != 'auto':
+            source = self.language(source)
+        
+        translator_service = load_service('translator')
+        try:
+            translated = await self.call('io', translator_service.translate, text, target, source)
+        except tornado.web.HTTPError:
+            raise
+        except Exception as e:
+            # Untranslated text would look like a successful answer to the client
+            logger.warning("Translation failed: %s", e)
+            raise tornado.web.HTTPError(502, "Translation unavailable")
+        self.write_json({'text': translated, 'source': translator_service.detect_language(text)})
+
+class SpeechHandler(BaseHandler):
+    """POST {"text", "language", "low_bandwidth"}; responds with MP3 audio."""
+    
+    async def post(self):
+        body = self.json_body()
+        text = self.text_field(body, 'text', required=True)
+        language = self.language(body.get('language'))
+        
+        voice_service = load_service('voice')
+        audio_data = await self.call('io', voice_service.text_to_speech, text, language, bool(body.get('low_bandwidth')))
+        if not audio_data:
+            raise tornado.web.HTTPError(502, "Speech synthesis unavailable")
+        self.set_header('Content-Type', 'audio/mpeg')
+        self.finish(audio_data)
+
+class TranscribeHandler(BaseHandler):
+    """POST WAV audio; responds with the transcript."""
+    
+    async def post(self):
+        language = self.language()
+        voice_service = load_service('voice')
+        
+        def work():
+            transcript = ''
+            for transcript in voice_service.transcribe_stream(self.request.body, language):
+                pass
+            return transcript
+        
+        try:
+            transcript = await self.call('io', work)
+        except (wave.Error, EOFError, ValueError, KeyError) as e:
+            raise tornado.web.HTTPError(400, f"Body must be WAV audio: {e}")
+        except (sr.RequestError, OSError) as e:
+            # The recognition service is down, or the local model is missing
+            logger.warning("Speech recognition failed: %s", e)
+            raise tornado.web.HTTPError(502, "Speech recognition unavailable")
+        self.write_json({'transcript': transcript})
+
+class ReportHandler(BaseHandler):
+    async def get(self):
+        lat, lon = self.coordinates()
+        language = self.language()
+        
+        farm_report_service = load_service('report')
+        report = await self.call(
+            'io', farm_report_service.build, {'latitude': lat, 'longitude': lon}, language,
+            timeout=farm_report_service.deadline + 5
+        )
+        report.pop('charts', None)
+        self.write_json(report)
+
+def make_app():
+    """Build the Tornado application."""
+    return tornado.web.Application([
+        (r'/health', HealthHandler),
+        (r'/metrics', MetricsHandler),
+        (r'/v1/weather', WeatherHandler),
+        (r'/v1/forecast', ForecastHandler),
+        (r'/v1/soil', SoilHandler),
+        (r'/v1/disease', DiseaseHandler),
+        (r'/v1/chat', ChatHandler),
+        (r'/v1/translate', TranslateHandler),
+        (r'/v1/speech', SpeechHandler),
+        (r'/v1/transcribe', TranscribeHandler),
+        (r'/v1/report', ReportHandler)
+    ])
+
+def main():
+    logging.basicConfig(level=logging.INFO)
+    
+    # Nobody waits on a first page here, so build every service before serving
+    for name in SERVICES:
+        load_service(name)
+    
+    port = int(os.getenv('API_PORT', '8000'))
+    app = make_app()
+    app.listen(port, os.getenv('API_HOST', '0.0.0.0'), max_body_size=int(float(os.getenv('API_MAX_BODY_MB', '10')) * 1024 * 1024))
+    logger.info("Farming API listening on port %d", port)
+    tornado.ioloop.IOLoop.current().start()
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
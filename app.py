@@ -5,19 +5,18 @@ import os
 from dotenv import load_dotenv
 from PIL import Image
 import io
+import hashlib
 
 # Load environment variables
 load_dotenv()
 
-# Import services
+# Import services; each is constructed on first use and shared by every session
 from config.languages import SUPPORTED_LANGUAGES
-from utils.translation import translator_service
 from utils.location import get_location_input
-from utils.voice import voice_service
-from services.weather import weather_service
-from services.soil import soil_service
-from services.disease_detection import disease_detection_service
-from services.ai_chat import ai_chat_service
+from audio_recorder_streamlit import audio_recorder
+from services.registry import get_service
+from services.conversation import ConversationMemory, prune_spill_files
+from utils.session_memory import session_memory
 
 # Page configuration
 st.set_page_config(
@@ -33,8 +32,13 @@ def initialize_session_state():
         st.session_state.language = 'en'
     if 'location' not in st.session_state:
         st.session_state.location = None
-    if 'chat_history' not in st.session_state:
-        st.session_state.chat_history = []
+    if 'conversation' not in st.session_state:
+        prune_spill_files()
+        st.session_state.conversation = ConversationMemory()
+    if 'last_diagnosis' not in st.session_state:
+        st.session_state.last_diagnosis = None
+    if 'low_data_mode' not in st.session_state:
+        st.session_state.low_data_mode = os.getenv('TTS_LOW_BANDWIDTH', 'false').lower() == 'true'
 
 def language_selector():
     """Language selection interface."""
@@ -54,6 +58,10 @@ def language_selector():
         st.session_state.language = selected_language
         st.rerun()
 
+def audio_settings():
+    """Audio delivery settings."""
+    st.sidebar.checkbox("📶 Low data mode (smaller voice replies)", key='low_data_mode')
+
 def location_setup():
     """Location setup interface."""
     if not st.session_state.location:
@@ -64,37 +72,53 @@ def location_setup():
             st.session_state.show_location_setup = True
     else:
         location = st.session_state.location
-        st.sidebar.success(f"📍 Location: {location.get('city', 'Unknown')}")
+        st.sidebar.success(f"📍 Location: {location.get('city') or location.get('address', 'Unknown')}")
         if st.sidebar.button("📍 Change Location"):
             st.session_state.location = None
             st.rerun()
 
 def voice_interface():
-    """Voice input interface."""
+    """Voice input interface; returns a newly asked question, if any."""
     lang = st.session_state.language
-    ui_text = translator_service.get_ui_text
+    ui_text = get_service('translator').get_ui_text
     
     st.subheader(f"🎤 {ui_text('speak_request', lang)}")
     
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        if st.button(ui_text('speak_button', lang), type="primary"):
-            st.session_state.listening = True
+    # Record in the browser; the server needs no microphone
+    audio_bytes = audio_recorder(text=ui_text('speak_button', lang), sample_rate=16000, key="voice_recorder")
     
-    with col2:
-        if st.button(ui_text('stop_button', lang)):
-            st.session_state.listening = False
+    # Only a digest of the last recording is kept; the widget already holds the audio
+    recording = hashlib.sha1(audio_bytes).hexdigest() if audio_bytes else None
+    if recording and recording != st.session_state.get('last_recording'):
+        st.session_state.last_recording = recording
+        transcript_placeholder = st.empty()
+        transcript = ''
+        
+        with st.spinner(ui_text('processing', lang)):
+            try:
+                # Show the transcript as each utterance is recognized
+                for transcript in get_service('voice').transcribe_stream(audio_bytes, lang):
+                    transcript_placeholder.info(f"🎤 {transcript}")
+            except Exception as e:
+                st.error(f"Speech recognition error: {e}")
+        
+        if transcript:
+            return transcript
+        st.warning("Could not understand audio")
     
     # Text input as alternative
     text_input = st.text_input("Or type your question:", key="text_query")
+    if text_input and text_input != st.session_state.get('last_text_query'):
+        st.session_state.last_text_query = text_input
+        return text_input
     
-    return text_input
+    return None
 
+@session_memory.fragment
 def disease_detection_interface():
     """Disease detection interface."""
     lang = st.session_state.language
-    ui_text = translator_service.get_ui_text
+    ui_text = get_service('translator').get_ui_text
     
     st.subheader(f"📸 {ui_text('disease_title', lang)}")
     
@@ -112,25 +136,27 @@ def disease_detection_interface():
         if st.button("🔍 Analyze Image", type="primary"):
             with st.spinner(ui_text('processing', lang)):
                 # Detect disease
-                predictions = disease_detection_service.detect_disease(image)
+                predictions = get_service('disease_detection').detect_disease(image)
                 
                 if predictions:
+                    # Remember the top prediction for chat context
+                    st.session_state.last_diagnosis = predictions[0]
+                    
                     # Display results
-                    results = disease_detection_service.format_detection_results(predictions, lang)
+                    results = get_service('disease_detection').format_detection_results(predictions, lang)
                     st.success("Analysis Complete!")
                     st.text_area("Results:", results, height=200)
                     
-                    # Generate voice response
-                    audio_data = voice_service.text_to_speech(results, lang)
-                    if audio_data:
-                        voice_service.play_audio_in_streamlit(audio_data)
+                    # Speak the response, starting with the first sentence
+                    get_service('voice').speak(results, lang, st.session_state.low_data_mode)
                 else:
                     st.error(ui_text('error', lang))
 
+@session_memory.fragment
 def weather_interface():
     """Weather information interface."""
     lang = st.session_state.language
-    ui_text = translator_service.get_ui_text
+    ui_text = get_service('translator').get_ui_text
     
     if not st.session_state.location:
         st.warning(ui_text('no_location', lang))
@@ -144,37 +170,32 @@ def weather_interface():
     if st.button("🌤️ Get Weather Update", type="primary"):
         with st.spinner(ui_text('processing', lang)):
             # Get current weather
-            weather_data = weather_service.get_current_weather(lat, lon)
+            weather_data = get_service('weather').get_current_weather(lat, lon)
             
             if weather_data:
                 # Format for farmers
-                weather_summary = weather_service.format_weather_for_farmers(weather_data, lang)
-                
-                # Translate if needed
-                if lang != 'en':
-                    weather_summary = translator_service.translate_text(weather_summary, lang)
+                weather_summary = get_service('weather').format_weather_for_farmers(weather_data, lang)
                 
                 st.success("Weather Update:")
                 st.text_area("Weather Information:", weather_summary, height=200)
                 
                 # Get forecast and create chart
-                forecast_data = weather_service.get_weather_forecast(lat, lon)
+                forecast_data = get_service('weather').get_weather_forecast(lat, lon)
                 if forecast_data:
-                    chart = weather_service.create_weather_chart(forecast_data)
+                    chart = get_service('weather').create_weather_chart(forecast_data)
                     if chart:
                         st.plotly_chart(chart, use_container_width=True)
                 
-                # Generate voice response
-                audio_data = voice_service.text_to_speech(weather_summary, lang)
-                if audio_data:
-                    voice_service.play_audio_in_streamlit(audio_data)
+                # Speak the response, starting with the first sentence
+                get_service('voice').speak(weather_summary, lang, st.session_state.low_data_mode)
             else:
                 st.error(ui_text('error', lang))
 
+@session_memory.fragment
 def soil_interface():
     """Soil analysis interface."""
     lang = st.session_state.language
-    ui_text = translator_service.get_ui_text
+    ui_text = get_service('translator').get_ui_text
     
     if not st.session_state.location:
         st.warning(ui_text('no_location', lang))
@@ -188,15 +209,11 @@ def soil_interface():
     if st.button("🌱 Analyze Soil", type="primary"):
         with st.spinner(ui_text('processing', lang)):
             # Get soil data
-            soil_data = soil_service.get_soil_data(lat, lon)
+            soil_data = get_service('soil').get_soil_data(lat, lon)
             
             if soil_data:
                 # Interpret soil data
-                soil_analysis = soil_service.interpret_soil_data(soil_data, lang)
-                
-                # Translate if needed
-                if lang != 'en':
-                    soil_analysis = translator_service.translate_text(soil_analysis, lang)
+                soil_analysis = get_service('soil').interpret_soil_data(soil_data, lang)
                 
                 st.success("Soil Analysis Complete:")
                 st.text_area("Soil Analysis:", soil_analysis, height=200)
@@ -205,88 +222,176 @@ def soil_interface():
                 col1, col2 = st.columns(2)
                 
                 with col1:
-                    texture_chart = soil_service.create_soil_chart(soil_data)
+                    texture_chart = get_service('soil').create_soil_chart(soil_data)
                     if texture_chart:
                         st.plotly_chart(texture_chart, use_container_width=True)
                 
                 with col2:
-                    properties_chart = soil_service.create_soil_properties_chart(soil_data)
+                    properties_chart = get_service('soil').create_soil_properties_chart(soil_data)
                     if properties_chart:
                         st.plotly_chart(properties_chart, use_container_width=True)
                 
-                # Generate voice response
-                audio_data = voice_service.text_to_speech(soil_analysis, lang)
-                if audio_data:
-                    voice_service.play_audio_in_streamlit(audio_data)
+                # Speak the response, starting with the first sentence
+                get_service('voice').speak(soil_analysis, lang, st.session_state.low_data_mode)
             else:
                 st.error(ui_text('error', lang))
 
-def chat_interface():
-    """AI chat interface."""
+@session_memory.fragment
+def farm_report_interface():
+    """Farm report interface: every section in one go."""
     lang = st.session_state.language
-    ui_text = translator_service.get_ui_text
+    ui_text = get_service('translator').get_ui_text
     
-    st.subheader(f"🤖 {ui_text('advisory_title', lang)}")
+    if not st.session_state.location:
+        st.warning(ui_text('no_location', lang))
+        return
     
-    # Display chat history
-    for message in st.session_state.chat_history:
-        with st.chat_message(message["role"]):
-            st.write(message["content"])
+    st.subheader("📋 Farm Report")
     
-    # Chat input
-    if prompt := st.chat_input("Ask your farming question..."):
-        # Add user message to chat history
-        st.session_state.chat_history.append({"role": "user", "content": prompt})
+    uploaded_files = st.file_uploader(
+        f"{ui_text('upload_image', lang)} (optional)",
+        type=['jpg', 'jpeg', 'png'],
+        accept_multiple_files=True,
+        key="report_images"
+    )
+    
+    built = st.button("📋 Get Farm Report", type="primary")
+    if built:
+        with st.spinner(ui_text('processing', lang)):
+            images = [Image.open(uploaded_file) for uploaded_file in uploaded_files or []]
+            
+            # Weather, soil, disease and advice are fetched concurrently
+            report = get_service('report').build(st.session_state.location, lang, images)
         
-        with st.chat_message("user"):
-            st.write(prompt)
+        if not report['summary']:
+            session_memory.pop('farm_report')
+            st.error(ui_text('error', lang))
+            return
         
-        # Get AI response
-        with st.chat_message("assistant"):
-            with st.spinner(ui_text('processing', lang)):
-                # Detect intent
-                intent = ai_chat_service.detect_intent(prompt)
-                
-                # Get context based on intent
-                context = None
-                if intent == 'weather' and st.session_state.location:
-                    location = st.session_state.location
-                    weather_data = weather_service.get_current_weather(
-                        location['latitude'], location['longitude']
-                    )
-                    if weather_data:
-                        context = f"Current weather: {weather_data['weather'][0]['description']}, {weather_data['main']['temp']}°C"
-                
-                # Get AI response
-                response = ai_chat_service.get_farming_response(prompt, lang, context)
-                
-                # Translate if needed
-                if lang != 'en':
-                    response = translator_service.translate_text(response, lang)
-                
-                st.write(response)
-                
-                # Add assistant response to chat history
-                st.session_state.chat_history.append({"role": "assistant", "content": response})
-                
-                # Generate voice response
-                audio_data = voice_service.text_to_speech(response, lang)
-                if audio_data:
-                    voice_service.play_audio_in_streamlit(audio_data)
+        # Kept so the report survives reruns; spilled to disk when the session is over budget
+        session_memory.put('farm_report', report)
+    
+    report = session_memory.get('farm_report')
+    if report:
+        slowest = max((name for name in report['timings'] if name != 'total'), key=report['timings'].get)
+        st.caption(f"Ready in {report['timings']['total']:.1f}s (slowest: {slowest})")
+        
+        sections = [
+            ('weather_title', report['weather']),
+            ('soil_title', report['soil']),
+            *[('disease_title', text) for text in report['diseases']],
+            ('advisory_title', report['advice'])
+        ]
+        for index, (heading, text) in enumerate(sections):
+            if text:
+                st.text_area(ui_text(heading, lang), text.strip(), height=200, key=f"report_section_{index}")
+        
+        for chart in report['charts']:
+            st.plotly_chart(chart, use_container_width=True)
+        
+        if report['missing']:
+            st.warning(f"Not available right now: {', '.join(report['missing'])}")
+        
+        # One spoken summary when the report is new, starting with the first sentence
+        if built:
+            get_service('voice').speak(report['summary'], lang, st.session_state.low_data_mode)
+
+def answer_question(prompt):
+    """Answer a chat question and add the exchange to the chat history."""
+    lang = st.session_state.language
+    ui_text = get_service('translator').get_ui_text
+    
+    conversation = st.session_state.conversation
+    
+    # Detect the input language once, locally
+    input_language = get_service('translator').detect_language(prompt, lang)
+    
+    # Earlier turns, packed to the prompt budget, so follow-ups make sense
+    history = conversation.prompt_history()
+    
+    with st.chat_message("user"):
+        st.write(prompt)
+    
+    # Get AI response
+    with st.chat_message("assistant"):
+        with st.spinner(ui_text('processing', lang)):
+            # Detect intent
+            intent = get_service('ai_chat').detect_intent(prompt)
+            
+            # Gather context for the intent in parallel, within the deadline
+            context = get_service('context').gather(
+                intent,
+                st.session_state.location,
+                st.session_state.last_diagnosis
+            )
+            
+            # Get AI response, generated in the selected language
+            response = get_service('ai_chat').get_farming_response(prompt, lang, context, input_language, history)
+            
+            st.write(response)
+            
+            # Speak the response, starting with the first sentence
+            get_service('voice').speak(response, lang, st.session_state.low_data_mode)
+    
+    conversation.add("user", prompt, input_language)
+    conversation.add("assistant", response, lang)
+
+@session_memory.fragment
+def voice_chat_interface():
+    """Voice chat tab; answers the question asked by voice or typed."""
+    question = voice_interface()
+    if question:
+        answer_question(question)
+
+@session_memory.fragment
+def chat_interface():
+    """AI chat interface."""
+    lang = st.session_state.language
+    ui_text = get_service('translator').get_ui_text
+    
+    st.subheader(f"🤖 {ui_text('advisory_title', lang)}")
+    
+    conversation = st.session_state.conversation
+    if len(conversation) and st.button("🗑️ Clear chat"):
+        # Also deletes the earlier messages kept on disk
+        conversation.clear()
+    if conversation.spilled:
+        st.caption(f"{conversation.spilled} earlier messages are summarized for the assistant")
+    
+    # Recent messages are one Markdown block, built as messages arrive,
+    # so a rerun costs the same however long the chat gets
+    if conversation.transcript:
+        st.markdown(conversation.transcript)
+    exchange = st.container()
+    
+    with st.form("chat_form", clear_on_submit=True):
+        prompt = st.text_input("Ask your farming question...", key="chat_prompt")
+        submitted = st.form_submit_button("Send")
+    
+    if submitted and prompt:
+        with exchange:
+            answer_question(prompt)
 
 def main():
     """Main application function."""
     initialize_session_state()
     
+    # Measure this session's large entries and keep them within budget;
+    # fragment reruns track them at the end of the fragment
+    session_memory.track()
+    
     # Language selector in sidebar
     language_selector()
     
     # Location setup in sidebar
     location_setup()
     
+    # Audio settings in sidebar
+    audio_settings()
+    
     # Main title
     lang = st.session_state.language
-    ui_text = translator_service.get_ui_text
+    ui_text = get_service('translator').get_ui_text
     
     st.title(ui_text('app_title', lang))
     st.markdown(ui_text('welcome', lang))
@@ -300,7 +405,8 @@ def main():
         return
     
     # Main interface tabs
-    tab1, tab2, tab3, tab4, tab5 = st.tabs([
+    tab0, tab1, tab2, tab3, tab4, tab5 = st.tabs([
+        "📋 Farm Report",
         "🎤 Voice Chat",
         "📸 Disease Detection", 
         "🌦️ Weather",
@@ -308,9 +414,12 @@ def main():
         "💬 AI Chat"
     ])
     
+    # Each tab is a fragment, so its widgets rerun only that tab
+    with tab0:
+        farm_report_interface()
+    
     with tab1:
-        voice_interface()
-        chat_interface()
+        voice_chat_interface()
     
     with tab2:
         disease_detection_interface()
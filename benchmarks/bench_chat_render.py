@@ -0,0 +1,81 @@
+"""Benchmark script time per chat interaction as the history grows.
+
+Run from the repository root:
+    python -m benchmarks.bench_chat_render
+
+The replay and transcript buffer columns hold the whole history in
+memory, so they compare the two ways of rendering it at every length.
+The full app keeps only the last CHAT_WINDOW_MESSAGES verbatim, so its
+column shows what a session costs with a bounded window, not the cost
+of the buffer itself.
+"""
+
+import tempfile
+from streamlit.testing.v1 import AppTest
+from services.conversation import ConversationMemory
+from benchmarks.script_timing import SCRIPT_TIMES
+
+HISTORY_LENGTHS = [0, 20, 100, 500, 2000]
+
+def replay_history():
+    """Chat rendering before the transcript buffer: one chat message per turn."""
+    import streamlit as st
+    
+    for message in st.session_state.chat_history:
+        with st.chat_message(message["role"]):
+            st.write(message["content"])
+
+def render_transcript():
+    """Chat rendering from the conversation memory's transcript buffer."""
+    import streamlit as st
+    
+    if st.session_state.conversation.transcript:
+        st.markdown(st.session_state.conversation.transcript)
+
+def make_history(length):
+    """Alternating farmer questions and advisor answers."""
+    history = []
+    for turn in range(length):
+        if turn % 2 == 0:
+            history.append({"role": "user", "content": f"When should I irrigate my paddy field? ({turn})", "language": "en"})
+        else:
+            history.append({"role": "assistant", "content": "Irrigate early in the morning and keep 5 cm of standing water. " * 4, "language": "en"})
+    return history
+
+def script_time(app, history, spill_dir, window=None, rounds=5):
+    """Best-of-rounds seconds for one script run with the given history."""
+    conversation = ConversationMemory(window=window, spill_dir=spill_dir)
+    for message in history:
+        conversation.add(message["role"], message["content"], message["language"])
+    
+    best = float('inf')
+    for _ in range(rounds):
+        # A fresh test app per round; state is set before the run
+        at = app()
+        at.session_state['chat_history'] = history
+        at.session_state['conversation'] = conversation
+        at.run()
+        
+        if at.exception:
+            raise RuntimeError(at.exception[0].value)
+        best = min(best, SCRIPT_TIMES[-1])
+    return best
+
+def main():
+    # Name -> (test app, whole history in memory)
+    apps = {
+        'replay history': (lambda: AppTest.from_function(replay_history), True),
+        'transcript buffer': (lambda: AppTest.from_function(render_transcript), True),
+        'full app (window)': (lambda: AppTest.from_file('app.py', default_timeout=30), False)
+    }
+    
+    print(f"{'messages':>8}" + ''.join(f"{name:>20}" for name in apps))
+    with tempfile.TemporaryDirectory() as spill_dir:
+        for length in HISTORY_LENGTHS:
+            history = make_history(length)
+            times = [script_time(app, history, spill_dir, max(1, length) if whole else None)
+                     for app, whole in apps.values()]
+            print(f"{length:>8}" + ''.join(f"{seconds * 1000:>17.1f} ms" for seconds in times))
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,78 @@
+"""Benchmark intent detection cost per query.
+
+Run from the repository root:
+    python -m benchmarks.bench_intent
+"""
+
+import time
+from config.intents import INTENT_KEYWORDS
+from services.intent import IntentClassifier, TOPIC_INTENTS
+
+QUERIES = [
+    "What will the weather be like tomorrow, should I spray?",
+    "My phone shows a soil pH of 5.2, what should I add?",
+    "There are aphids and caterpillars on my cotton plants",
+    "When is the best time to harvest paddy in this region?",
+    "मिट्टी का पीएच कैसे सुधारें और कौन सी खाद डालें",
+    "மண்ணில் உரம் எப்போது போட வேண்டும்",
+    "మా పంటకు తెగులు వచ్చింది ఏమి చేయాలి",
+    "ধানে পোকা লেগেছে কী কীটনাশক দেব",
+    "Hello, how are you?"
+]
+
+def legacy_detect_intent(query):
+    """Keyword scan used before the compiled classifier."""
+    query_lower = query.lower()
+    
+    if any(word in query_lower for word in ['weather', 'rain', 'temperature', 'humidity', 'wind']):
+        return 'weather'
+    elif any(word in query_lower for word in ['soil', 'ph', 'fertilizer', 'nutrient', 'organic']):
+        return 'soil'
+    elif any(word in query_lower for word in ['disease', 'pest', 'insect', 'fungus', 'infection']):
+        return 'disease'
+    elif any(word in query_lower for word in ['irrigation', 'water', 'watering', 'drought']):
+        return 'irrigation'
+    elif any(word in query_lower for word in ['crop', 'plant', 'seed', 'harvest', 'planting']):
+        return 'crop_management'
+    else:
+        return 'general'
+
+# The same any() scan extended to every keyword of every language
+ALL_KEYWORDS = [
+    (TOPIC_INTENTS[topic], [word.rstrip('$') for word in words])
+    for topics in INTENT_KEYWORDS.values()
+    for topic, words in topics.items()
+]
+
+def multilingual_scan(query):
+    """Substring scan over the full multilingual keyword set."""
+    query_lower = query.lower()
+    for intent, words in ALL_KEYWORDS:
+        if any(word in query_lower for word in words):
+            return intent
+    return 'general'
+
+def per_query_cost(function, rounds=2000):
+    """Average seconds per query over all sample queries."""
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for query in QUERIES:
+            function(query)
+    return (time.perf_counter() - start) / (rounds * len(QUERIES))
+
+def main():
+    start = time.perf_counter()
+    classifier = IntentClassifier()
+    build_time = time.perf_counter() - start
+    
+    print(f"Trie build: {build_time * 1000:.2f} ms ({classifier.trie.size} nodes)")
+    print(f"Legacy any() scan: {per_query_cost(legacy_detect_intent) * 1e6:.1f} us/query")
+    print(f"any() scan over all languages: {per_query_cost(multilingual_scan) * 1e6:.1f} us/query")
+    print(f"Compiled classifier: {per_query_cost(classifier.classify) * 1e6:.1f} us/query")
+    print()
+    
+    for query in QUERIES:
+        print(f"{legacy_detect_intent(query):>16} -> {classifier.classify(query):<16} {query}")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
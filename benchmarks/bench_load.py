@@ -0,0 +1,228 @@
+"""Load test: concurrent simulated sessions through the app, against local stubs.
+
+Run from the repository root:
+    python -m benchmarks.bench_load [--sessions 1 2 4 8 16] [--rounds 3] [--latency-ms 50]
+
+Each simulated farmer opens the app headless through AppTest and, every
+round, gets a weather update, analyzes the soil, asks the chat a question
+and checks a crop image, all in one process like sessions on a real
+server. External APIs and models are the stubs of benchmarks.stubs.
+AppTest cannot upload files, so the image check calls the disease service
+from the session's thread and the session keeps the image alive, as an
+upload would.
+
+Latency is the script run time of each interaction (service time for the
+image check). AppTest polls for the end of a run every 100 ms, which acts
+as up to 0.1 s of think time per interaction, so throughput is a floor.
+Memory per session is the growth in resident memory while all sessions of
+a level are open. Freed memory is reused by later levels, so for exact
+figures run one level per process (e.g. --sessions 32).
+"""
+
+import os
+import gc
+import json
+import time
+import resource
+import argparse
+import tempfile
+import threading
+from benchmarks.stubs import StubServer, stub_environment, install_dummy_models
+from benchmarks.bench_suite import LOCATION, QUESTION, percentile, make_image
+from benchmarks.script_timing import last_script_time
+from utils.session_memory import session_memory
+
+FLOWS = ['weather', 'soil', 'chat', 'disease']
+
+BUTTONS = {'weather': "🌤️ Get Weather Update", 'soil': "🌱 Analyze Soil"}
+
+def rss_bytes():
+    """Resident memory of this process (peak resident memory where /proc is missing)."""
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+def share_server_state():
+    """Share the runtime and compiled script between AppTests, as sessions on a server do.
+    
+    AppTest installs a mock runtime for each run and removes it when the
+    run ends, from under runs still going in other threads, so its module
+    is given a subclass to set instead and one runtime is installed for
+    all. Each run also compiles the script again, and compiling in several
+    threads at once trips CPython's AST recursion check, so the bytecode
+    is compiled once and shared.
+    """
+    from unittest.mock import MagicMock
+    from streamlit.testing.v1 import app_test
+    from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+    
+    class PrivateRuntime(app_test.Runtime):
+        _instance = None
+    
+    runtime = MagicMock(spec=app_test.Runtime)
+    runtime.media_file_mgr = app_test.MediaFileManager(app_test.MemoryMediaFileStorage("/mock/media"))
+    runtime.cache_storage_manager = app_test.MemoryCacheStorageManager()
+    app_test.Runtime._instance = runtime
+    app_test.Runtime = PrivateRuntime
+    
+    compiled = {}
+    compile_lock = threading.Lock()
+    get_bytecode = ScriptCache.get_bytecode
+    
+    def shared_bytecode(self, script_path):
+        with compile_lock:
+            path = os.path.abspath(script_path)
+            if path not in compiled:
+                compiled[path] = get_bytecode(self, script_path)
+            return compiled[path]
+    
+    ScriptCache.get_bytecode = shared_bytecode
+
+class Session:
+    """One simulated farmer with the app open."""
+    
+    def __init__(self, index, language, timeout):
+        self.index = index
+        self.language = language
+        self.timeout = timeout
+        self.app = None
+        self.images = []
+        self.latencies = {flow: [] for flow in FLOWS}
+        self.errors = 0
+    
+    def open(self):
+        from streamlit.testing.v1 import AppTest
+        
+        self.app = AppTest.from_file('app.py', default_timeout=self.timeout)
+        self.app.session_state['language'] = self.language
+        self.app.session_state['location'] = LOCATION
+        self.app.run()
+    
+    def failed(self):
+        return bool(self.app.exception or self.app.error)
+    
+    def interact(self, flow, round_number):
+        """Run one interaction; returns its latency in seconds, or None if it failed."""
+        if flow == 'disease':
+            from services.registry import load_service
+            
+            disease_detection_service = load_service('disease_detection')
+            image = make_image()
+            self.images.append(image)
+            start = time.perf_counter()
+            predictions = disease_detection_service.detect_disease(image)
+            if not predictions:
+                return None
+            disease_detection_service.format_detection_results(predictions, self.language)
+            return time.perf_counter() - start
+        
+        if flow == 'chat':
+            self.app.text_input(key='chat_prompt').input(f"{QUESTION} (farmer {self.index}, round {round_number})")
+            label = 'Send'
+        else:
+            label = BUTTONS[flow]
+        next(button for button in self.app.button if button.label == label).click().run()
+        return None if self.failed() else last_script_time(self.app)
+    
+    def run(self, rounds, think):
+        try:
+            self.open()
+        except Exception:
+            self.errors += 1
+            return
+        
+        for round_number in range(rounds):
+            for flow in FLOWS:
+                try:
+                    seconds = self.interact(flow, round_number)
+                except Exception:
+                    seconds = None
+                if seconds is None:
+                    self.errors += 1
+                else:
+                    self.latencies[flow].append(seconds)
+                if think:
+                    time.sleep(think)
+
+def run_level(count, rounds, language, think, timeout):
+    """Run count sessions at once; returns their latency, throughput and memory figures."""
+    gc.collect()
+    rss_before = rss_bytes()
+    
+    sessions = [Session(index, language, timeout) for index in range(count)]
+    threads = [threading.Thread(target=session.run, args=(rounds, think), name=f'session-{session.index}') for session in sessions]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    
+    # Every session is still open, as idle browser tabs would be
+    gc.collect()
+    rss_open = rss_bytes()
+    
+    samples = sorted(seconds * 1000 for session in sessions for flow in FLOWS for seconds in session.latencies[flow])
+    by_flow = {}
+    for flow in FLOWS:
+        flow_samples = sorted(seconds * 1000 for session in sessions for seconds in session.latencies[flow])
+        by_flow[flow] = {'p50_ms': percentile(flow_samples, 50), 'p95_ms': percentile(flow_samples, 95)}
+    
+    return {
+        'sessions': count,
+        'interactions': len(samples),
+        'errors': sum(session.errors for session in sessions),
+        'seconds': elapsed,
+        'throughput': len(samples) / elapsed if elapsed else None,
+        'p50_ms': percentile(samples, 50),
+        'p95_ms': percentile(samples, 95),
+        'p99_ms': percentile(samples, 99),
+        'rss_mb': rss_open / 2 ** 20,
+        'mb_per_session': (rss_open - rss_before) / count / 2 ** 20,
+        'tracked_mb_per_session': sum(row['bytes'] for row in session_memory.snapshot()) / count / 2 ** 20,
+        'flows': by_flow
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sessions', type=int, nargs='+', default=[1, 2, 4, 8, 16], help="concurrent sessions per level")
+    parser.add_argument('--rounds', type=int, default=3, help="times each session goes through every flow")
+    parser.add_argument('--think-ms', type=float, default=0, help="pause between a session's interactions")
+    parser.add_argument('--latency-ms', type=float, default=50, help="stub API latency")
+    parser.add_argument('--jitter-ms', type=float, default=20, help="extra random stub latency, up to this much")
+    parser.add_argument('--error-rate', type=float, default=0, help="fraction of stub API requests that fail")
+    parser.add_argument('--model-ms', type=float, default=50, help="dummy chat model latency")
+    parser.add_argument('--language', default='en')
+    parser.add_argument('--timeout', type=float, default=120, help="seconds before a script run is abandoned")
+    parser.add_argument('--output', help="write results to this JSON file")
+    args = parser.parse_args()
+    
+    cache_dir = tempfile.mkdtemp(prefix='farm-load-')
+    server = StubServer(args.latency_ms / 1000, args.jitter_ms / 1000, args.error_rate, seed=0).start()
+    os.environ.update(stub_environment(server.url, cache_dir))
+    install_dummy_models(args.model_ms / 1000)
+    share_server_state()
+    
+    # One session first, so loading the services is not counted against the first level
+    Session(0, args.language, args.timeout).run(1, 0)
+    
+    print(f"{'sessions':>8}{'req/s':>9}{'p50':>10}{'p95':>10}{'p99':>10}{'errors':>8}{'RSS':>10}{'per session':>13}")
+    levels = []
+    for count in args.sessions:
+        level = run_level(count, args.rounds, args.language, args.think_ms / 1000, args.timeout)
+        levels.append(level)
+        latencies = ''.join('{:>8.0f}ms'.format(level[key]) if level[key] is not None else f"{'-':>10}"
+                            for key in ('p50_ms', 'p95_ms', 'p99_ms'))
+        print(f"{count:>8}{level['throughput'] or 0:>9.1f}{latencies}{level['errors']:>8}"
+              f"{level['rss_mb']:>8.0f}MB{level['mb_per_session']:>11.1f}MB")
+    
+    server.stop()
+    
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as output:
+            json.dump({'settings': vars(args), 'levels': levels}, output, indent=2)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
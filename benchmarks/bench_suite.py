@@ -0,0 +1,261 @@
+"""Offline benchmark suite: service methods and app tabs against local stubs.
+
+Run from the repository root:
+    python -m benchmarks.bench_suite [--iterations 10] [--latency-ms 50] [--error-rate 0.05]
+    python -m benchmarks.bench_suite --output new.json --compare baseline.json
+
+Every external API is answered by a local stub server with the given
+latency and error rate, and the disease, chat and speech models are tiny
+dummies, so results depend only on this code and the machine. Tabs run
+headless through AppTest and are timed by script run; the disease tab
+needs a file upload, which AppTest cannot do, so it is measured through
+its service calls. Results are written as JSON; --compare prints the
+change against an earlier run and exits with 1 if any p50 regressed by
+more than --threshold.
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+import statistics
+from datetime import datetime, timezone
+from benchmarks.stubs import StubServer, SOIL_VALUES, stub_environment, install_dummy_models, current_weather, forecast
+
+LOCATION = {'latitude': 12.97, 'longitude': 77.59, 'city': 'Bengaluru', 'district': 'Bengaluru Urban',
+            'state': 'Karnataka', 'country': 'India', 'address': 'Bengaluru, Karnataka, India'}
+
+QUESTION = "When should I irrigate my paddy and how much urea should I apply?"
+
+def percentile(samples, q):
+    """Percentile (0-100) of a sorted list, by linear interpolation."""
+    if not samples:
+        return None
+    rank = (len(samples) - 1) * q / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(samples) - 1)
+    return samples[lower] + (samples[upper] - samples[lower]) * (rank - lower)
+
+def summarize(samples, errors):
+    """Latency statistics in milliseconds for successful calls, and the error count."""
+    samples = sorted(seconds * 1000 for seconds in samples)
+    return {
+        'count': len(samples) + errors,
+        'errors': errors,
+        'mean_ms': statistics.fmean(samples) if samples else None,
+        'p50_ms': percentile(samples, 50),
+        'p95_ms': percentile(samples, 95),
+        'min_ms': samples[0] if samples else None,
+        'max_ms': samples[-1] if samples else None
+    }
+
+def measure(benchmark, iterations, self_timed=False):
+    """Run benchmark(iteration) repeatedly; a falsy result counts as an error.
+    
+    Self-timed benchmarks return the seconds to record instead of being
+    timed around the call.
+    """
+    samples, errors = [], 0
+    for iteration in range(iterations):
+        start = time.perf_counter()
+        try:
+            result = benchmark(iteration)
+        except Exception:
+            result = None
+        seconds = time.perf_counter() - start
+        
+        if not result:
+            errors += 1
+        else:
+            samples.append(result if self_timed else seconds)
+    return summarize(samples, errors)
+
+def make_image(size=512):
+    """A leaf-coloured test image."""
+    import numpy as np
+    from PIL import Image
+    
+    rng = np.random.default_rng(1)
+    pixels = rng.normal((70, 140, 60), 30, (size, size, 3)).clip(0, 255).astype('uint8')
+    return Image.fromarray(pixels)
+
+def service_benchmarks(language):
+    """Benchmarks of the service methods behind each tab, by name."""
+    # Services read their settings when constructed, after the stub environment is set
+    from services.registry import load_service
+    from utils.location import get_user_location
+    from utils.geocoding import geocoder
+    
+    weather = load_service('weather')
+    soil = load_service('soil')
+    translator = load_service('translator')
+    disease = load_service('disease_detection')
+    chat = load_service('ai_chat')
+    context = load_service('context')
+    voice = load_service('voice')
+    report = load_service('report')
+    
+    # Fixed inputs for the methods that do not fetch, so injected errors do not change them
+    lat, lon = LOCATION['latitude'], LOCATION['longitude']
+    weather_data = current_weather(lat, lon)
+    forecast_data = forecast(lat, lon, 40)
+    soil_data = dict(SOIL_VALUES)
+    image = make_image()
+    gathered = context.gather('crop_management', LOCATION)
+    translator.translate_text("Apply urea before the rain.", 'hi')
+    
+    return {
+        'weather.current': lambda i: weather.get_current_weather(lat, lon + i * 1e-4),
+        'weather.forecast': lambda i: weather.get_weather_forecast(lat, lon + i * 1e-4),
+        'weather.format': lambda i: weather.format_weather_for_farmers(weather_data, language),
+        'weather.chart': lambda i: weather.create_weather_chart(forecast_data),
+        'soil.data': lambda i: soil.get_soil_data(lat, lon + i * 1e-4),
+        'soil.interpret': lambda i: soil.interpret_soil_data(soil_data, language),
+        'soil.charts': lambda i: soil.create_soil_chart(soil_data) and soil.create_soil_properties_chart(soil_data),
+        'translate.cold': lambda i: translator.translate_text(f"Apply {i} kg of urea per acre before the rain.", 'hi'),
+        'translate.warm': lambda i: translator.translate_text("Apply urea before the rain.", 'hi'),
+        'translate.detect': lambda i: translator.detect_language(QUESTION),
+        'geocode.search': lambda i: geocoder.geocode(f"Stubpur {time.time_ns()}"),
+        'geocode.reverse_offline': lambda i: geocoder.reverse(lat, lon),
+        'location.ip': lambda i: get_user_location(),
+        'disease.detect': lambda i: disease.detect_disease(image),
+        'chat.intent': lambda i: chat.detect_intent(QUESTION),
+        'chat.context': lambda i: context.gather('crop_management', LOCATION),
+        'chat.response': lambda i: chat.get_farming_response(QUESTION, language, gathered),
+        'voice.tts': lambda i: voice.text_to_speech(f"Irrigate in the early morning, day {i}.", language),
+        'report.build': lambda i: report.build(LOCATION, language, [image])
+    }
+
+def tab_benchmarks(language):
+    """Benchmarks of a full app script run per tab interaction, by name."""
+    from streamlit.testing.v1 import AppTest
+    from benchmarks.script_timing import last_script_time
+    
+    def open_app():
+        at = AppTest.from_file('app.py', default_timeout=60)
+        at.session_state['language'] = language
+        at.session_state['location'] = LOCATION
+        at.run()
+        return at
+    
+    def ok(at):
+        """Script seconds of the last run, or None if it raised or showed an error."""
+        if at.exception or at.error:
+            return None
+        return last_script_time(at)
+    
+    def click(label):
+        def benchmark(iteration):
+            at = open_app()
+            next(button for button in at.button if button.label == label).click().run()
+            return ok(at)
+        return benchmark
+    
+    def ask(iteration):
+        at = open_app()
+        at.text_input(key='chat_prompt').input(f"{QUESTION} ({iteration})")
+        next(button for button in at.button if button.label == 'Send').click().run()
+        return ok(at)
+    
+    return {
+        'tab.first_run': lambda i: ok(open_app()),
+        'tab.report': click("📋 Get Farm Report"),
+        'tab.weather': click("🌤️ Get Weather Update"),
+        'tab.soil': click("🌱 Analyze Soil"),
+        'tab.chat': ask
+    }
+
+def compare(results, baseline, threshold):
+    """Print p50 changes against a baseline; returns the names that regressed."""
+    regressed = []
+    print(f"\n{'benchmark':<26}{'baseline p50':>14}{'p50':>12}{'change':>10}")
+    for name, stats in results['benchmarks'].items():
+        old = baseline['benchmarks'].get(name, {}).get('p50_ms')
+        new = stats['p50_ms']
+        if old is None or new is None:
+            print(f"{name:<26}{'-':>14}{'-' if new is None else f'{new:.1f}':>12}")
+            continue
+        
+        change = (new - old) / old if old else 0.0
+        # Sub-millisecond differences are noise, whatever their ratio
+        flag = ''
+        if change > threshold and new - old > 1:
+            flag = '  slower'
+            regressed.append(name)
+        elif change < -threshold and old - new > 1:
+            flag = '  faster'
+        print(f"{name:<26}{old:>12.1f}ms{new:>10.1f}ms{change:>+10.0%}{flag}")
+    return regressed
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--iterations', type=int, default=10)
+    parser.add_argument('--latency-ms', type=float, default=50, help="stub API latency")
+    parser.add_argument('--jitter-ms', type=float, default=0, help="extra random stub latency, up to this much")
+    parser.add_argument('--error-rate', type=float, default=0, help="fraction of stub API requests that fail")
+    parser.add_argument('--model-ms', type=float, default=50, help="dummy chat model latency")
+    parser.add_argument('--language', default='en')
+    parser.add_argument('--only', choices=['services', 'tabs'], help="run one group only")
+    parser.add_argument('--output', help="write results to this JSON file")
+    parser.add_argument('--compare', help="JSON results of an earlier run to compare with")
+    parser.add_argument('--threshold', type=float, default=0.1, help="p50 slowdown that counts as a regression")
+    args = parser.parse_args()
+    
+    cache_dir = tempfile.mkdtemp(prefix='farm-bench-')
+    server = StubServer(args.latency_ms / 1000, args.jitter_ms / 1000, args.error_rate, seed=0).start()
+    os.environ.update(stub_environment(server.url, cache_dir))
+    install_dummy_models(args.model_ms / 1000)
+    
+    groups = []
+    if args.only != 'tabs':
+        groups.append((service_benchmarks(args.language), False))
+    if args.only != 'services':
+        groups.append((tab_benchmarks(args.language), True))
+    
+    results = {
+        'meta': {
+            'time': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'processors': os.cpu_count(),
+            'iterations': args.iterations,
+            'latency_ms': args.latency_ms,
+            'jitter_ms': args.jitter_ms,
+            'error_rate': args.error_rate,
+            'model_ms': args.model_ms,
+            'language': args.language
+        },
+        'benchmarks': {}
+    }
+    
+    print(f"{'benchmark':<26}{'p50':>10}{'p95':>10}{'mean':>10}{'errors':>8}")
+    for benchmarks, self_timed in groups:
+        for name, benchmark in benchmarks.items():
+            stats = measure(benchmark, args.iterations, self_timed)
+            results['benchmarks'][name] = stats
+            cells = ''.join('{:>8.1f}ms'.format(stats[key]) if stats[key] is not None else f"{'-':>10}"
+                            for key in ('p50_ms', 'p95_ms', 'mean_ms'))
+            print(f"{name:<26}{cells}{stats['errors']:>8}")
+    
+    from utils.metrics import SPANS
+    results['spans'] = {name: SPANS[name].snapshot() for name in sorted(SPANS)}
+    results['meta']['stub_requests'] = server.requests
+    server.stop()
+    
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as output:
+            json.dump(results, output, indent=2)
+    
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as baseline_file:
+            baseline = json.load(baseline_file)
+        regressed = compare(results, baseline, args.threshold)
+        if regressed:
+            print(f"\nRegressed by more than {args.threshold:.0%}: {', '.join(regressed)}")
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
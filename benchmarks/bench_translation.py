@@ -0,0 +1,75 @@
+"""Benchmark translation backends under concurrent sessions.
+
+Run from the repository root:
+    python -m benchmarks.bench_translation [google] [local]
+
+The local backend needs a checkpoint in TRANSLATION_MODEL_DIR; the remote
+backend needs network access. Backends that cannot run are reported and
+skipped. The translation cache is bypassed so every segment hits the backend.
+"""
+
+import sys
+import time
+import statistics
+from concurrent.futures import ThreadPoolExecutor
+from config.translation import TRANSLATION_BACKENDS
+
+SESSIONS = 8
+REQUESTS_PER_SESSION = 4
+TARGETS = ['hi', 'ta', 'te']
+
+SENTENCES = [
+    "Rain expected - postpone spraying and harvesting if possible.",
+    "Apply nitrogen in two split doses, at tillering and at panicle initiation.",
+    "Remove infected leaves and avoid overhead watering.",
+    "Soil pH is slightly acidic, consider adding lime before sowing.",
+    "Irrigate in the early morning to reduce evaporation losses.",
+    "Check the field for stem borer egg masses every week."
+]
+
+def session(backend, session_id):
+    """Send a few multi-sentence replies; returns per-request latencies."""
+    latencies = []
+    for request in range(REQUESTS_PER_SESSION):
+        # Rotate sentences so sessions do not all send identical batches
+        offset = session_id + request
+        segments = [SENTENCES[(offset + i) % len(SENTENCES)] for i in range(3)]
+        target = TARGETS[offset % len(TARGETS)]
+        
+        start = time.perf_counter()
+        backend.translate_batch(segments, target, 'en')
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+def run(name):
+    """Benchmark one backend and print throughput and latency."""
+    try:
+        backend = TRANSLATION_BACKENDS[name]()
+        # Warm up: model load or connection setup is not part of the steady state
+        start = time.perf_counter()
+        backend.translate_batch(SENTENCES[:1], 'hi', 'en')
+        warmup = time.perf_counter() - start
+    except Exception as e:
+        print(f"{name}: unavailable ({e})")
+        return
+    
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=SESSIONS) as executor:
+        results = list(executor.map(lambda i: session(backend, i), range(SESSIONS)))
+    elapsed = time.perf_counter() - start
+    
+    latencies = sorted(latency for latencies in results for latency in latencies)
+    segments = len(latencies) * 3
+    p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+    
+    print(f"{name}: warm-up {warmup:.2f} s, {segments / elapsed:.1f} segments/s, "
+          f"latency p50 {statistics.median(latencies) * 1000:.0f} ms, p95 {p95 * 1000:.0f} ms")
+
+def main():
+    names = sys.argv[1:] or list(TRANSLATION_BACKENDS)
+    print(f"{SESSIONS} sessions x {REQUESTS_PER_SESSION} requests x 3 segments")
+    for name in names:
+        run(name)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
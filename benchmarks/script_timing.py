@@ -0,0 +1,34 @@
+"""Time Streamlit script runs under AppTest.
+
+AppTest polls for completion every 100 ms, so the script run itself is
+timed by wrapping ScriptRunner._run_script. Importing this module installs
+the wrapper.
+"""
+
+import time
+import threading
+from streamlit.runtime.scriptrunner.script_runner import ScriptRunner
+
+# Seconds of every script run, in order, and of the last run per app
+SCRIPT_TIMES = []
+LAST_RUN = {}
+_lock = threading.Lock()
+_run_script = ScriptRunner._run_script
+
+def timed_run_script(self, rerun_data):
+    """ScriptRunner._run_script, recording how long the script took."""
+    start = time.perf_counter()
+    try:
+        return _run_script(self, rerun_data)
+    finally:
+        seconds = time.perf_counter() - start
+        with _lock:
+            SCRIPT_TIMES.append(seconds)
+            # LocalScriptRunner keeps the AppTest's session state, which identifies the app
+            LAST_RUN[id(getattr(self, 'session_state', None))] = seconds
+
+ScriptRunner._run_script = timed_run_script
+
+def last_script_time(app):
+    """Seconds the last script run of an AppTest took."""
+    return LAST_RUN.get(id(app.session_state))
\ No newline at end of file
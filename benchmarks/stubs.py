@@ -0,0 +1,229 @@
+"""Local stand-ins for the external APIs and models, for offline benchmarks.
+
+StubServer answers the OpenWeather, SoilGrids, Nominatim, ip-api and
+LibreTranslate endpoints the app calls, with optional injected latency
+and errors. stub_environment() points the app at it; install_dummy_models()
+swaps the disease, chat and speech models for tiny deterministic ones.
+Both must run before the services are first used.
+"""
+
+import os
+import json
+import time
+import random
+import threading
+import numpy as np
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+
+# Soil values in SoilGrids units (pH*10, dg/kg, cg/kg, g/kg)
+SOIL_VALUES = {'phh2o': 64, 'soc': 82, 'nitrogen': 95, 'sand': 420, 'clay': 310, 'silt': 270}
+
+DISEASE_LABELS = ['Tomato Leaf Spot', 'Tomato Bacterial Blight', 'Tomato Healthy', 'Rice Blast', 'Potato Late Blight']
+
+ADVICE = (
+    "Irrigate early in the morning and keep 5 cm of standing water. "
+    "Apply nitrogen in two split doses. "
+    "Check the field for stem borer egg masses every week."
+)
+
+def current_weather(lat, lon):
+    """OpenWeather current weather for coordinates."""
+    return {
+        'coord': {'lat': lat, 'lon': lon},
+        'weather': [{'main': 'Clouds', 'description': 'scattered clouds'}],
+        'main': {'temp': 29.5, 'feels_like': 32.1, 'humidity': 74, 'pressure': 1006},
+        'wind': {'speed': 3.6},
+        'name': 'Stub Town'
+    }
+
+def forecast(lat, lon, count):
+    """OpenWeather 3-hourly forecast for coordinates."""
+    start = int(time.time()) // 10800 * 10800
+    items = []
+    for step in range(count):
+        items.append({
+            'dt': start + step * 10800,
+            'main': {'temp': 26 + 5 * np.sin(step / 8 * 2 * np.pi), 'humidity': 70 + step % 8},
+            'weather': [{'main': 'Rain' if step % 8 == 5 else 'Clouds', 'description': 'light rain' if step % 8 == 5 else 'broken clouds'}],
+            'rain': {'3h': 1.2} if step % 8 == 5 else {},
+            'pop': 0.6 if step % 8 == 5 else 0.1
+        })
+    return {'cnt': count, 'list': items}
+
+def place(lat, lon):
+    """Nominatim place record with address details."""
+    return {
+        'lat': str(lat),
+        'lon': str(lon),
+        'display_name': 'Stub Village, Stub District, Karnataka, India',
+        'address': {'village': 'Stub Village', 'state_district': 'Stub District', 'state': 'Karnataka', 'country': 'India'}
+    }
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Route requests to the stubbed endpoints."""
+    
+    protocol_version = 'HTTP/1.1'
+    
+    def log_message(self, format, *args):
+        pass
+    
+    def do_GET(self):
+        self.handle_request()
+    
+    def do_POST(self):
+        self.handle_request()
+    
+    def handle_request(self):
+        url = urlsplit(self.path)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length) if length else b''
+        
+        if not self.server.inject(url.path):
+            return self.reply(500, {'error': 'injected failure'})
+        
+        lat, lon = float(query.get('lat', 12.97)), float(query.get('lon', 77.59))
+        if url.path.endswith('/weather'):
+            self.reply(200, current_weather(lat, lon))
+        elif url.path.endswith('/forecast'):
+            self.reply(200, forecast(lat, lon, int(query.get('cnt', 40))))
+        elif url.path.endswith('/properties/query'):
+            prop = query.get('property')
+            self.reply(200, {'properties': {prop: {'depths': [{'label': '0-5cm', 'values': {'mean': SOIL_VALUES.get(prop, 0)}}]}}})
+        elif url.path == '/search':
+            self.reply(200, [place(12.97, 77.59)])
+        elif url.path == '/reverse':
+            self.reply(200, place(lat, lon))
+        elif url.path.startswith('/json'):
+            self.reply(200, {'status': 'success', 'lat': 12.97, 'lon': 77.59, 'city': 'Bengaluru', 'regionName': 'Karnataka', 'country': 'India'})
+        elif url.path == '/translate':
+            request = json.loads(body or b'{}')
+            segments = request.get('q', [])
+            translated = [f"[{request.get('target')}] {segment}" for segment in (segments if isinstance(segments, list) else [segments])]
+            self.reply(200, {'translatedText': translated if isinstance(segments, list) else translated[0]})
+        else:
+            self.reply(404, {'error': 'not found'})
+    
+    def reply(self, status, data):
+        payload = json.dumps(data).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+class StubServer(ThreadingHTTPServer):
+    """Threaded HTTP server for every stubbed API, with latency and error injection.
+    
+    latency and jitter are in seconds; route_latency overrides the latency
+    for paths ending in a given suffix, e.g. {'/translate': 0.2}.
+    """
+    
+    daemon_threads = True
+    
+    def __init__(self, latency=0.0, jitter=0.0, error_rate=0.0, route_latency=None, seed=None, port=0):
+        super().__init__(('127.0.0.1', port), StubHandler)
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.route_latency = route_latency or {}
+        self.random = random.Random(seed)
+        self.random_lock = threading.Lock()
+        self.requests = 0
+        self.thread = None
+    
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+    
+    def inject(self, path):
+        """Sleep for the route's latency; returns False when the request should fail."""
+        latency = next((seconds for suffix, seconds in self.route_latency.items() if path.endswith(suffix)), self.latency)
+        with self.random_lock:
+            self.requests += 1
+            latency += self.random.uniform(0, self.jitter) if self.jitter else 0
+            fail = self.random.random() < self.error_rate
+        if latency > 0:
+            time.sleep(latency)
+        return not fail
+    
+    def start(self):
+        """Serve on a background thread."""
+        self.thread = threading.Thread(target=self.serve_forever, name='stub-server', daemon=True)
+        self.thread.start()
+        return self
+    
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+def stub_environment(url, cache_dir):
+    """Environment that points every external call at the stub server and keeps caches in cache_dir."""
+    return {
+        'OPENWEATHER_API_KEY': 'stub',
+        'OPENWEATHER_BASE_URL': f"{url}/data/2.5",
+        'SOILGRIDS_BASE_URL': url,
+        'NOMINATIM_URL': url,
+        'NOMINATIM_RATE': '1000',
+        'IP_GEOLOCATION_URL': f"{url}/json/",
+        'TRANSLATION_BACKEND': 'libretranslate',
+        'LIBRETRANSLATE_URL': url,
+        'TRANSLATION_CACHE_PATH': os.path.join(cache_dir, 'translations.sqlite3'),
+        'GEOCODE_CACHE_PATH': os.path.join(cache_dir, 'geocode.sqlite3'),
+        'TTS_CACHE_DIR': os.path.join(cache_dir, 'tts'),
+        'CHAT_SPILL_DIR': os.path.join(cache_dir, 'conversations'),
+        'GEMINI_API_KEY': ''
+    }
+
+class DummyDiseaseClassifier:
+    """Image classifier with the transformers pipeline interface.
+    
+    Downscales the image and scores the labels from its colour histogram,
+    which costs a few milliseconds of real CPU work.
+    """
+    
+    def __init__(self, size=224):
+        self.size = size
+        self.weights = np.random.default_rng(0).standard_normal((48, len(DISEASE_LABELS)))
+    
+    def __call__(self, image):
+        pixels = np.asarray(image.convert('RGB').resize((self.size, self.size)), dtype=np.float32)
+        histogram = np.concatenate([np.histogram(pixels[..., channel], bins=16, range=(0, 255))[0] for channel in range(3)])
+        logits = histogram / histogram.sum() @ self.weights * 10
+        scores = np.exp(logits - logits.max())
+        scores /= scores.sum()
+        return [{'label': DISEASE_LABELS[index], 'score': float(scores[index])} for index in np.argsort(-scores)]
+
+class DummyTextGenerator:
+    """Text generator with the transformers pipeline interface; returns canned advice after a fixed delay."""
+    
+    def __init__(self, delay=0.05):
+        self.delay = delay
+    
+    def __call__(self, prompt, **kwargs):
+        time.sleep(self.delay)
+        return [{'generated_text': ADVICE}]
+
+def dummy_speech(delay=0.01):
+    """Speech synthesizer returning a few silent MP3 frames after a fixed delay."""
+    # One MPEG-1 Layer III frame header at 32 kbit/s, 44.1 kHz, padded to frame length
+    frame = bytes.fromhex('fffb1064') + bytes(100)
+    
+    def synthesize(text, language):
+        time.sleep(delay)
+        return frame * max(1, len(text) // 40)
+    return synthesize
+
+def install_dummy_models(model_delay=0.05, speech_delay=0.01):
+    """Replace the disease, chat fallback and speech models with dummies."""
+    from services.disease_detection import disease_detection_service
+    from services.ai_chat import ai_chat_service
+    from config.voice import voice_service
+    
+    disease_detection_service.classifier = DummyDiseaseClassifier()
+    disease_detection_service.load_error = None
+    ai_chat_service.gemini_model = None
+    ai_chat_service.fallback_model = DummyTextGenerator(model_delay)
+    ai_chat_service.fallback_error = None
+    voice_service.synthesize = dummy_speech(speech_delay)
\ No newline at end of file
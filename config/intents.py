@@ -0,0 +1,77 @@
+"""Intent keywords for the farming assistant.
+
+Keywords are grouped by language and topic. Latin-script keywords match
+whole words only. Keywords in Indic scripts also match inflected forms that
+start with the keyword (e.g. मिट्टी in मिट्टी का); end a keyword with `$` to
+require a whole word there too.
+"""
+
+INTENT_KEYWORDS = {
+    'en': {
+        'weather': ['weather', 'rain', 'rains', 'rainfall', 'raining', 'temperature', 'humidity', 'wind', 'winds',
+                    'forecast', 'monsoon', 'storm', 'frost', 'climate'],
+        'soil': ['soil', 'soils', 'ph', 'nutrient', 'nutrients', 'organic', 'compost', 'manure', 'clay', 'sandy', 'loam'],
+        'fertilizer': ['fertilizer', 'fertilizers', 'fertiliser', 'fertilisers', 'urea', 'dap', 'npk', 'potash'],
+        'pest': ['pest', 'pests', 'insect', 'insects', 'aphid', 'aphids', 'bollworm', 'locust', 'locusts',
+                 'caterpillar', 'caterpillars', 'pesticide', 'pesticides'],
+        'disease': ['disease', 'diseases', 'fungus', 'fungal', 'infection', 'blight', 'rust', 'wilt', 'rot', 'mildew',
+                    'virus'],
+        'irrigation': ['irrigation', 'irrigate', 'water', 'watering', 'drought', 'drip', 'sprinkler'],
+        'crop_management': ['crop', 'crops', 'plant', 'plants', 'seed', 'seeds', 'harvest', 'harvesting', 'planting',
+                            'sowing', 'sow', 'yield', 'variety']
+    },
+    'hi': {
+        'weather': ['मौसम', 'बारिश', 'वर्षा', 'तापमान', 'नमी', 'आर्द्रता', 'हवा', 'आंधी', 'पाला', 'मानसून'],
+        'soil': ['मिट्टी', 'मृदा', 'पीएच', 'पोषक', 'जैविक', 'कंपोस्ट'],
+        'fertilizer': ['उर्वरक', 'खाद', 'यूरिया', 'डीएपी'],
+        'pest': ['कीट', 'कीड़', 'इल्ली', 'टिड्डी'],
+        'disease': ['रोग', 'बीमारी', 'फफूंद', 'संक्रमण', 'झुलसा'],
+        'irrigation': ['सिंचाई', 'पानी', 'सूखा', 'ड्रिप'],
+        'crop_management': ['फसल', 'पौध', 'बीज', 'कटाई', 'बुवाई', 'उपज']
+    },
+    'ta': {
+        'weather': ['வானிலை', 'மழை', 'வெப்பநிலை', 'ஈரப்பதம்', 'காற்று', 'புயல்', 'பருவமழை'],
+        'soil': ['மண்$', 'மண்ணி', 'மண்ணு', 'ஊட்டச்சத்து', 'கரிம'],
+        'fertilizer': ['உரம்', 'உரங்க', 'யூரியா'],
+        'pest': ['பூச்சி'],
+        'disease': ['நோய்', 'பூஞ்சை', 'தொற்று', 'கருகல்'],
+        'irrigation': ['நீர்ப்பாசன', 'பாசன', 'தண்ணீர்', 'வறட்சி'],
+        'crop_management': ['பயிர்', 'செடி', 'விதை', 'அறுவடை', 'மகசூல்']
+    },
+    'te': {
+        'weather': ['వాతావరణ', 'వర్ష', 'వాన', 'ఉష్ణోగ్రత', 'తేమ', 'గాలి', 'తుఫాను'],
+        'soil': ['నేల', 'మట్టి', 'పోషక', 'సేంద్రీయ'],
+        'fertilizer': ['ఎరువు', 'యూరియా'],
+        'pest': ['పురుగు', 'కీటక'],
+        'disease': ['తెగులు', 'వ్యాధి', 'శిలీంధ్ర'],
+        'irrigation': ['నీటిపారుదల', 'నీరు', 'నీళ్ల', 'కరువు'],
+        'crop_management': ['పంట', 'మొక్క', 'విత్తన', 'కోత', 'దిగుబడి']
+    },
+    'kn': {
+        'weather': ['ಹವಾಮಾನ', 'ಮಳೆ', 'ತಾಪಮಾನ', 'ತೇವಾಂಶ', 'ಗಾಳಿ', 'ಚಂಡಮಾರುತ'],
+        'soil': ['ಮಣ್ಣ', 'ಪೋಷಕಾಂಶ', 'ಸಾವಯವ'],
+        'fertilizer': ['ಗೊಬ್ಬರ', 'ರಸಗೊಬ್ಬರ', 'ಯೂರಿಯಾ'],
+        'pest': ['ಕೀಟ', 'ಹುಳು'],
+        'disease': ['ರೋಗ', 'ಶಿಲೀಂಧ್ರ', 'ಸೋಂಕು'],
+        'irrigation': ['ನೀರಾವರಿ', 'ನೀರು', 'ಬರಗಾಲ'],
+        'crop_management': ['ಬೆಳೆ', 'ಸಸ್ಯ', 'ಬೀಜ', 'ಕೊಯ್ಲು', 'ಬಿತ್ತನೆ', 'ಇಳುವರಿ']
+    },
+    'ml': {
+        'weather': ['കാലാവസ്ഥ', 'മഴ', 'താപനില', 'ഈർപ്പം', 'കാറ്റ'],
+        'soil': ['മണ്ണ', 'പോഷക', 'ജൈവ'],
+        'fertilizer': ['വളം', 'വളങ്ങ', 'രാസവള', 'യൂറിയ'],
+        'pest': ['കീട'],
+        'disease': ['രോഗ', 'കുമിൾ', 'അണുബാധ'],
+        'irrigation': ['ജലസേചന', 'നനയ്ക്ക', 'വെള്ള', 'വരൾച്ച'],
+        'crop_management': ['വിള', 'ചെടി', 'വിത്ത', 'വിതയ്ക്ക']
+    },
+    'bn': {
+        'weather': ['আবহাওয়া', 'বৃষ্টি', 'তাপমাত্রা', 'আর্দ্রতা', 'বাতাস', 'ঝড়'],
+        'soil': ['মাটি', 'মৃত্তিকা', 'পুষ্টি', 'জৈব'],
+        'fertilizer': ['সার$', 'সারের', 'ইউরিয়া'],
+        'pest': ['পোকা', 'কীট'],
+        'disease': ['রোগ', 'ছত্রাক', 'সংক্রমণ'],
+        'irrigation': ['সেচ', 'পানি', 'জল$', 'জলের', 'খরা'],
+        'crop_management': ['ফসল', 'গাছ', 'বীজ', 'চারা', 'ফলন', 'বপন']
+    }
+}
\ No newline at end of file
@@ -5,42 +5,56 @@ SUPPORTED_LANGUAGES = {
         'name': 'English',
         'code': 'en',
         'tts_code': 'en',
+        'stt_code': 'en-IN',
+        'nllb_code': 'eng_Latn',
         'flag': '🇺🇸'
     },
     'hi': {
         'name': 'हिंदी (Hindi)',
         'code': 'hi',
         'tts_code': 'hi',
+        'stt_code': 'hi-IN',
+        'nllb_code': 'hin_Deva',
         'flag': '🇮🇳'
     },
     'ta': {
         'name': 'தமிழ் (Tamil)',
         'code': 'ta',
         'tts_code': 'ta',
+        'stt_code': 'ta-IN',
+        'nllb_code': 'tam_Taml',
         'flag': '🇮🇳'
     },
     'te': {
         'name': 'తెలుగు (Telugu)',
         'code': 'te',
         'tts_code': 'te',
+        'stt_code': 'te-IN',
+        'nllb_code': 'tel_Telu',
         'flag': '🇮🇳'
     },
     'kn': {
         'name': 'ಕನ್ನಡ (Kannada)',
         'code': 'kn',
         'tts_code': 'kn',
+        'stt_code': 'kn-IN',
+        'nllb_code': 'kan_Knda',
         'flag': '🇮🇳'
     },
     'ml': {
         'name': 'മലയാളം (Malayalam)',
         'code': 'ml',
         'tts_code': 'ml',
+        'stt_code': 'ml-IN',
+        'nllb_code': 'mal_Mlym',
         'flag': '🇮🇳'
     },
     'bn': {
         'name': 'বাংলা (Bengali)',
         'code': 'bn',
         'tts_code': 'bn',
+        'stt_code': 'bn-IN',
+        'nllb_code': 'ben_Beng',
         'flag': '🇧🇩'
     }
 }
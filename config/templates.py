@@ -0,0 +1,342 @@
+"""Pre-translated message templates for weather and soil reports.
+
+Deterministic report text is rendered from these templates instead of being
+machine-translated on every request. Placeholders use str.format syntax and
+must be the same in every language; the catalog is checked when it is
+compiled at startup.
+"""
+
+import string
+from config.languages import SUPPORTED_LANGUAGES
+
+MESSAGE_TEMPLATES = {
+    'en': {
+        'weather.unavailable': "Weather data not available.",
+        'weather.temperature': "🌡️ Temperature: {temp}°C",
+        'weather.humidity': "💧 Humidity: {humidity}%",
+        'weather.conditions': "🌤️ Conditions: {conditions}",
+        'weather.wind': "💨 Wind Speed: {wind_speed} m/s",
+        'weather.advice_title': "🧑‍🌾 Farming Advice:",
+        'weather.hot': "Very hot weather - ensure adequate irrigation and shade for crops.",
+        'weather.cold': "Cold weather - protect sensitive crops from frost.",
+        'weather.humid': "High humidity - watch for fungal diseases.",
+        'weather.dry': "Low humidity - increase watering frequency.",
+        'weather.windy': "Strong winds - secure tall crops and check for damage.",
+        'weather.rain': "Rain expected - postpone spraying and harvesting if possible.",
+        'weather.favorable': "Weather conditions are favorable for normal farming activities.",
+        'condition.clear': "Clear sky",
+        'condition.clouds': "Cloudy",
+        'condition.rain': "Rain",
+        'condition.drizzle': "Drizzle",
+        'condition.thunderstorm': "Thunderstorm",
+        'condition.mist': "Mist",
+        'soil.unavailable': "Soil data not available.",
+        'soil.title': "🌱 Soil Analysis Results:",
+        'soil.acidic': "🔴 Soil is acidic (pH: {ph:.1f})",
+        'soil.alkaline': "🔵 Soil is alkaline (pH: {ph:.1f})",
+        'soil.ph_good': "🟢 Soil pH is good (pH: {ph:.1f})",
+        'soil.add_lime': "Consider adding lime to reduce acidity",
+        'soil.add_sulfur': "Consider adding organic matter or sulfur",
+        'soil.low_organic': "🔴 Low organic matter ({soc:.1f} g/kg)",
+        'soil.add_compost': "Add compost or organic fertilizers",
+        'soil.high_organic': "🟢 High organic matter ({soc:.1f} g/kg)",
+        'soil.moderate_organic': "🟡 Moderate organic matter ({soc:.1f} g/kg)",
+        'soil.clay': "🟤 Clay soil - good for water retention",
+        'soil.clay_advice': "Ensure good drainage, avoid overwatering",
+        'soil.sandy': "🟡 Sandy soil - good drainage",
+        'soil.sandy_advice': "Water more frequently, add organic matter",
+        'soil.loamy': "🟢 Loamy soil - ideal for most crops",
+        'soil.low_nitrogen': "🔴 Low nitrogen ({nitrogen:.2f} g/kg)",
+        'soil.add_nitrogen': "Apply nitrogen-rich fertilizers",
+        'soil.nitrogen_ok': "🟢 Adequate nitrogen ({nitrogen:.2f} g/kg)",
+        'soil.recommendations_title': "🧑‍🌾 Recommendations:",
+        'soil.good': "Your soil conditions are generally good for farming."
+    },
+    'hi': {
+        'weather.unavailable': "मौसम का डेटा उपलब्ध नहीं है।",
+        'weather.temperature': "🌡️ तापमान: {temp}°C",
+        'weather.humidity': "💧 नमी: {humidity}%",
+        'weather.conditions': "🌤️ मौसम की स्थिति: {conditions}",
+        'weather.wind': "💨 हवा की गति: {wind_speed} m/s",
+        'weather.advice_title': "🧑‍🌾 कृषि सलाह:",
+        'weather.hot': "बहुत गर्म मौसम - फसलों के लिए पर्याप्त सिंचाई और छाया सुनिश्चित करें।",
+        'weather.cold': "ठंडा मौसम - संवेदनशील फसलों को पाले से बचाएं।",
+        'weather.humid': "अधिक नमी - फफूंद जनित रोगों पर नज़र रखें।",
+        'weather.dry': "कम नमी - सिंचाई की आवृत्ति बढ़ाएं।",
+        'weather.windy': "तेज़ हवाएं - ऊंची फसलों को सहारा दें और नुकसान की जांच करें।",
+        'weather.rain': "बारिश की संभावना - यदि संभव हो तो छिड़काव और कटाई टाल दें।",
+        'weather.favorable': "मौसम सामान्य कृषि कार्यों के लिए अनुकूल है।",
+        'condition.clear': "साफ़ आसमान",
+        'condition.clouds': "बादल",
+        'condition.rain': "बारिश",
+        'condition.drizzle': "बूंदाबांदी",
+        'condition.thunderstorm': "आंधी-तूफ़ान",
+        'condition.mist': "धुंध",
+        'soil.unavailable': "मिट्टी का डेटा उपलब्ध नहीं है।",
+        'soil.title': "🌱 मिट्टी विश्लेषण के परिणाम:",
+        'soil.acidic': "🔴 मिट्टी अम्लीय है (pH: {ph:.1f})",
+        'soil.alkaline': "🔵 मिट्टी क्षारीय है (pH: {ph:.1f})",
+        'soil.ph_good': "🟢 मिट्टी का pH अच्छा है (pH: {ph:.1f})",
+        'soil.add_lime': "अम्लता कम करने के लिए चूना डालने पर विचार करें",
+        'soil.add_sulfur': "जैविक पदार्थ या गंधक डालने पर विचार करें",
+        'soil.low_organic': "🔴 कम जैविक पदार्थ ({soc:.1f} g/kg)",
+        'soil.add_compost': "कंपोस्ट या जैविक खाद डालें",
+        'soil.high_organic': "🟢 अधिक जैविक पदार्थ ({soc:.1f} g/kg)",
+        'soil.moderate_organic': "🟡 मध्यम जैविक पदार्थ ({soc:.1f} g/kg)",
+        'soil.clay': "🟤 चिकनी मिट्टी - पानी रोकने के लिए अच्छी",
+        'soil.clay_advice': "अच्छी जल निकासी सुनिश्चित करें, अधिक पानी देने से बचें",
+        'soil.sandy': "🟡 रेतीली मिट्टी - अच्छी जल निकासी",
+        'soil.sandy_advice': "अधिक बार पानी दें, जैविक पदार्थ मिलाएं",
+        'soil.loamy': "🟢 दोमट मिट्टी - अधिकांश फसलों के लिए आदर्श",
+        'soil.low_nitrogen': "🔴 कम नाइट्रोजन ({nitrogen:.2f} g/kg)",
+        'soil.add_nitrogen': "नाइट्रोजन युक्त उर्वरक डालें",
+        'soil.nitrogen_ok': "🟢 पर्याप्त नाइट्रोजन ({nitrogen:.2f} g/kg)",
+        'soil.recommendations_title': "🧑‍🌾 सुझाव:",
+        'soil.good': "आपकी मिट्टी की स्थिति खेती के लिए सामान्यतः अच्छी है।"
+    },
+    'ta': {
+        'weather.unavailable': "வானிலை தரவு கிடைக்கவில்லை.",
+        'weather.temperature': "🌡️ வெப்பநிலை: {temp}°C",
+        'weather.humidity': "💧 ஈரப்பதம்: {humidity}%",
+        'weather.conditions': "🌤️ வானிலை நிலை: {conditions}",
+        'weather.wind': "💨 காற்றின் வேகம்: {wind_speed} m/s",
+        'weather.advice_title': "🧑‍🌾 விவசாய ஆலோசனை:",
+        'weather.hot': "மிகவும் வெப்பமான வானிலை - பயிர்களுக்கு போதுமான நீர்ப்பாசனமும் நிழலும் உறுதி செய்யவும்.",
+        'weather.cold': "குளிர்ந்த வானிலை - எளிதில் பாதிக்கப்படும் பயிர்களை பனியிலிருந்து பாதுகாக்கவும்.",
+        'weather.humid': "அதிக ஈரப்பதம் - பூஞ்சை நோய்களைக் கவனிக்கவும்.",
+        'weather.dry': "குறைந்த ஈரப்பதம் - அடிக்கடி நீர் பாய்ச்சவும்.",
+        'weather.windy': "பலத்த காற்று - உயரமான பயிர்களுக்கு முட்டுக் கொடுத்து சேதத்தைச் சரிபார்க்கவும்.",
+        'weather.rain': "மழை எதிர்பார்க்கப்படுகிறது - முடிந்தால் மருந்து தெளிப்பதையும் அறுவடையையும் தள்ளிப்போடவும்.",
+        'weather.favorable': "வழக்கமான விவசாயப் பணிகளுக்கு வானிலை சாதகமாக உள்ளது.",
+        'condition.clear': "தெளிவான வானம்",
+        'condition.clouds': "மேகமூட்டம்",
+        'condition.rain': "மழை",
+        'condition.drizzle': "தூறல்",
+        'condition.thunderstorm': "இடியுடன் கூடிய மழை",
+        'condition.mist': "மூடுபனி",
+        'soil.unavailable': "மண் தரவு கிடைக்கவில்லை.",
+        'soil.title': "🌱 மண் பகுப்பாய்வு முடிவுகள்:",
+        'soil.acidic': "🔴 மண் அமிலத்தன்மை கொண்டது (pH: {ph:.1f})",
+        'soil.alkaline': "🔵 மண் காரத்தன்மை கொண்டது (pH: {ph:.1f})",
+        'soil.ph_good': "🟢 மண்ணின் pH நன்றாக உள்ளது (pH: {ph:.1f})",
+        'soil.add_lime': "அமிலத்தன்மையைக் குறைக்க சுண்ணாம்பு சேர்க்கவும்",
+        'soil.add_sulfur': "கரிமப் பொருட்கள் அல்லது கந்தகம் சேர்க்கவும்",
+        'soil.low_organic': "🔴 குறைந்த கரிமப் பொருள் ({soc:.1f} g/kg)",
+        'soil.add_compost': "மக்கிய உரம் அல்லது இயற்கை உரங்களைச் சேர்க்கவும்",
+        'soil.high_organic': "🟢 அதிக கரிமப் பொருள் ({soc:.1f} g/kg)",
+        'soil.moderate_organic': "🟡 மிதமான கரிமப் பொருள் ({soc:.1f} g/kg)",
+        'soil.clay': "🟤 களிமண் - நீரைத் தக்கவைக்க நல்லது",
+        'soil.clay_advice': "நல்ல வடிகால் வசதி செய்யவும், அதிகமாக நீர் பாய்ச்ச வேண்டாம்",
+        'soil.sandy': "🟡 மணல் மண் - நல்ல வடிகால்",
+        'soil.sandy_advice': "அடிக்கடி நீர் பாய்ச்சவும், கரிமப் பொருட்களைச் சேர்க்கவும்",
+        'soil.loamy': "🟢 இருபொறை மண் - பெரும்பாலான பயிர்களுக்கு ஏற்றது",
+        'soil.low_nitrogen': "🔴 குறைந்த தழைச்சத்து ({nitrogen:.2f} g/kg)",
+        'soil.add_nitrogen': "தழைச்சத்து நிறைந்த உரங்களை இடவும்",
+        'soil.nitrogen_ok': "🟢 போதுமான தழைச்சத்து ({nitrogen:.2f} g/kg)",
+        'soil.recommendations_title': "🧑‍🌾 பரிந்துரைகள்:",
+        'soil.good': "உங்கள் மண் நிலை பொதுவாக விவசாயத்திற்கு ஏற்றதாக உள்ளது."
+    },
+    'te': {
+        'weather.unavailable': "వాతావరణ సమాచారం అందుబాటులో లేదు.",
+        'weather.temperature': "🌡️ ఉష్ణోగ్రత: {temp}°C",
+        'weather.humidity': "💧 తేమ: {humidity}%",
+        'weather.conditions': "🌤️ వాతావరణ పరిస్థితి: {conditions}",
+        'weather.wind': "💨 గాలి వేగం: {wind_speed} m/s",
+        'weather.advice_title': "🧑‍🌾 వ్యవసాయ సలహా:",
+        'weather.hot': "చాలా వేడి వాతావరణం - పంటలకు తగినంత నీటిపారుదల మరియు నీడ ఉండేలా చూడండి.",
+        'weather.cold': "చల్లని వాతావరణం - సున్నితమైన పంటలను మంచు నుండి కాపాడండి.",
+        'weather.humid': "అధిక తేమ - శిలీంధ్ర వ్యాధుల పట్ల జాగ్రత్తగా ఉండండి.",
+        'weather.dry': "తక్కువ తేమ - తరచుగా నీరు పెట్టండి.",
+        'weather.windy': "బలమైన గాలులు - పొడవైన పంటలకు ఆధారం ఇచ్చి నష్టాన్ని తనిఖీ చేయండి.",
+        'weather.rain': "వర్షం కురిసే అవకాశం - వీలైతే పిచికారీ మరియు కోతను వాయిదా వేయండి.",
+        'weather.favorable': "సాధారణ వ్యవసాయ పనులకు వాతావరణం అనుకూలంగా ఉంది.",
+        'condition.clear': "నిర్మలమైన ఆకాశం",
+        'condition.clouds': "మేఘావృతం",
+        'condition.rain': "వర్షం",
+        'condition.drizzle': "జల్లులు",
+        'condition.thunderstorm': "ఉరుములతో కూడిన వర్షం",
+        'condition.mist': "పొగమంచు",
+        'soil.unavailable': "మట్టి సమాచారం అందుబాటులో లేదు.",
+        'soil.title': "🌱 మట్టి విశ్లేషణ ఫలితాలు:",
+        'soil.acidic': "🔴 నేల ఆమ్లంగా ఉంది (pH: {ph:.1f})",
+        'soil.alkaline': "🔵 నేల క్షారంగా ఉంది (pH: {ph:.1f})",
+        'soil.ph_good': "🟢 నేల pH బాగుంది (pH: {ph:.1f})",
+        'soil.add_lime': "ఆమ్లత్వాన్ని తగ్గించడానికి సున్నం వేయండి",
+        'soil.add_sulfur': "సేంద్రీయ పదార్థం లేదా గంధకం వేయండి",
+        'soil.low_organic': "🔴 తక్కువ సేంద్రీయ పదార్థం ({soc:.1f} g/kg)",
+        'soil.add_compost': "కంపోస్ట్ లేదా సేంద్రీయ ఎరువులు వేయండి",
+        'soil.high_organic': "🟢 అధిక సేంద్రీయ పదార్థం ({soc:.1f} g/kg)",
+        'soil.moderate_organic': "🟡 మధ్యస్థ సేంద్రీయ పదార్థం ({soc:.1f} g/kg)",
+        'soil.clay': "🟤 బంకమట్టి నేల - నీటిని నిలుపుకోవడానికి మంచిది",
+        'soil.clay_advice': "మంచి మురుగునీటి పారుదల ఉండేలా చూడండి, ఎక్కువ నీరు పెట్టకండి",
+        'soil.sandy': "🟡 ఇసుక నేల - మంచి నీటి పారుదల",
+        'soil.sandy_advice': "తరచుగా నీరు పెట్టండి, సేంద్రీయ పదార్థం కలపండి",
+        'soil.loamy': "🟢 ఒండ్రు నేల - చాలా పంటలకు అనువైనది",
+        'soil.low_nitrogen': "🔴 తక్కువ నత్రజని ({nitrogen:.2f} g/kg)",
+        'soil.add_nitrogen': "నత్రజని అధికంగా ఉన్న ఎరువులు వేయండి",
+        'soil.nitrogen_ok': "🟢 తగినంత నత్రజని ({nitrogen:.2f} g/kg)",
+        'soil.recommendations_title': "🧑‍🌾 సిఫార్సులు:",
+        'soil.good': "మీ నేల పరిస్థితులు సాధారణంగా వ్యవసాయానికి అనుకూలంగా ఉన్నాయి."
+    },
+    'kn': {
+        'weather.unavailable': "ಹವಾಮಾನ ಮಾಹಿತಿ ಲಭ್ಯವಿಲ್ಲ.",
+        'weather.temperature': "🌡️ ತಾಪಮಾನ: {temp}°C",
+        'weather.humidity': "💧 ತೇವಾಂಶ: {humidity}%",
+        'weather.conditions': "🌤️ ಹವಾಮಾನ ಸ್ಥಿತಿ: {conditions}",
+        'weather.wind': "💨 ಗಾಳಿಯ ವೇಗ: {wind_speed} m/s",
+        'weather.advice_title': "🧑‍🌾 ಕೃಷಿ ಸಲಹೆ:",
+        'weather.hot': "ತುಂಬಾ ಬಿಸಿ ಹವಾಮಾನ - ಬೆಳೆಗಳಿಗೆ ಸಾಕಷ್ಟು ನೀರಾವರಿ ಮತ್ತು ನೆರಳು ಒದಗಿಸಿ.",
+        'weather.cold': "ಚಳಿಯ ಹವಾಮಾನ - ಸೂಕ್ಷ್ಮ ಬೆಳೆಗಳನ್ನು ಹಿಮದಿಂದ ರಕ್ಷಿಸಿ.",
+        'weather.humid': "ಹೆಚ್ಚಿನ ತೇವಾಂಶ - ಶಿಲೀಂಧ್ರ ರೋಗಗಳ ಬಗ್ಗೆ ಎಚ್ಚರವಿರಲಿ.",
+        'weather.dry': "ಕಡಿಮೆ ತೇವಾಂಶ - ಹೆಚ್ಚು ಬಾರಿ ನೀರು ಹಾಯಿಸಿ.",
+        'weather.windy': "ಬಲವಾದ ಗಾಳಿ - ಎತ್ತರದ ಬೆಳೆಗಳಿಗೆ ಆಧಾರ ನೀಡಿ ಮತ್ತು ಹಾನಿಯನ್ನು ಪರಿಶೀಲಿಸಿ.",
+        'weather.rain': "ಮಳೆಯ ನಿರೀಕ್ಷೆ - ಸಾಧ್ಯವಾದರೆ ಸಿಂಪಡಣೆ ಮತ್ತು ಕೊಯ್ಲು ಮುಂದೂಡಿ.",
+        'weather.favorable': "ಸಾಮಾನ್ಯ ಕೃಷಿ ಚಟುವಟಿಕೆಗಳಿಗೆ ಹವಾಮಾನ ಅನುಕೂಲಕರವಾಗಿದೆ.",
+        'condition.clear': "ಶುಭ್ರ ಆಕಾಶ",
+        'condition.clouds': "ಮೋಡ ಕವಿದ ವಾತಾವರಣ",
+        'condition.rain': "ಮಳೆ",
+        'condition.drizzle': "ತುಂತುರು ಮಳೆ",
+        'condition.thunderstorm': "ಗುಡುಗು ಸಹಿತ ಮಳೆ",
+        'condition.mist': "ಮಂಜು",
+        'soil.unavailable': "ಮಣ್ಣಿನ ಮಾಹಿತಿ ಲಭ್ಯವಿಲ್ಲ.",
+        'soil.title': "🌱 ಮಣ್ಣು ವಿಶ್ಲೇಷಣೆಯ ಫಲಿತಾಂಶಗಳು:",
+        'soil.acidic': "🔴 ಮಣ್ಣು ಆಮ್ಲೀಯವಾಗಿದೆ (pH: {ph:.1f})",
+        'soil.alkaline': "🔵 ಮಣ್ಣು ಕ್ಷಾರೀಯವಾಗಿದೆ (pH: {ph:.1f})",
+        'soil.ph_good': "🟢 ಮಣ್ಣಿನ pH ಉತ್ತಮವಾಗಿದೆ (pH: {ph:.1f})",
+        'soil.add_lime': "ಆಮ್ಲೀಯತೆ ಕಡಿಮೆ ಮಾಡಲು ಸುಣ್ಣ ಸೇರಿಸಿ",
+        'soil.add_sulfur': "ಸಾವಯವ ಪದಾರ್ಥ ಅಥವಾ ಗಂಧಕ ಸೇರಿಸಿ",
+        'soil.low_organic': "🔴 ಕಡಿಮೆ ಸಾವಯವ ಪದಾರ್ಥ ({soc:.1f} g/kg)",
+        'soil.add_compost': "ಕಾಂಪೋಸ್ಟ್ ಅಥವಾ ಸಾವಯವ ಗೊಬ್ಬರ ಸೇರಿಸಿ",
+        'soil.high_organic': "🟢 ಹೆಚ್ಚಿನ ಸಾವಯವ ಪದಾರ್ಥ ({soc:.1f} g/kg)",
+        'soil.moderate_organic': "🟡 ಮಧ್ಯಮ ಸಾವಯವ ಪದಾರ್ಥ ({soc:.1f} g/kg)",
+        'soil.clay': "🟤 ಜೇಡಿ ಮಣ್ಣು - ನೀರು ಹಿಡಿದಿಡಲು ಉತ್ತಮ",
+        'soil.clay_advice': "ಉತ್ತಮ ಬಸಿಗಾಲುವೆ ವ್ಯವಸ್ಥೆ ಮಾಡಿ, ಅತಿಯಾಗಿ ನೀರು ಹಾಯಿಸಬೇಡಿ",
+        'soil.sandy': "🟡 ಮರಳು ಮಣ್ಣು - ಉತ್ತಮ ನೀರು ಬಸಿಯುವಿಕೆ",
+        'soil.sandy_advice': "ಹೆಚ್ಚು ಬಾರಿ ನೀರು ಹಾಯಿಸಿ, ಸಾವಯವ ಪದಾರ್ಥ ಸೇರಿಸಿ",
+        'soil.loamy': "🟢 ಗೋಡು ಮಣ್ಣು - ಹೆಚ್ಚಿನ ಬೆಳೆಗಳಿಗೆ ಸೂಕ್ತ",
+        'soil.low_nitrogen': "🔴 ಕಡಿಮೆ ಸಾರಜನಕ ({nitrogen:.2f} g/kg)",
+        'soil.add_nitrogen': "ಸಾರಜನಕ ಸಮೃದ್ಧ ಗೊಬ್ಬರಗಳನ್ನು ಹಾಕಿ",
+        'soil.nitrogen_ok': "🟢 ಸಾಕಷ್ಟು ಸಾರಜನಕ ({nitrogen:.2f} g/kg)",
+        'soil.recommendations_title': "🧑‍🌾 ಶಿಫಾರಸುಗಳು:",
+        'soil.good': "ನಿಮ್ಮ ಮಣ್ಣಿನ ಸ್ಥಿತಿ ಸಾಮಾನ್ಯವಾಗಿ ಕೃಷಿಗೆ ಉತ್ತಮವಾಗಿದೆ."
+    },
+    'ml': {
+        'weather.unavailable': "കാലാവസ്ഥാ വിവരങ്ങൾ ലഭ്യമല്ല.",
+        'weather.temperature': "🌡️ താപനില: {temp}°C",
+        'weather.humidity': "💧 ഈർപ്പം: {humidity}%",
+        'weather.conditions': "🌤️ കാലാവസ്ഥ: {conditions}",
+        'weather.wind': "💨 കാറ്റിന്റെ വേഗത: {wind_speed} m/s",
+        'weather.advice_title': "🧑‍🌾 കൃഷി ഉപദേശം:",
+        'weather.hot': "കടുത്ത ചൂട് - വിളകൾക്ക് ആവശ്യത്തിന് ജലസേചനവും തണലും ഉറപ്പാക്കുക.",
+        'weather.cold': "തണുത്ത കാലാവസ്ഥ - ദുർബലമായ വിളകളെ മഞ്ഞിൽ നിന്ന് സംരക്ഷിക്കുക.",
+        'weather.humid': "ഉയർന്ന ഈർപ്പം - കുമിൾ രോഗങ്ങൾ ശ്രദ്ധിക്കുക.",
+        'weather.dry': "കുറഞ്ഞ ഈർപ്പം - കൂടുതൽ തവണ നനയ്ക്കുക.",
+        'weather.windy': "ശക്തമായ കാറ്റ് - ഉയരമുള്ള വിളകൾക്ക് താങ്ങ് നൽകി നാശനഷ്ടം പരിശോധിക്കുക.",
+        'weather.rain': "മഴയ്ക്ക് സാധ്യത - കഴിയുമെങ്കിൽ മരുന്ന് തളിക്കലും വിളവെടുപ്പും മാറ്റിവയ്ക്കുക.",
+        'weather.favorable': "സാധാരണ കൃഷിപ്പണികൾക്ക് കാലാവസ്ഥ അനുകൂലമാണ്.",
+        'condition.clear': "തെളിഞ്ഞ ആകാശം",
+        'condition.clouds': "മേഘാവൃതം",
+        'condition.rain': "മഴ",
+        'condition.drizzle': "ചാറ്റൽ മഴ",
+        'condition.thunderstorm': "ഇടിമിന്നലോടു കൂടിയ മഴ",
+        'condition.mist': "മൂടൽമഞ്ഞ്",
+        'soil.unavailable': "മണ്ണിന്റെ വിവരങ്ങൾ ലഭ്യമല്ല.",
+        'soil.title': "🌱 മണ്ണ് പരിശോധനാ ഫലങ്ങൾ:",
+        'soil.acidic': "🔴 മണ്ണ് അമ്ലത്വമുള്ളതാണ് (pH: {ph:.1f})",
+        'soil.alkaline': "🔵 മണ്ണ് ക്ഷാരഗുണമുള്ളതാണ് (pH: {ph:.1f})",
+        'soil.ph_good': "🟢 മണ്ണിന്റെ pH നല്ലതാണ് (pH: {ph:.1f})",
+        'soil.add_lime': "അമ്ലത്വം കുറയ്ക്കാൻ കുമ്മായം ചേർക്കുക",
+        'soil.add_sulfur': "ജൈവവസ്തുക്കളോ ഗന്ധകമോ ചേർക്കുക",
+        'soil.low_organic': "🔴 ജൈവാംശം കുറവ് ({soc:.1f} g/kg)",
+        'soil.add_compost': "കമ്പോസ്റ്റോ ജൈവവളങ്ങളോ ചേർക്കുക",
+        'soil.high_organic': "🟢 ജൈവാംശം കൂടുതൽ ({soc:.1f} g/kg)",
+        'soil.moderate_organic': "🟡 ജൈവാംശം മിതമായത് ({soc:.1f} g/kg)",
+        'soil.clay': "🟤 കളിമണ്ണ് - വെള്ളം സംഭരിക്കാൻ നല്ലത്",
+        'soil.clay_advice': "നല്ല നീർവാർച്ച ഉറപ്പാക്കുക, അമിതമായി നനയ്ക്കരുത്",
+        'soil.sandy': "🟡 മണൽ മണ്ണ് - നല്ല നീർവാർച്ച",
+        'soil.sandy_advice': "കൂടുതൽ തവണ നനയ്ക്കുക, ജൈവവസ്തുക്കൾ ചേർക്കുക",
+        'soil.loamy': "🟢 പശിമരാശി മണ്ണ് - മിക്ക വിളകൾക്കും അനുയോജ്യം",
+        'soil.low_nitrogen': "🔴 നൈട്രജൻ കുറവ് ({nitrogen:.2f} g/kg)",
+        'soil.add_nitrogen': "നൈട്രജൻ അടങ്ങിയ വളങ്ങൾ ചേർക്കുക",
+        'soil.nitrogen_ok': "🟢 ആവശ്യത്തിന് നൈട്രജൻ ({nitrogen:.2f} g/kg)",
+        'soil.recommendations_title': "🧑‍🌾 ശുപാർശകൾ:",
+        'soil.good': "നിങ്ങളുടെ മണ്ണിന്റെ അവസ്ഥ പൊതുവെ കൃഷിക്ക് അനുയോജ്യമാണ്."
+    },
+    'bn': {
+        'weather.unavailable': "আবহাওয়ার তথ্য পাওয়া যায়নি।",
+        'weather.temperature': "🌡️ তাপমাত্রা: {temp}°C",
+        'weather.humidity': "💧 আর্দ্রতা: {humidity}%",
+        'weather.conditions': "🌤️ আবহাওয়ার অবস্থা: {conditions}",
+        'weather.wind': "💨 বাতাসের গতি: {wind_speed} m/s",
+        'weather.advice_title': "🧑‍🌾 কৃষি পরামর্শ:",
+        'weather.hot': "অত্যধিক গরম আবহাওয়া - ফসলের জন্য পর্যাপ্ত সেচ ও ছায়া নিশ্চিত করুন।",
+        'weather.cold': "ঠান্ডা আবহাওয়া - সংবেদনশীল ফসলকে হিম থেকে রক্ষা করুন।",
+        'weather.humid': "উচ্চ আর্দ্রতা - ছত্রাকজনিত রোগের দিকে নজর রাখুন।",
+        'weather.dry': "কম আর্দ্রতা - ঘন ঘন জল দিন।",
+        'weather.windy': "প্রবল বাতাস - লম্বা ফসলে খুঁটি দিন এবং ক্ষতি পরীক্ষা করুন।",
+        'weather.rain': "বৃষ্টির সম্ভাবনা - সম্ভব হলে স্প্রে ও ফসল কাটা পিছিয়ে দিন।",
+        'weather.favorable': "স্বাভাবিক কৃষিকাজের জন্য আবহাওয়া অনুকূল।",
+        'condition.clear': "পরিষ্কার আকাশ",
+        'condition.clouds': "মেঘলা",
+        'condition.rain': "বৃষ্টি",
+        'condition.drizzle': "গুঁড়ি গুঁড়ি বৃষ্টি",
+        'condition.thunderstorm': "বজ্রসহ বৃষ্টি",
+        'condition.mist': "কুয়াশা",
+        'soil.unavailable': "মাটির তথ্য পাওয়া যায়নি।",
+        'soil.title': "🌱 মাটি বিশ্লেষণের ফলাফল:",
+        'soil.acidic': "🔴 মাটি অম্লীয় (pH: {ph:.1f})",
+        'soil.alkaline': "🔵 মাটি ক্ষারীয় (pH: {ph:.1f})",
+        'soil.ph_good': "🟢 মাটির pH ভালো (pH: {ph:.1f})",
+        'soil.add_lime': "অম্লতা কমাতে চুন প্রয়োগ করুন",
+        'soil.add_sulfur': "জৈব পদার্থ বা গন্ধক প্রয়োগ করুন",
+        'soil.low_organic': "🔴 জৈব পদার্থ কম ({soc:.1f} g/kg)",
+        'soil.add_compost': "কম্পোস্ট বা জৈব সার প্রয়োগ করুন",
+        'soil.high_organic': "🟢 জৈব পদার্থ বেশি ({soc:.1f} g/kg)",
+        'soil.moderate_organic': "🟡 মাঝারি জৈব পদার্থ ({soc:.1f} g/kg)",
+        'soil.clay': "🟤 এঁটেল মাটি - জল ধরে রাখার জন্য ভালো",
+        'soil.clay_advice': "ভালো জল নিকাশি নিশ্চিত করুন, অতিরিক্ত জল দেবেন না",
+        'soil.sandy': "🟡 বেলে মাটি - ভালো জল নিকাশি",
+        'soil.sandy_advice': "ঘন ঘন জল দিন, জৈব পদার্থ মেশান",
+        'soil.loamy': "🟢 দোআঁশ মাটি - বেশিরভাগ ফসলের জন্য আদর্শ",
+        'soil.low_nitrogen': "🔴 নাইট্রোজেন কম ({nitrogen:.2f} g/kg)",
+        'soil.add_nitrogen': "নাইট্রোজেন সমৃদ্ধ সার প্রয়োগ করুন",
+        'soil.nitrogen_ok': "🟢 পর্যাপ্ত নাইট্রোজেন ({nitrogen:.2f} g/kg)",
+        'soil.recommendations_title': "🧑‍🌾 সুপারিশ:",
+        'soil.good': "আপনার মাটির অবস্থা সাধারণত চাষের জন্য ভালো।"
+    }
+}
+
+class MessageCatalog:
+    """Templates compiled into one lookup table per language.
+    
+    Missing translations fall back to English, and translations whose
+    placeholders differ from the English template are rejected so a bad
+    entry can never raise at render time.
+    """
+    
+    def __init__(self, templates=None):
+        templates = templates or MESSAGE_TEMPLATES
+        english = templates['en']
+        self.messages = {}
+        self.invalid = []
+        
+        for language in SUPPORTED_LANGUAGES:
+            compiled = dict(english)
+            for message_id, template in templates.get(language, {}).items():
+                if message_id in english and self.fields(template) == self.fields(english[message_id]):
+                    compiled[message_id] = template
+                else:
+                    self.invalid.append((language, message_id))
+            self.messages[language] = compiled
+    
+    def fields(self, template):
+        """Get the placeholder names used by a template."""
+        return {field for _, field, _, _ in string.Formatter().parse(template) if field}
+    
+    def render(self, message_id, language='en', **values):
+        """Render a message in the given language."""
+        messages = self.messages.get(language, self.messages['en'])
+        return messages[message_id].format(**values)
+
+# Global message catalog instance
+message_catalog = MessageCatalog()
\ No newline at end of file
@@ -1,37 +1,343 @@
 """Translation utilities for multilingual support."""
 
 from googletrans import Translator
+import requests
 import streamlit as st
-from config.languages import UI_TRANSLATIONS
+import os
+import time
+import queue
+import hashlib
+import sqlite3
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from config.languages import SUPPORTED_LANGUAGES, UI_TRANSLATIONS
+from utils.text import WORD_PATTERN, split_segments, detect_script_language
+from utils.metrics import span, cache_stats
 
-class TranslationService:
+class TranslationCache:
+    """Persistent segment translation cache shared by all sessions.
+    
+    Entries are keyed by (source, target, sha256 of the segment) and kept in
+    SQLite, so they survive restarts and can be shared by several app
+    processes on one machine.
+    """
+    
+    def __init__(self, path=None):
+        self.path = path or os.getenv('TRANSLATION_CACHE_PATH', os.path.join('.cache', 'translations.sqlite3'))
+        self.lock = threading.Lock()
+        self.stats = cache_stats('translation')
+        
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        self.connection = sqlite3.connect(self.path, check_same_thread=False)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute(
+            'CREATE TABLE IF NOT EXISTS translations ('
+            'source TEXT, target TEXT, hash TEXT, translation TEXT, '
+            'PRIMARY KEY (source, target, hash))'
+        )
+        self.connection.commit()
+    
+    def key(self, text):
+        """Hash a segment for lookup."""
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()
+    
+    def get_many(self, segments, target_language, source_language):
+        """Look up segments; returns {segment: translation} for the ones cached."""
+        keys = {self.key(segment): segment for segment in segments}
+        found = {}
+        
+        with self.lock:
+            hashes = list(keys)
+            # Stay well under SQLite's bound parameter limit
+            for start in range(0, len(hashes), 500):
+                batch = hashes[start:start + 500]
+                rows = self.connection.execute(
+                    f"SELECT hash, translation FROM translations WHERE source = ? AND target = ? "
+                    f"AND hash IN ({','.join('?' * len(batch))})",
+                    [source_language, target_language] + batch
+                )
+                for digest, translation in rows:
+                    found[keys[digest]] = translation
+        
+        self.stats.record(hits=len(found), misses=len(keys) - len(found))
+        
+        return found
+    
+    def put_many(self, translations, target_language, source_language):
+        """Store {segment: translation} pairs."""
+        with self.lock:
+            self.connection.executemany(
+                'INSERT OR REPLACE INTO translations VALUES (?, ?, ?, ?)',
+                [(source_language, target_language, self.key(segment), translation)
+                 for segment, translation in translations.items()]
+            )
+            self.connection.commit()
+
+class GoogleTranslateBackend:
+    """Remote translation through the googletrans web client."""
+    
     def __init__(self):
         self.translator = Translator()
     
+    def translate_batch(self, segments, target_language, source_language='auto'):
+        """Translate a list of segments with a single request."""
+        # One segment per line in a single request; fall back to one request
+        # per segment if the service merges or splits lines
+        with span('googletrans.translate'):
+            result = self.translator.translate('\n'.join(segments), dest=target_language, src=source_language)
+        lines = result.text.split('\n')
+        if len(lines) == len(segments):
+            return [line.strip() for line in lines]
+        
+        with span('googletrans.translate_each'):
+            results = self.translator.translate(segments, dest=target_language, src=source_language)
+        return [result.text for result in results]
+
+class _BatchRequest:
+    """Segments from one caller waiting for the batcher."""
+    
+    def __init__(self, segments, target_language, source_language):
+        self.segments = segments
+        self.pair = (source_language, target_language)
+        self.future = Future()
+
+class LocalSeq2SeqBackend:
+    """Offline translation with a local seq2seq checkpoint on CPU.
+    
+    Expects an NLLB-200 style checkpoint (for example a saved copy of
+    facebook/nllb-200-distilled-600M) in TRANSLATION_MODEL_DIR; nothing is
+    downloaded. Requests from all sessions go into one queue. A batcher
+    thread collects them for up to TRANSLATION_BATCH_WAIT_MS or until
+    TRANSLATION_MAX_BATCH segments, groups them by language pair and hands
+    each group to a bounded worker pool. While every worker is busy the
+    queue keeps filling, so batches grow with load.
+    """
+    
+    def __init__(self, model_dir=None, max_batch=None, max_wait=None, workers=None, max_queue=None):
+        self.model_dir = model_dir or os.getenv('TRANSLATION_MODEL_DIR', os.path.join('models', 'nllb-200-distilled-600M'))
+        self.max_batch = max_batch or int(os.getenv('TRANSLATION_MAX_BATCH', '32'))
+        self.max_wait = max_wait if max_wait is not None else float(os.getenv('TRANSLATION_BATCH_WAIT_MS', '20')) / 1000
+        self.timeout = float(os.getenv('TRANSLATION_TIMEOUT', '30'))
+        workers = workers or int(os.getenv('TRANSLATION_WORKERS', '1'))
+        
+        self.queue = queue.Queue(maxsize=max_queue or int(os.getenv('TRANSLATION_QUEUE_SIZE', '256')))
+        self.slots = threading.BoundedSemaphore(workers)
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='translation-model')
+        self.load_lock = threading.Lock()
+        self.tokenizer_lock = threading.Lock()
+        self.tokenizer = None
+        self.model = None
+        
+        threading.Thread(target=self.run_batcher, name='translation-batcher', daemon=True).start()
+    
+    def load_model(self):
+        """Load the tokenizer and model from the checkpoint directory once."""
+        with self.load_lock:
+            if self.model is None:
+                from transformers import AutoTokenizer, AutoModelForSeq2SeqLM
+                
+                if not os.path.isdir(self.model_dir):
+                    raise FileNotFoundError(f"translation model not found in {self.model_dir}")
+                
+                with span('model.translation.load'):
+                    self.tokenizer = AutoTokenizer.from_pretrained(self.model_dir, local_files_only=True)
+                    model = AutoModelForSeq2SeqLM.from_pretrained(self.model_dir, local_files_only=True)
+                    model.eval()
+                self.model = model
+        
+        return self.tokenizer, self.model
+    
+    def translate_batch(self, segments, target_language, source_language='auto'):
+        """Queue segments for the next batch and wait for their translations."""
+        segments = list(segments)
+        by_language = {}
+        for segment in segments:
+            # NLLB-200 has no codes for romanized Indian languages, so
+            # Latin-script text without a known source is read as English
+            language = source_language if source_language != 'auto' else detect_script_language(segment) or 'en'
+            by_language.setdefault(language, []).append(segment)
+        
+        translations = {}
+        pending = []
+        for language, group in by_language.items():
+            if language == target_language:
+                translations.update(zip(group, group))
+                continue
+            request = _BatchRequest(group, target_language, language)
+            self.queue.put(request, timeout=self.timeout)
+            pending.append(request)
+        
+        for request in pending:
+            translations.update(zip(request.segments, request.future.result(timeout=self.timeout)))
+        return [translations[segment] for segment in segments]
+    
+    def run_batcher(self):
+        """Collect queued requests into batches and dispatch them to the pool."""
+        while True:
+            batch = [self.queue.get()]
+            size = len(batch[0].segments)
+            deadline = time.monotonic() + self.max_wait
+            
+            while size < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    request = self.queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                batch.append(request)
+                size += len(request.segments)
+            
+            groups = {}
+            for request in batch:
+                groups.setdefault(request.pair, []).append(request)
+            
+            for pair, group in groups.items():
+                # Wait for a free worker here so new requests keep batching up in the queue
+                self.slots.acquire()
+                self.executor.submit(self.run_group, pair, group)
+    
+    def run_group(self, pair, group):
+        """Translate every request for one language pair and resolve their futures."""
+        try:
+            segments = [segment for request in group for segment in request.segments]
+            translations = dict(zip(segments, self.generate(segments, *pair)))
+            for request in group:
+                request.future.set_result([translations[segment] for segment in request.segments])
+        except Exception as e:
+            for request in group:
+                if not request.future.done():
+                    request.future.set_exception(e)
+        finally:
+            self.slots.release()
+    
+    def generate(self, segments, source_language, target_language):
+        """Run the model over the unique segments in length-sorted sub-batches."""
+        import torch
+        
+        tokenizer, model = self.load_model()
+        source_code = SUPPORTED_LANGUAGES[source_language]['nllb_code']
+        target_code = SUPPORTED_LANGUAGES[target_language]['nllb_code']
+        
+        # Similar lengths in a sub-batch keep padding low
+        unique = sorted(set(segments), key=len)
+        results = {}
+        
+        for start in range(0, len(unique), self.max_batch):
+            chunk = unique[start:start + self.max_batch]
+            # src_lang is tokenizer state shared by every worker
+            with self.tokenizer_lock:
+                tokenizer.src_lang = source_code
+                inputs = tokenizer(chunk, return_tensors='pt', padding=True, truncation=True, max_length=256)
+            with torch.inference_mode(), span('model.translation'):
+                outputs = model.generate(
+                    **inputs,
+                    forced_bos_token_id=tokenizer.convert_tokens_to_ids(target_code),
+                    max_new_tokens=inputs['input_ids'].shape[1] * 2 + 16,
+                    num_beams=1
+                )
+            for segment, text in zip(chunk, tokenizer.batch_decode(outputs, skip_special_tokens=True)):
+                results[segment] = text
+        
+        return [results[segment] for segment in segments]
+
+class LibreTranslateBackend:
+    """Remote translation through a LibreTranslate server, e.g. one hosted on-premises."""
+    
+    def __init__(self, url=None, api_key=None):
+        self.url = (url or os.getenv('LIBRETRANSLATE_URL', 'http://localhost:5000')).rstrip('/')
+        self.api_key = api_key or os.getenv('LIBRETRANSLATE_API_KEY')
+        self.session = requests.Session()
+    
+    def translate_batch(self, segments, target_language, source_language='auto'):
+        """Translate a list of segments with a single request."""
+        payload = {'q': list(segments), 'source': source_language, 'target': target_language, 'format': 'text'}
+        if self.api_key:
+            payload['api_key'] = self.api_key
+        
+        with span('libretranslate.translate'):
+            response = self.session.post(f"{self.url}/translate", json=payload, timeout=10)
+            response.raise_for_status()
+        
+        translated = response.json()['translatedText']
+        return translated if isinstance(translated, list) else [translated]
+
+# Available translation backends, selected with TRANSLATION_BACKEND
+TRANSLATION_BACKENDS = {
+    'google': GoogleTranslateBackend,
+    'libretranslate': LibreTranslateBackend,
+    'local': LocalSeq2SeqBackend
+}
+
+def get_translation_backend(name=None):
+    """Create the translation backend with the given name."""
+    name = name or os.getenv('TRANSLATION_BACKEND', 'google')
+    return TRANSLATION_BACKENDS.get(name, GoogleTranslateBackend)()
+
+class TranslationService:
+    def __init__(self, backend=None):
+        self.backend = backend or get_translation_backend()
+        self.cache = TranslationCache()
+    
     def translate_text(self, text, target_language='en', source_language='auto'):
-        """Translate text to target language."""
+        """Translate text to target language, showing an error and returning it unchanged if that fails."""
         try:
-            if target_language == 'en' and source_language == 'auto':
-                return text
-            
-            result = self.translator.translate(text, dest=target_language, src=source_language)
-            return result.text
+            return self.translate(text, target_language, source_language)
         except Exception as e:
             st.error(f"Translation error: {e}")
             return text
     
+    def translate(self, text, target_language='en', source_language='auto'):
+        """Translate text to target language; backend errors are raised to the caller."""
+        # Translate sentence by sentence so repeated sentences hit the cache,
+        # grouped by source language and skipping those already in the target
+        pieces = split_segments(text)
+        groups = {}
+        for piece in pieces[::2]:
+            if not WORD_PATTERN.search(piece):
+                continue
+            language = source_language
+            if language == 'auto':
+                # Indian scripts name their language; Latin text may be English
+                # or romanized Hindi, Tamil and so on, which the backend detects
+                language = detect_script_language(piece)
+                if language == 'en':
+                    language = 'auto' if target_language != 'en' else None
+            if language and language != target_language:
+                groups.setdefault(language, set()).add(piece)
+        
+        if not groups:
+            return text
+        
+        translations = {}
+        for language, segments in groups.items():
+            found = self.cache.get_many(segments, target_language, language)
+            misses = [segment for segment in segments if segment not in found]
+            
+            if misses:
+                translated = dict(zip(misses, self.translate_batch(misses, target_language, language)))
+                self.cache.put_many(translated, target_language, language)
+                found.update(translated)
+            translations.update(found)
+        
+        pieces[::2] = [translations.get(piece, piece) for piece in pieces[::2]]
+        return ''.join(pieces)
+    
+    def translate_batch(self, segments, target_language, source_language='auto'):
+        """Translate a list of segments with the configured backend."""
+        return self.backend.translate_batch(segments, target_language, source_language)
+    
     def get_ui_text(self, key, language='en'):
         """Get UI text in specified language."""
         return UI_TRANSLATIONS.get(language, UI_TRANSLATIONS['en']).get(key, key)
     
-    def detect_language(self, text):
-        """Detect the language of input text."""
-        try:
-            detection = self.translator.detect(text)
-            return detection.lang
-        except Exception as e:
-            st.error(f"Language detection error: {e}")
-            return 'en'
+    def detect_language(self, text, default='en'):
+        """Detect the language of input text locally from its script."""
+        return detect_script_language(text) or default
 
 # Global translator instance
 translator_service = TranslationService()
\ No newline at end of file
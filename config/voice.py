@@ -3,69 +3,392 @@
 import streamlit as st
 from gtts import gTTS
 import speech_recognition as sr
+import streamlit.components.v1 as components
+from streamlit import runtime
 import io
-import tempfile
 import os
+import json
+import uuid
+import string
+import hashlib
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 from pydub import AudioSegment
+from pydub.utils import which
 from pydub.playback import play
 import base64
+from config.languages import SUPPORTED_LANGUAGES
+from utils.text import WORD_PATTERN, split_segments
+from utils.vad import read_wav, split_utterances, to_pcm16
+from utils.metrics import span, cache_stats
 
-class VoiceService:
+# Queues clips on a player owned by the app page, so clips rendered in separate
+# component iframes play one after another; a new group stops the previous one.
+# Clips start downloading as soon as they are queued.
+AUDIO_QUEUE_SCRIPT = string.Template("""
+<script>
+const host = window.parent;
+const player = host.farmAudioPlayer || (host.farmAudioPlayer = {
+    group: null, queue: [], audio: null,
+    push(group, src) {
+        if (group !== this.group) {
+            this.group = group;
+            this.queue = [];
+            if (this.audio) { this.audio.pause(); this.audio = null; }
+        }
+        const clip = new host.Audio(src);
+        clip.preload = 'auto';
+        this.queue.push(clip);
+        if (!this.audio) this.next();
+    },
+    next() {
+        this.audio = this.queue.shift() || null;
+        if (!this.audio) return;
+        this.audio.onended = () => this.next();
+        this.audio.play().catch(() => this.next());
+    }
+});
+player.push($group, $src);
+</script>
+""")
+
+class AudioCache:
+    """Two-tier cache of synthesized audio: an in-memory LRU over a disk store.
+    
+    Entries are content-addressed by a hash of the text and voice settings.
+    Both tiers have a byte budget; the memory tier evicts the least recently
+    used clips, the disk tier the least recently used files (by mtime, which
+    is refreshed on every hit).
+    """
+    
+    def __init__(self, cache_dir=None, max_memory_bytes=None, max_disk_bytes=None):
+        self.cache_dir = cache_dir or os.getenv('TTS_CACHE_DIR', os.path.join('.cache', 'tts'))
+        self.max_memory_bytes = max_memory_bytes or int(float(os.getenv('TTS_MEMORY_CACHE_MB', '32')) * 1024 * 1024)
+        self.max_disk_bytes = max_disk_bytes or int(float(os.getenv('TTS_DISK_CACHE_MB', '512')) * 1024 * 1024)
+        self.lock = threading.Lock()
+        self.memory = OrderedDict()
+        self.memory_bytes = 0
+        self.memory_stats = cache_stats('tts.memory')
+        self.disk_stats = cache_stats('tts.disk')
+        
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.disk_bytes = sum(entry.stat().st_size for entry in os.scandir(self.cache_dir) if entry.name.endswith('.mp3'))
+    
+    def key(self, text, language, **settings):
+        """Content hash of the text and everything that changes the audio."""
+        parts = [language] + [f"{name}={settings[name]}" for name in sorted(settings)] + [text]
+        return hashlib.sha256('\0'.join(parts).encode('utf-8')).hexdigest()
+    
+    def path(self, key):
+        """Disk location of a cached clip."""
+        return os.path.join(self.cache_dir, f"{key}.mp3")
+    
+    def get(self, key):
+        """Return cached audio bytes, or None."""
+        with self.lock:
+            audio_data = self.memory.get(key)
+            if audio_data is not None:
+                self.memory.move_to_end(key)
+        
+        if audio_data is not None:
+            self.memory_stats.record(hits=1)
+            return audio_data
+        self.memory_stats.record(misses=1)
+        
+        try:
+            with open(self.path(key), 'rb') as audio_file:
+                audio_data = audio_file.read()
+            os.utime(self.path(key))
+        except OSError:
+            self.disk_stats.record(misses=1)
+            return None
+        
+        self.disk_stats.record(hits=1)
+        with self.lock:
+            self.remember(key, audio_data)
+        return audio_data
+    
+    def put(self, key, audio_data):
+        """Store audio bytes in both tiers."""
+        path = self.path(key)
+        try:
+            if not os.path.exists(path):
+                with open(path + '.tmp', 'wb') as audio_file:
+                    audio_file.write(audio_data)
+                os.replace(path + '.tmp', path)
+                with self.lock:
+                    self.disk_bytes += len(audio_data)
+                    over_budget = self.disk_bytes > self.max_disk_bytes
+                if over_budget:
+                    self.evict_disk()
+        except OSError:
+            pass
+        
+        with self.lock:
+            self.remember(key, audio_data)
+    
+    def remember(self, key, audio_data):
+        """Add a clip to the memory tier, evicting old clips over budget. Caller holds the lock."""
+        if len(audio_data) > self.max_memory_bytes:
+            return
+        
+        previous = self.memory.pop(key, None)
+        if previous is not None:
+            self.memory_bytes -= len(previous)
+        
+        self.memory[key] = audio_data
+        self.memory_bytes += len(audio_data)
+        while self.memory_bytes > self.max_memory_bytes:
+            _, evicted = self.memory.popitem(last=False)
+            self.memory_bytes -= len(evicted)
+    
+    def evict_disk(self):
+        """Delete the least recently used files until the disk tier is back to 90% of its budget."""
+        entries = sorted(
+            (entry.stat().st_mtime, entry.stat().st_size, entry.path)
+            for entry in os.scandir(self.cache_dir) if entry.name.endswith('.mp3')
+        )
+        total = sum(size for _, size, _ in entries)
+        target = self.max_disk_bytes * 0.9
+        
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                os.unlink(path)
+                total -= size
+            except OSError:
+                pass
+        
+        with self.lock:
+            self.disk_bytes = total
+
+class GoogleSpeechBackend:
+    """Remote recognition with the Google Web Speech API."""
+    
     def __init__(self):
         self.recognizer = sr.Recognizer()
-        self.microphone = sr.Microphone()
     
-    def speech_to_text(self, audio_data, language='en'):
-        """Convert speech to text."""
+    def recognize(self, samples, rate, language):
+        """Transcribe one utterance; returns '' when nothing was understood."""
+        audio = sr.AudioData(to_pcm16(samples), rate, 2)
+        stt_code = SUPPORTED_LANGUAGES.get(language, {}).get('stt_code', language)
         try:
-            # Adjust for ambient noise
-            with self.microphone as source:
-                self.recognizer.adjust_for_ambient_noise(source)
-            
-            # Recognize speech
-            text = self.recognizer.recognize_google(audio_data, language=language)
-            return text
+            with span('google_stt.recognize'):
+                return self.recognizer.recognize_google(audio, language=stt_code)
         except sr.UnknownValueError:
-            return "Could not understand audio"
+            return ''
+
+class LocalWhisperBackend:
+    """Offline recognition with a local Whisper checkpoint on CPU.
+    
+    Expects a saved checkpoint such as openai/whisper-small in
+    STT_MODEL_DIR; nothing is downloaded. Audio should arrive at 16 kHz,
+    the rate the recorder widget is asked for.
+    """
+    
+    def __init__(self, model_dir=None):
+        self.model_dir = model_dir or os.getenv('STT_MODEL_DIR', os.path.join('models', 'whisper-small'))
+        self.lock = threading.Lock()
+        self.pipeline = None
+    
+    def load_model(self):
+        """Load the speech recognition pipeline once."""
+        with self.lock:
+            if self.pipeline is None:
+                from transformers import pipeline
+                
+                if not os.path.isdir(self.model_dir):
+                    raise FileNotFoundError(f"speech model not found in {self.model_dir}")
+                
+                with span('model.whisper.load'):
+                    self.pipeline = pipeline('automatic-speech-recognition', model=self.model_dir, device=-1)
+        
+        return self.pipeline
+    
+    def recognize(self, samples, rate, language):
+        """Transcribe one utterance."""
+        model = self.load_model()
+        with span('model.whisper'):
+            result = model(
+                {'raw': samples, 'sampling_rate': rate},
+                generate_kwargs={'language': language, 'task': 'transcribe'}
+            )
+        return result['text'].strip()
+
+# Available speech recognition backends, selected with STT_BACKEND
+SPEECH_BACKENDS = {
+    'google': GoogleSpeechBackend,
+    'local': LocalWhisperBackend
+}
+
+def get_speech_backend(name=None):
+    """Create the speech recognition backend with the given name."""
+    name = name or os.getenv('STT_BACKEND', 'google')
+    return SPEECH_BACKENDS.get(name, GoogleSpeechBackend)()
+
+class VoiceService:
+    def __init__(self, speech_backend=None):
+        self.speech_backend = speech_backend or get_speech_backend()
+        self.stt_executor = ThreadPoolExecutor(
+            max_workers=int(os.getenv('STT_WORKERS', '4')),
+            thread_name_prefix='stt'
+        )
+        self.tts_settings = {'slow': False, 'tld': os.getenv('TTS_TLD', 'com')}
+        self.audio_cache = AudioCache()
+        self.executor = ThreadPoolExecutor(
+            max_workers=int(os.getenv('TTS_WORKERS', '8')),
+            thread_name_prefix='tts'
+        )
+        self.chunks_ahead = int(os.getenv('TTS_CHUNKS_AHEAD', '3'))
+        self.low_bitrate = os.getenv('TTS_LOW_BITRATE', '16k')
+        # Set once compression has failed, so it is not retried for every clip
+        self.compress_error = None if which(AudioSegment.converter) else FileNotFoundError(f"{AudioSegment.converter} not found")
+    
+    def speech_to_text(self, audio_data, language='en'):
+        """Convert recorded WAV audio to text."""
+        try:
+            transcript = ''
+            for transcript in self.transcribe_stream(audio_data, language):
+                pass
+            return transcript or "Could not understand audio"
         except sr.RequestError as e:
             return f"Error with speech recognition service: {e}"
     
-    def text_to_speech(self, text, language='en'):
+    def transcribe_stream(self, audio_data, language='en'):
+        """Yield the transcript so far each time the next utterance is recognized.
+        
+        The recording is split into utterances at pauses and every utterance
+        is recognized concurrently off the UI thread; results are still
+        yielded in speaking order.
+        """
+        samples, rate = read_wav(audio_data)
+        futures = deque(
+            self.stt_executor.submit(self.speech_backend.recognize, samples[start:end], rate, language)
+            for start, end in split_utterances(samples, rate)
+        )
+        parts = []
+        
+        try:
+            while futures:
+                text = futures.popleft().result()
+                if text:
+                    parts.append(text)
+                    yield ' '.join(parts)
+        finally:
+            for future in futures:
+                future.cancel()
+    
+    def text_to_speech(self, text, language='en', low_bandwidth=False):
         """Convert text to speech and return audio data."""
         try:
-            tts = gTTS(text=text, lang=language, slow=False)
-            
-            # Save to temporary file
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.mp3') as tmp_file:
-                tts.save(tmp_file.name)
-                
-                # Read the audio file
-                with open(tmp_file.name, 'rb') as audio_file:
-                    audio_data = audio_file.read()
-                
-                # Clean up
-                os.unlink(tmp_file.name)
-                
-                return audio_data
+            return self.synthesize_cached(text, language, low_bandwidth)
         except Exception as e:
             st.error(f"Text-to-speech error: {e}")
             return None
     
+    def synthesize_cached(self, text, language, low_bandwidth=False):
+        """Get audio for text from the cache, synthesizing it on a miss."""
+        bitrate = self.low_bitrate if low_bandwidth else 'original'
+        key = self.audio_cache.key(text, language, bitrate=bitrate, **self.tts_settings)
+        audio_data = self.audio_cache.get(key)
+        if audio_data is not None:
+            return audio_data
+        
+        if not low_bandwidth:
+            audio_data = self.synthesize(text, language)
+        else:
+            original = self.synthesize_cached(text, language)
+            if self.compress_error is not None:
+                return original
+            try:
+                audio_data = self.compress(original)
+            except Exception as e:
+                # pydub needs ffmpeg; without it the original clip is still usable
+                self.compress_error = e
+                return original
+        
+        self.audio_cache.put(key, audio_data)
+        return audio_data
+    
+    def synthesize(self, text, language):
+        """Synthesize speech with gTTS straight into memory."""
+        buffer = io.BytesIO()
+        with span('gtts.synthesize'):
+            gTTS(text=text, lang=language, **self.tts_settings).write_to_fp(buffer)
+        return buffer.getvalue()
+    
+    def compress(self, audio_data):
+        """Re-encode a clip as low-bitrate mono MP3 for slow connections."""
+        with span('pydub.compress'):
+            audio = AudioSegment.from_file(io.BytesIO(audio_data), format='mp3')
+            buffer = io.BytesIO()
+            audio.set_channels(1).set_frame_rate(16000).export(buffer, format='mp3', bitrate=self.low_bitrate)
+        return buffer.getvalue()
+    
+    def split_speech(self, text):
+        """Split text into sentences to synthesize and cache one by one."""
+        return [segment for segment in split_segments(text)[::2] if WORD_PATTERN.search(segment)]
+    
+    def stream_speech(self, text, language='en', low_bandwidth=False):
+        """Yield audio for each sentence in order, as soon as it is ready.
+        
+        Sentences are synthesized concurrently, at most chunks_ahead at a time
+        per response, so the first sentence is not queued behind the rest.
+        """
+        sentences = deque(self.split_speech(text))
+        pending = deque()
+        
+        try:
+            while sentences or pending:
+                while sentences and len(pending) < self.chunks_ahead:
+                    pending.append(self.executor.submit(self.synthesize_cached, sentences.popleft(), language, low_bandwidth))
+                
+                try:
+                    audio_data = pending.popleft().result()
+                except Exception as e:
+                    # Later sentences would most likely fail the same way
+                    st.error(f"Text-to-speech error: {e}")
+                    return
+                yield audio_data
+        finally:
+            for future in pending:
+                future.cancel()
+    
+    def speak(self, text, language='en', low_bandwidth=False):
+        """Speak text, starting playback with the first sentence."""
+        group = uuid.uuid4().hex
+        for index, audio_data in enumerate(self.stream_speech(text, language, low_bandwidth)):
+            self.queue_audio(group, index, audio_data)
+    
+    def audio_url(self, audio_data, coordinates):
+        """Serve a clip through Streamlit's media file endpoint and return its URL.
+        
+        Media file URLs are derived from a hash of the content, so a repeated
+        clip has the same URL and the browser revalidates it from its cache
+        instead of downloading it again. The media manager returns a path from
+        the server root, so the configured server.baseUrlPath (set when the
+        app runs behind a reverse proxy under a prefix) is put in front.
+        """
+        if runtime.exists():
+            url = runtime.get_instance().media_file_mgr.add(audio_data, 'audio/mpeg', coordinates)
+            base_path = (st.get_option('server.baseUrlPath') or '').strip('/')
+            return f"/{base_path}{url}" if base_path and url.startswith('/') else url
+        
+        # Bare mode (scripts and tests) has no media endpoint
+        return f"data:audio/mp3;base64,{base64.b64encode(audio_data).decode()}"
+    
+    def queue_audio(self, group, index, audio_data):
+        """Queue a clip to play after the clips already queued in its group."""
+        src = self.audio_url(audio_data, f"tts.{group}.{index}")
+        components.html(AUDIO_QUEUE_SCRIPT.substitute(group=json.dumps(group), src=json.dumps(src)), height=0)
+    
     def play_audio_in_streamlit(self, audio_data):
         """Play audio in Streamlit interface."""
         if audio_data:
-            # Encode audio data to base64
-            audio_base64 = base64.b64encode(audio_data).decode()
-            
-            # Create HTML audio element
-            audio_html = f"""
-            <audio controls autoplay>
-                <source src="data:audio/mp3;base64,{audio_base64}" type="audio/mp3">
-                Your browser does not support the audio element.
-            </audio>
-            """
-            
-            st.markdown(audio_html, unsafe_allow_html=True)
+            # Served from the media endpoint instead of inlined as base64
+            st.audio(audio_data, format='audio/mp3')
 
 # Global voice service instance
 voice_service = VoiceService()
\ No newline at end of file
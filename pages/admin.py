@@ -0,0 +1,144 @@
+"""Admin page: latency, errors, cache hit ratios and session memory of the running app."""
+
+import os
+import streamlit as st
+import pandas as pd
+from dotenv import load_dotenv
+from utils.metrics import SPANS, CACHES, SAMPLE_RATE, render_prometheus
+from utils.singleflight import FLIGHT_GROUPS
+from utils.session_memory import session_memory
+from services.registry import SERVICE_TIMINGS
+
+# Load environment variables
+load_dotenv()
+
+st.set_page_config(page_title="🌾 Admin - AI Farming Assistant", page_icon="📊", layout="wide")
+
+def check_access():
+    """Ask for ADMIN_PASSWORD; the page stays locked when none is configured."""
+    password = os.getenv('ADMIN_PASSWORD')
+    if not password:
+        st.warning("Set ADMIN_PASSWORD in .env to open the admin page.")
+        return False
+    if st.session_state.get('admin_unlocked'):
+        return True
+    
+    entered = st.text_input("Admin password", type="password")
+    if entered == password:
+        st.session_state.admin_unlocked = True
+        return True
+    if entered:
+        st.error("Wrong password")
+    return False
+
+def to_ms(seconds):
+    """Format seconds as milliseconds for the tables."""
+    return None if seconds is None else round(seconds * 1000, 1)
+
+def span_table():
+    """Latency percentiles and errors per external call or model."""
+    rows = []
+    for stats in sorted(SPANS.values(), key=lambda stats: stats.name):
+        snapshot = stats.snapshot()
+        rows.append({
+            'Span': snapshot['span'],
+            'Calls': snapshot['calls'],
+            'Errors': snapshot['errors'],
+            'Error %': round(snapshot['error_rate'] * 100, 1),
+            'p50 ms': to_ms(snapshot['p50']),
+            'p95 ms': to_ms(snapshot['p95']),
+            'p99 ms': to_ms(snapshot['p99']),
+            'Mean ms': to_ms(snapshot['mean'])
+        })
+    return pd.DataFrame(rows)
+
+def cache_table():
+    """Hit ratios of the translation, speech and geocoding caches."""
+    rows = []
+    for stats in sorted(CACHES.values(), key=lambda stats: stats.name):
+        snapshot = stats.snapshot()
+        ratio = snapshot['hit_ratio']
+        rows.append({
+            'Cache': snapshot['cache'],
+            'Hits': snapshot['hits'],
+            'Misses': snapshot['misses'],
+            'Hit %': None if ratio is None else round(ratio * 100, 1)
+        })
+    return pd.DataFrame(rows)
+
+def session_table():
+    """Memory held by each open session and its largest entries."""
+    rows = []
+    for row in session_memory.snapshot():
+        largest = sorted(row['entries'].items(), key=lambda item: item[1], reverse=True)[:3]
+        rows.append({
+            'Session': row['session'],
+            'Memory MB': round(row['bytes'] / 2 ** 20, 2),
+            'Spilled MB': round(row['spilled_bytes'] / 2 ** 20, 2),
+            'Idle s': round(row['idle_seconds']),
+            'Largest entries': ', '.join(f"{key} ({size / 1024:.0f} KB)" for key, size in largest)
+        })
+    return pd.DataFrame(rows)
+
+def main():
+    st.title("📊 Admin")
+    
+    if not check_access():
+        return
+    
+    st.caption(f"Since this process started. Latency is sampled at {SAMPLE_RATE:.0%}; calls and errors are always counted.")
+    
+    st.subheader("External calls and models")
+    spans = span_table()
+    if spans.empty:
+        st.info("No calls recorded yet.")
+    else:
+        st.dataframe(spans, use_container_width=True, hide_index=True)
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.subheader("Caches")
+        caches = cache_table()
+        if caches.empty:
+            st.info("No cache lookups yet.")
+        else:
+            st.dataframe(caches, use_container_width=True, hide_index=True)
+    
+    with col2:
+        st.subheader("Coalesced requests")
+        flights = pd.DataFrame([dict(group.stats(), group=name) for name, group in sorted(FLIGHT_GROUPS.items())])
+        if not flights.empty:
+            st.dataframe(flights.set_index('group'), use_container_width=True)
+    
+    st.subheader("Session memory")
+    sessions = session_table()
+    counters = session_memory.stats()
+    st.caption(
+        f"Budget {session_memory.session_budget / 2 ** 20:.0f} MB per session and "
+        f"{session_memory.total_budget / 2 ** 20:.0f} MB in total. "
+        f"Spills: {counters['spills']}, loads: {counters['loads']}, "
+        f"chat evictions: {counters['evictions']}."
+    )
+    if sessions.empty:
+        st.info("No sessions yet.")
+    else:
+        st.metric("Open sessions", len(sessions), f"{sessions['Memory MB'].sum():.1f} MB in memory", delta_color="off")
+        st.dataframe(sessions, use_container_width=True, hide_index=True)
+    
+    if SERVICE_TIMINGS:
+        st.subheader("Service start-up")
+        st.caption("Import and construction of each service module on first use. A service module imported by another one counts towards that one.")
+        st.dataframe(
+            pd.DataFrame([{'Service': name, 'Init ms': to_ms(seconds)} for name, seconds in SERVICE_TIMINGS.items()]),
+            use_container_width=True,
+            hide_index=True
+        )
+    
+    metrics_text = render_prometheus()
+    st.download_button("⬇️ Prometheus metrics", metrics_text, file_name="metrics.txt", mime="text/plain")
+    with st.expander("Prometheus text"):
+        st.code(metrics_text, language=None)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
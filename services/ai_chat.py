@@ -0,0 +1,198 @@
+"""AI chat service with Gemini API and Hugging Face fallback."""
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+import requests
+import os
+import logging
+import threading
+import importlib.util
+from config.languages import SUPPORTED_LANGUAGES
+from config.translation import translator_service
+from services.chat_policy import ChatBackend, get_policy
+from services.intent import intent_classifier
+from services.knowledge import knowledge_index
+from utils.singleflight import single_flight
+from utils.metrics import span
+
+logger = logging.getLogger(__name__)
+
+class AIChatService:
+    def __init__(self, policy=None):
+        self.gemini_api_key = os.getenv('GEMINI_API_KEY')
+        self.hf_api_key = os.getenv('HUGGINGFACE_API_KEY')
+        self.fallback_model = None
+        self.fallback_error = None
+        self.fallback_lock = threading.Lock()
+        self.policy = policy or get_policy()
+        self.setup_gemini()
+        self.setup_fallback()
+    
+    def set_policy(self, policy):
+        """Replace the backend selection policy."""
+        self.policy = policy
+    
+    def setup_gemini(self):
+        """Setup Gemini AI."""
+        if self.gemini_api_key:
+            try:
+                import google.generativeai as genai
+                genai.configure(api_key=self.gemini_api_key)
+                self.gemini_model = genai.GenerativeModel('gemini-pro')
+            except Exception as e:
+                logger.warning("Gemini setup error: %s", e)
+                self.gemini_model = None
+        else:
+            self.gemini_model = None
+    
+    def setup_fallback(self):
+        """Setup Hugging Face fallback model; the model itself loads on first use."""
+        if importlib.util.find_spec('transformers') is None:
+            self.fallback_error = "transformers is not installed"
+    
+    def load_fallback(self):
+        """Load the fallback model once, shared by every caller."""
+        with self.fallback_lock:
+            if self.fallback_model is None and self.fallback_error is None:
+                try:
+                    from transformers import pipeline
+                    
+                    # Use a smaller, faster model for fallback
+                    with span('model.chat_fallback.load'):
+                        self.fallback_model = pipeline(
+                            "text-generation",
+                            model="microsoft/DialoGPT-medium",
+                            device=-1  # Use CPU
+                        )
+                except Exception as e:
+                    self.fallback_error = e
+        
+        if self.fallback_model is None:
+            raise RuntimeError(f"Fallback model setup error: {self.fallback_error}")
+        return self.fallback_model
+    
+    @single_flight('chat.response')
+    def get_farming_response(self, query, language='en', context=None, query_language=None, history=None):
+        """Get AI response for farming queries, in the requested language."""
+        # Ground the answer in local advisory documents
+        references = knowledge_index.get_context(query)
+        if references:
+            context = f"{context}\n{references}" if context else references
+        
+        # Ask for the answer directly in the farmer's language
+        response_language = self.language_name(language)
+        query_language = self.language_name(query_language or translator_service.detect_language(query))
+        
+        # Create farming-focused prompt
+        farming_prompt = f"""
+        You are an expert agricultural advisor helping farmers. 
+        The farmer wrote in {query_language}. Respond only in {response_language}.
+        Provide practical, actionable advice in simple language that farmers can understand.
+        Focus on local farming practices and be specific about timing, quantities, and methods.
+        
+        Conversation so far: {history if history else 'None'}
+        
+        Farmer's question: {query}
+        
+        Additional context: {context if context else 'None'}
+        
+        Provide a helpful response with:
+        1. Direct answer to the question
+        2. Practical steps to take
+        3. Any warnings or precautions
+        4. Best timing for the advice
+        """
+        
+        # Race the configured backends within the latency budget
+        backend_name, response, errors = self.policy.select(self.get_backends(), farming_prompt)
+        
+        for name, error in errors:
+            logger.warning("%s error: %s", name, error)
+            # API and report worker threads have no page to show it on
+            if get_script_run_ctx() is not None:
+                st.warning(f"{name} error: {error}")
+        
+        # Final fallback - basic response
+        if not response:
+            response = self.get_basic_farming_response(query, language)
+        
+        # Only sentences the backend did not write in the target language are translated
+        return translator_service.translate_text(response, language)
+    
+    def language_name(self, language):
+        """Get the English name of a language code for prompts."""
+        name = SUPPORTED_LANGUAGES.get(language, {}).get('name', language)
+        return name.split('(')[-1].rstrip(')')
+    
+    def get_backends(self):
+        """Get the available text generation backends in priority order."""
+        backends = []
+        
+        if self.gemini_model:
+            backends.append(ChatBackend('Gemini API', self.generate_gemini, stream=self.stream_gemini))
+        
+        if self.fallback_error is None:
+            backends.append(ChatBackend('Fallback model', self.generate_fallback))
+        
+        return backends
+    
+    def generate_gemini(self, prompt):
+        """Generate a response with Gemini."""
+        with span('gemini.generate'):
+            response = self.gemini_model.generate_content(prompt)
+            return response.text
+    
+    def stream_gemini(self, prompt):
+        """Stream a response from Gemini chunk by chunk."""
+        with span('gemini.stream'):
+            for chunk in self.gemini_model.generate_content(prompt, stream=True):
+                yield chunk.text
+    
+    def generate_fallback(self, prompt):
+        """Generate a response with the Hugging Face fallback model."""
+        model = self.load_fallback()
+        with span('model.chat_fallback'):
+            response = model(
+                prompt,
+                max_length=200,
+                num_return_sequences=1,
+                temperature=0.7
+            )
+        return response[0]['generated_text']
+    
+    def get_basic_farming_response(self, query, language='en'):
+        """Basic farming responses when AI models are unavailable."""
+        basic_responses = {
+            'en': {
+                'weather': "Check local weather forecasts regularly. Plan irrigation and harvesting based on weather predictions.",
+                'soil': "Test your soil pH and nutrient levels. Add organic matter like compost to improve soil health.",
+                'pest': "Monitor crops regularly for pests. Use integrated pest management combining biological and chemical controls.",
+                'fertilizer': "Apply fertilizers based on soil test results. Use organic fertilizers when possible.",
+                'irrigation': "Water crops early morning or evening. Ensure proper drainage to prevent waterlogging.",
+                'default': "For specific farming advice, consult your local agricultural extension officer or experienced farmers in your area."
+            },
+            'hi': {
+                'weather': "स्थानीय मौसम पूर्वानुमान नियमित रूप से जांचें। मौसम की भविष्यवाणी के आधार पर सिंचाई और कटाई की योजना बनाएं।",
+                'soil': "अपनी मिट्टी का pH और पोषक तत्व स्तर जांचें। मिट्टी के स्वास्थ्य में सुधार के लिए कंपोस्ट जैसे जैविक पदार्थ जोड़ें।",
+                'pest': "कीटों के लिए नियमित रूप से फसलों की निगरानी करें। जैविक और रासायनिक नियंत्रण को मिलाकर एकीकृत कीट प्रबंधन का उपयोग करें।",
+                'fertilizer': "मिट्टी परीक्षण परिणामों के आधार पर उर्वरक लगाएं। जब संभव हो तो जैविक उर्वरकों का उपयोग करें।",
+                'irrigation': "सुबह जल्दी या शाम को फसलों को पानी दें। जलभराव को रोकने के लिए उचित जल निकासी सुनिश्चित करें।",
+                'default': "विशिष्ट कृषि सलाह के लिए, अपने स्थानीय कृषि विस्तार अधिकारी या अपने क्षेत्र के अनुभवी किसानों से सलाह लें।"
+            }
+        }
+        
+        topics = intent_classifier.topic_scores(query)
+        responses = basic_responses.get(language, basic_responses['en'])
+        
+        for key in responses:
+            if key in topics:
+                return responses[key]
+        
+        return responses['default']
+    
+    def detect_intent(self, query):
+        """Detect the intent of the user query."""
+        return intent_classifier.classify(query)
+
+# Global AI chat service instance
+ai_chat_service = AIChatService()
\ No newline at end of file
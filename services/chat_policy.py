@@ -0,0 +1,172 @@
+"""Backend selection policies for the AI chat service."""
+
+import os
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+class Heartbeat:
+    """When a backend last produced output, and whether its caller gave up on it."""
+    
+    def __init__(self):
+        self.last = time.monotonic()
+        self.cancelled = threading.Event()
+    
+    def beat(self):
+        self.last = time.monotonic()
+
+class ChatBackend:
+    """A named text generation backend."""
+    
+    def __init__(self, name, generate, stream=None):
+        self.name = name
+        self.generate = generate
+        self.stream = stream
+    
+    def run(self, prompt, heartbeat=None):
+        """Generate a full response, beating the heartbeat on every streamed chunk.
+        
+        A stream stops at its next chunk once the heartbeat is cancelled.
+        """
+        if self.stream:
+            chunks = []
+            for chunk in self.stream(prompt):
+                if heartbeat is not None:
+                    if heartbeat.cancelled.is_set():
+                        raise TimeoutError("abandoned by the caller")
+                    if chunk:
+                        heartbeat.beat()
+                chunks.append(chunk)
+            text = ''.join(chunks)
+        else:
+            text = self.generate(prompt)
+        
+        if heartbeat is not None:
+            heartbeat.beat()
+        return text
+
+class SequentialPolicy:
+    """Try each backend in turn until one answers."""
+    
+    def select(self, backends, prompt):
+        """Return (backend_name, text, errors) for the first backend that answers."""
+        errors = []
+        for backend in backends:
+            try:
+                text = backend.run(prompt)
+                if text:
+                    return backend.name, text, errors
+            except Exception as e:
+                errors.append((backend.name, e))
+        
+        return None, None, errors
+
+class HedgedPolicy:
+    """Race backends against a per-request latency budget.
+    
+    The primary backend starts immediately. If it has produced no output for
+    `hedge_after` seconds (or it fails), the next backend is started as well
+    and whichever answers first wins. Once `deadline` seconds have passed the
+    policy gives up so the caller can answer from rules. Backends that lose
+    or run out of time are cancelled: queued calls never start and streams
+    stop at their next chunk. Calls already blocked in a backend cannot be
+    interrupted, so no hedges are started while every worker is busy.
+    """
+    
+    def __init__(self, hedge_after=None, deadline=None, max_workers=None):
+        self.hedge_after = hedge_after if hedge_after is not None else float(os.getenv('CHAT_HEDGE_AFTER', '2.5'))
+        self.deadline = deadline if deadline is not None else float(os.getenv('CHAT_DEADLINE', '10'))
+        self.max_workers = max_workers or int(os.getenv('CHAT_BACKEND_WORKERS', '8'))
+        self.executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='chat-backend')
+        self.lock = threading.Lock()
+        self.in_flight = 0
+    
+    def saturated(self):
+        """Whether every worker already has a backend call, running or queued."""
+        with self.lock:
+            return self.in_flight >= self.max_workers
+    
+    def call(self, backend, prompt, heartbeat):
+        try:
+            return backend.run(prompt, heartbeat)
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+    
+    def abandon(self, pending):
+        """Cancel backend calls whose answer is no longer wanted."""
+        for future, (_, heartbeat) in pending.items():
+            heartbeat.cancelled.set()
+            if future.cancel():
+                # Never started, so call() will not count it down
+                with self.lock:
+                    self.in_flight -= 1
+    
+    def select(self, backends, prompt):
+        """Return (backend_name, text, errors) for the first backend that answers in time."""
+        start = time.monotonic()
+        deadline = start + self.deadline
+        waiting = list(backends)
+        pending = {}
+        errors = []
+        
+        def launch():
+            backend = waiting.pop(0)
+            heartbeat = Heartbeat()
+            with self.lock:
+                self.in_flight += 1
+            future = self.executor.submit(self.call, backend, prompt, heartbeat)
+            pending[future] = (backend, heartbeat)
+        
+        if not waiting:
+            return None, None, errors
+        launch()
+        
+        while pending:
+            now = time.monotonic()
+            if now >= deadline:
+                break
+            
+            # Hedge onto the next backend once nothing has produced output for
+            # hedge_after seconds; a stream that stalls re-arms the timer
+            wake_at = deadline
+            if waiting:
+                if self.saturated():
+                    wake_at = now + self.hedge_after
+                else:
+                    next_hedge = max(heartbeat.last for _, heartbeat in pending.values()) + self.hedge_after
+                    if now >= next_hedge:
+                        launch()
+                        continue
+                    wake_at = next_hedge
+            
+            done, _ = wait(pending, timeout=max(0, min(wake_at, deadline) - now), return_when=FIRST_COMPLETED)
+            for future in done:
+                backend, _ = pending.pop(future)
+                try:
+                    text = future.result()
+                    if text:
+                        self.abandon(pending)
+                        return backend.name, text, errors
+                except Exception as e:
+                    errors.append((backend.name, e))
+            
+            # A failed backend is replaced straight away
+            if waiting and not pending:
+                launch()
+        
+        for backend, _ in pending.values():
+            errors.append((backend.name, TimeoutError(f"no answer within {self.deadline:.1f}s budget")))
+        self.abandon(pending)
+        return None, None, errors
+
+# Available policies, selected with CHAT_BACKEND_POLICY
+POLICIES = {
+    'hedged': HedgedPolicy,
+    'sequential': SequentialPolicy
+}
+
+def get_policy(name=None):
+    """Create the backend selection policy with the given name."""
+    name = name or os.getenv('CHAT_BACKEND_POLICY', 'hedged')
+    return POLICIES.get(name, HedgedPolicy)()
\ No newline at end of file
@@ -0,0 +1,111 @@
+"""Concurrent context gathering for the AI chat."""
+
+import os
+from concurrent.futures import ThreadPoolExecutor, wait
+from services.weather import weather_service
+from services.soil import soil_service
+
+# Context sources worth fetching for each intent
+INTENT_SOURCES = {
+    'weather': ['weather', 'forecast'],
+    'irrigation': ['weather', 'forecast', 'soil'],
+    'soil': ['soil', 'weather'],
+    'disease': ['diagnosis', 'weather'],
+    'crop_management': ['weather', 'forecast', 'soil'],
+    'general': ['weather']
+}
+
+class ContextAssembler:
+    """Fetch the context a chat intent needs in parallel, within a hard deadline.
+    
+    Every source starts at once; whatever has arrived by the deadline goes
+    into the prompt and slower sources are left out.
+    """
+    
+    def __init__(self, deadline=None, max_workers=None):
+        self.deadline = deadline if deadline is not None else float(os.getenv('CHAT_CONTEXT_DEADLINE', '3'))
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers or int(os.getenv('CHAT_CONTEXT_WORKERS', '16')),
+            thread_name_prefix='chat-context'
+        )
+    
+    def gather(self, intent, location=None, diagnosis=None):
+        """Build the context string for an intent, or None if nothing arrived in time."""
+        sources = INTENT_SOURCES.get(intent, INTENT_SOURCES['general'])
+        lines = {}
+        futures = {}
+        
+        for source in sources:
+            if source == 'diagnosis':
+                # Past diagnosis is already in the session, no fetch needed
+                if diagnosis:
+                    lines[source] = self.describe_diagnosis(diagnosis)
+            elif location:
+                fetch = getattr(self, f"fetch_{source}")
+                futures[self.executor.submit(fetch, location['latitude'], location['longitude'])] = source
+        
+        if futures:
+            done, _ = wait(futures, timeout=self.deadline)
+            for future in done:
+                try:
+                    line = future.result()
+                except Exception:
+                    line = None
+                if line:
+                    lines[futures[future]] = line
+        
+        # Keep a stable order regardless of arrival order
+        context = [lines[source] for source in sources if source in lines]
+        return '\n'.join(context) if context else None
+    
+    def fetch_weather(self, lat, lon):
+        """Summarize current weather."""
+        weather_data = weather_service.get_current_weather(lat, lon)
+        if not weather_data:
+            return None
+        
+        return (f"Current weather: {weather_data['weather'][0]['description']}, {weather_data['main']['temp']}°C, "
+                f"humidity {weather_data['main']['humidity']}%, wind {weather_data['wind']['speed']} m/s")
+    
+    def fetch_forecast(self, lat, lon):
+        """Summarize the next 24 hours of forecast."""
+        forecast_data = weather_service.get_weather_forecast(lat, lon, days=1)
+        if not forecast_data or not forecast_data.get('list'):
+            return None
+        
+        items = forecast_data['list'][:8]  # 3-hour steps
+        temps = [item['main']['temp'] for item in items]
+        rain = sum(item.get('rain', {}).get('3h', 0) for item in items)
+        chance = max(item.get('pop', 0) for item in items)
+        
+        summary = f"Next 24 hours: {min(temps):.0f}-{max(temps):.0f}°C"
+        if rain > 0:
+            summary += f", {rain:.1f} mm rain expected ({chance:.0%} chance)"
+        else:
+            summary += ", no rain expected"
+        return summary
+    
+    def fetch_soil(self, lat, lon):
+        """Summarize topsoil properties."""
+        soil_data = soil_service.get_soil_data(lat, lon)
+        if not soil_data:
+            return None
+        
+        parts = []
+        if 'phh2o' in soil_data:
+            parts.append(f"pH {soil_data['phh2o'] / 10:.1f}")
+        if 'soc' in soil_data:
+            parts.append(f"organic carbon {soil_data['soc'] / 10:.1f} g/kg")
+        if 'nitrogen' in soil_data:
+            parts.append(f"nitrogen {soil_data['nitrogen'] / 100:.2f} g/kg")
+        if all(k in soil_data for k in ['sand', 'clay', 'silt']):
+            parts.append(f"sand {soil_data['sand'] / 10:.0f}%, clay {soil_data['clay'] / 10:.0f}%, silt {soil_data['silt'] / 10:.0f}%")
+        
+        return f"Soil (0-5 cm): {', '.join(parts)}" if parts else None
+    
+    def describe_diagnosis(self, diagnosis):
+        """Summarize the last disease detection result."""
+        return f"Last crop image diagnosis: {diagnosis['label']} ({diagnosis['score']:.0%} confidence)"
+
+# Global context assembler instance
+context_assembler = ContextAssembler()
\ No newline at end of file
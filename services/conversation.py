@@ -0,0 +1,176 @@
+"""Bounded per-session conversation memory for the AI chat."""
+
+import os
+import sys
+import json
+import time
+import uuid
+from collections import deque
+from utils.text import WORD_PATTERN, split_segments, format_chat_message
+
+# How the speakers are named in prompts and summaries
+SPEAKERS = {'user': 'Farmer', 'assistant': 'Advisor'}
+
+def estimate_tokens(text):
+    """Rough token count for prompt budgeting.
+    
+    Models split English into about four characters per token and Indic
+    scripts into several tokens per word, so the larger estimate is used.
+    """
+    return int(max(len(text) / 4, len(WORD_PATTERN.findall(text)) * 4 / 3)) + 1
+
+def summarize_message(message, max_chars=160):
+    """One summary line for a message: its first sentence, clipped."""
+    pieces = split_segments(message['content'].strip())
+    first = pieces[0] if pieces else ''
+    if len(first) > max_chars:
+        first = first[:max_chars].rsplit(' ', 1)[0] + '…'
+    return f"{SPEAKERS.get(message['role'], message['role'])}: {first}"
+
+class ConversationMemory:
+    """Chat history for one session with bounded memory use.
+    
+    The most recent messages are kept verbatim. Older ones are appended to
+    a JSONL file under CHAT_SPILL_DIR and folded into a rolling summary of
+    one line per message, whose oldest lines are dropped once it outgrows
+    its token budget. Prompts get the summary and as many recent messages
+    as fit in CHAT_HISTORY_TOKENS.
+    """
+    
+    def __init__(self, window=None, summary_tokens=None, history_tokens=None, spill_dir=None):
+        self.window = window or int(os.getenv('CHAT_WINDOW_MESSAGES', '12'))
+        self.summary_tokens = summary_tokens or int(os.getenv('CHAT_SUMMARY_TOKENS', '300'))
+        self.history_tokens = history_tokens or int(os.getenv('CHAT_HISTORY_TOKENS', '1000'))
+        self.spill_dir = spill_dir or os.getenv('CHAT_SPILL_DIR', os.path.join('.cache', 'conversations'))
+        self.spill_path = os.path.join(self.spill_dir, f"{uuid.uuid4().hex}.jsonl")
+        self.recent = deque()
+        self.summary = deque()
+        self.summary_size = 0
+        self.spilled = 0
+        self.transcript = ''
+    
+    def __len__(self):
+        return self.spilled + len(self.recent)
+    
+    def add(self, role, content, language):
+        """Add a message, moving the oldest ones out of the window."""
+        message = {"role": role, "content": content, "language": language}
+        self.recent.append(message)
+        self.transcript += format_chat_message(message)
+        
+        if len(self.recent) > self.window:
+            cold = []
+            while len(self.recent) > self.window:
+                cold.append(self.recent.popleft())
+            self.spill(cold)
+            
+            # The transcript shows the window; older messages are on disk
+            self.transcript = ''.join(format_chat_message(message) for message in self.recent)
+        
+        return message
+    
+    def spill(self, messages):
+        """Write messages to disk and fold them into the summary."""
+        try:
+            os.makedirs(self.spill_dir, exist_ok=True)
+            with open(self.spill_path, 'a', encoding='utf-8') as spill_file:
+                for message in messages:
+                    spill_file.write(json.dumps(message, ensure_ascii=False) + '\n')
+        except OSError:
+            pass
+        self.spilled += len(messages)
+        
+        for message in messages:
+            line = summarize_message(message)
+            self.summary.append(line)
+            self.summary_size += estimate_tokens(line)
+        
+        while len(self.summary) > 1 and self.summary_size > self.summary_tokens:
+            self.summary_size -= estimate_tokens(self.summary.popleft())
+    
+    def size_bytes(self):
+        """Approximate bytes held in memory, for the session memory budget."""
+        return (sum(sys.getsizeof(message['content']) for message in self.recent)
+                + sum(sys.getsizeof(line) for line in self.summary)
+                + sys.getsizeof(self.transcript))
+    
+    def evict(self, keep=2):
+        """Move all but the last `keep` messages to disk to free memory; the window refills as the chat goes on."""
+        if len(self.recent) <= keep:
+            return
+        
+        cold = []
+        while len(self.recent) > keep:
+            cold.append(self.recent.popleft())
+        self.spill(cold)
+        self.transcript = ''.join(format_chat_message(message) for message in self.recent)
+    
+    def prompt_history(self, budget=None):
+        """Pack the summary and the latest messages into a token budget.
+        
+        Recent messages are added newest first so the last exchange always
+        makes it in; summary lines fill what is left. Returns None for a new
+        conversation.
+        """
+        budget = budget or self.history_tokens
+        recent = []
+        used = 0
+        
+        for message in reversed(self.recent):
+            line = f"{SPEAKERS.get(message['role'], message['role'])}: {message['content']}"
+            cost = estimate_tokens(line)
+            if used + cost > budget:
+                break
+            recent.append(line)
+            used += cost
+        
+        summary = []
+        if len(recent) == len(self.recent):
+            for line in reversed(self.summary):
+                cost = estimate_tokens(line)
+                if used + cost > budget:
+                    break
+                summary.append(line)
+                used += cost
+        
+        if not recent and not summary:
+            return None
+        
+        parts = []
+        if summary:
+            parts.append("Earlier in the conversation (summary):\n" + '\n'.join(reversed(summary)))
+        if recent:
+            parts.append("Recent messages:\n" + '\n'.join(reversed(recent)))
+        return '\n'.join(parts)
+    
+    def clear(self):
+        """Forget the conversation and delete its spill file."""
+        try:
+            os.remove(self.spill_path)
+        except OSError:
+            pass
+        
+        self.spill_path = os.path.join(self.spill_dir, f"{uuid.uuid4().hex}.jsonl")
+        self.recent.clear()
+        self.summary.clear()
+        self.summary_size = 0
+        self.spilled = 0
+        self.transcript = ''
+
+def prune_spill_files(spill_dir=None, max_age_hours=None):
+    """Delete spill files of conversations idle for longer than max_age_hours."""
+    spill_dir = spill_dir or os.getenv('CHAT_SPILL_DIR', os.path.join('.cache', 'conversations'))
+    max_age = (max_age_hours or float(os.getenv('CHAT_SPILL_MAX_AGE_HOURS', '24'))) * 3600
+    cutoff = time.time() - max_age
+    
+    try:
+        entries = list(os.scandir(spill_dir))
+    except OSError:
+        return
+    
+    for entry in entries:
+        try:
+            if entry.name.endswith('.jsonl') and entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+        except OSError:
+            pass
\ No newline at end of file
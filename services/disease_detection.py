@@ -1,10 +1,10 @@
 """Plant disease detection service using Hugging Face models."""
 
 import streamlit as st
-from transformers import pipeline
 from PIL import Image
-import torch
+import threading
 import numpy as np
+from utils.metrics import span
 import requests
 import os
 
@@ -12,27 +12,37 @@ class DiseaseDetectionService:
     def __init__(self):
         self.model_name = "linkanjarad/mobilenet_v2_1.0_224-plant-disease-identification"
         self.classifier = None
-        self.load_model()
+        self.load_error = None
+        self.lock = threading.Lock()
     
     def load_model(self):
-        """Load the plant disease detection model."""
-        try:
-            # Check if CUDA is available
-            device = 0 if torch.cuda.is_available() else -1
+        """Load the plant disease detection model on first use."""
+        with self.lock:
+            if self.classifier or self.load_error:
+                return self.classifier
             
-            self.classifier = pipeline(
-                "image-classification",
-                model=self.model_name,
-                device=device
-            )
-            st.success("Disease detection model loaded successfully!")
-        except Exception as e:
-            st.error(f"Error loading disease detection model: {e}")
-            self.classifier = None
+            try:
+                # Heavy imports stay out of app startup
+                import torch
+                from transformers import pipeline
+                
+                # Check if CUDA is available
+                device = 0 if torch.cuda.is_available() else -1
+                
+                with span('model.disease.load'):
+                    self.classifier = pipeline(
+                        "image-classification",
+                        model=self.model_name,
+                        device=device
+                    )
+            except Exception as e:
+                self.load_error = e
+            return self.classifier
     
     def detect_disease(self, image):
         """Detect plant disease from image."""
-        if not self.classifier:
+        if not self.load_model():
+            st.error(f"Error loading disease detection model: {self.load_error}")
             return None
         
         try:
@@ -41,7 +51,8 @@ class DiseaseDetectionService:
                 image = image.convert('RGB')
             
             # Get predictions
-            predictions = self.classifier(image)
+            with span('model.disease'):
+                predictions = self.classifier(image)
             
             # Return top 3 predictions
             return predictions[:3]
@@ -0,0 +1,118 @@
+"""Multilingual intent classification for farming queries."""
+
+import os
+import json
+import unicodedata
+from config.intents import INTENT_KEYWORDS
+from utils.text import WORD_PATTERN
+
+# Intent reported for each keyword topic
+TOPIC_INTENTS = {
+    'weather': 'weather',
+    'soil': 'soil',
+    'fertilizer': 'soil',
+    'pest': 'disease',
+    'disease': 'disease',
+    'irrigation': 'irrigation',
+    'crop_management': 'crop_management'
+}
+
+# Ties are broken in this order
+INTENT_PRIORITY = ['weather', 'soil', 'disease', 'irrigation', 'crop_management']
+
+def normalize(text):
+    """Normalize text for matching."""
+    return unicodedata.normalize('NFC', text).casefold()
+
+class KeywordTrie:
+    """Token trie that matches every keyword in one pass over the words of a text."""
+    
+    def __init__(self, keywords):
+        # keywords: iterable of (keyword, whole_word, payload)
+        self.root = {}
+        self.size = 1
+        
+        for keyword, whole_word, payload in keywords:
+            node = self.root
+            for char in keyword:
+                if char not in node:
+                    node[char] = {}
+                    self.size += 1
+                node = node[char]
+            node.setdefault(None, []).append((whole_word, payload))
+    
+    def find(self, text):
+        """Yield the payload of every keyword that starts a word in text."""
+        for token in WORD_PATTERN.findall(text):
+            node = self.root
+            last = len(token) - 1
+            
+            for index, char in enumerate(token):
+                node = node.get(char)
+                if node is None:
+                    break
+                for whole_word, payload in node.get(None, ()):
+                    if index == last or not whole_word:
+                        yield payload
+
+class IntentClassifier:
+    """Keyword-feature linear classifier over all supported languages.
+    
+    Every keyword hit adds its weight to its topic; topics roll up into
+    intents. Weights default to 1.0 and can be replaced by a small trained
+    model (JSON with optional "bias" and "weights" tables) via INTENT_MODEL_PATH.
+    """
+    
+    def __init__(self, keywords=None, model_path=None):
+        keywords = keywords or INTENT_KEYWORDS
+        model = self.load_model(model_path or os.getenv('INTENT_MODEL_PATH'))
+        self.bias = model.get('bias', {})
+        weights = model.get('weights', {})
+        
+        entries = []
+        for language, topics in keywords.items():
+            for topic, words in topics.items():
+                for word in words:
+                    whole_word = word.endswith('$') or word.isascii()
+                    word = normalize(word.rstrip('$'))
+                    features = weights.get(word, {topic: 1.0})
+                    entries.append((word, whole_word, tuple(features.items())))
+        
+        self.trie = KeywordTrie(entries)
+    
+    def load_model(self, model_path):
+        """Load optional classifier weights."""
+        if not model_path:
+            return {}
+        try:
+            with open(model_path, encoding='utf-8') as model_file:
+                return json.load(model_file)
+        except (OSError, ValueError):
+            return {}
+    
+    def topic_scores(self, text):
+        """Score every keyword topic found in the text."""
+        scores = dict(self.bias)
+        for features in self.trie.find(normalize(text)):
+            for topic, weight in features:
+                scores[topic] = scores.get(topic, 0.0) + weight
+        return {topic: score for topic, score in scores.items() if score > 0}
+    
+    def classify(self, text):
+        """Classify text into one of the farming intents."""
+        intent_scores = {}
+        for topic, score in self.topic_scores(text).items():
+            intent = TOPIC_INTENTS.get(topic, topic)
+            intent_scores[intent] = intent_scores.get(intent, 0.0) + score
+        
+        if not intent_scores:
+            return 'general'
+        
+        best = max(intent_scores.values())
+        for intent in INTENT_PRIORITY:
+            if intent_scores.get(intent) == best:
+                return intent
+        return max(intent_scores, key=intent_scores.get)
+
+# Global intent classifier instance
+intent_classifier = IntentClassifier()
\ No newline at end of file
@@ -0,0 +1,246 @@
+"""Local advisory knowledge index with BM25 retrieval."""
+
+import os
+import json
+import time
+import math
+import threading
+import numpy as np
+from utils.text import tokenize
+
+# BM25 parameters
+K1 = 1.5
+B = 0.75
+
+# Common English words that carry no advisory meaning
+STOPWORDS = {
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'can', 'do', 'for', 'from', 'how', 'i', 'in', 'is', 'it',
+    'my', 'of', 'on', 'or', 'should', 'so', 'the', 'to', 'was', 'what', 'when', 'which', 'with', 'why', 'will'
+}
+
+def terms_of(text):
+    """Tokenize text into index terms."""
+    return [token for token in tokenize(text) if token not in STOPWORDS]
+
+class KnowledgeIndex:
+    """BM25 index over local advisory documents (crop calendars, package of practices).
+    
+    Documents are Markdown or text files in KNOWLEDGE_DIR. The index lives in
+    KNOWLEDGE_INDEX_DIR as memory-mapped numpy arrays, so it is shared by the
+    OS page cache and loads instantly. Only new or changed documents are
+    re-chunked when the directory is refreshed. The loaded index is published
+    as one (chunks, vocab, postings_docs, postings_weights) tuple, so a search
+    never sees parts of two different loads.
+    """
+    
+    def __init__(self, docs_dir=None, index_dir=None, chunk_words=120, refresh_interval=None):
+        self.docs_dir = docs_dir or os.getenv('KNOWLEDGE_DIR', 'knowledge')
+        self.index_dir = index_dir or os.getenv('KNOWLEDGE_INDEX_DIR', os.path.join('.cache', 'knowledge_index'))
+        self.chunk_words = chunk_words
+        self.refresh_interval = refresh_interval if refresh_interval is not None else float(os.getenv('KNOWLEDGE_REFRESH_SECONDS', '60'))
+        self.lock = threading.Lock()
+        self.last_refresh = None
+        self.index = None
+    
+    def scan_documents(self):
+        """List advisory documents with their modification stamps."""
+        documents = {}
+        if not os.path.isdir(self.docs_dir):
+            return documents
+        
+        for root, _, files in os.walk(self.docs_dir):
+            for name in files:
+                if name.endswith(('.md', '.txt')):
+                    path = os.path.join(root, name)
+                    stat = os.stat(path)
+                    relpath = os.path.relpath(path, self.docs_dir).replace(os.sep, '/')
+                    documents[relpath] = [stat.st_mtime_ns, stat.st_size]
+        
+        return documents
+    
+    def chunk_document(self, relpath):
+        """Split a document into passages of roughly chunk_words words."""
+        with open(os.path.join(self.docs_dir, relpath), encoding='utf-8') as doc_file:
+            text = doc_file.read()
+        
+        title = os.path.splitext(os.path.basename(relpath))[0].replace('_', ' ').title()
+        section = title
+        chunks = []
+        current = []
+        
+        def flush():
+            if current:
+                passage = '\n'.join(current)
+                terms = {}
+                for term in terms_of(f"{section} {passage}"):
+                    terms[term] = terms.get(term, 0) + 1
+                chunks.append({
+                    'title': section,
+                    'text': passage,
+                    'terms': terms,
+                    'length': sum(terms.values())
+                })
+                current.clear()
+        
+        for paragraph in text.split('\n\n'):
+            paragraph = paragraph.strip()
+            if not paragraph:
+                continue
+            
+            # Headings start a new passage and label the ones under them
+            if paragraph.startswith('#'):
+                flush()
+                heading, _, paragraph = paragraph.partition('\n')
+                section = heading.lstrip('#').strip()
+                if not paragraph.strip():
+                    continue
+            
+            current.append(paragraph.strip())
+            if sum(len(part.split()) for part in current) >= self.chunk_words:
+                flush()
+        
+        flush()
+        return chunks
+    
+    def refresh(self, force=False):
+        """Re-index new or changed documents and reload the index."""
+        with self.lock:
+            if not force and self.last_refresh is not None and time.monotonic() - self.last_refresh < self.refresh_interval:
+                return
+            self.last_refresh = time.monotonic()
+            
+            manifest = self.read_json('manifest.json', {'files': {}})
+            documents = self.scan_documents()
+            changed = False
+            
+            for relpath in list(manifest['files']):
+                if relpath not in documents:
+                    del manifest['files'][relpath]
+                    changed = True
+            
+            for relpath, stamp in documents.items():
+                entry = manifest['files'].get(relpath)
+                if entry is None or entry['stamp'] != stamp:
+                    try:
+                        manifest['files'][relpath] = {'stamp': stamp, 'chunks': self.chunk_document(relpath)}
+                    except (OSError, UnicodeDecodeError):
+                        continue
+                    changed = True
+            
+            if changed or not os.path.exists(os.path.join(self.index_dir, 'vocab.json')):
+                self.build(manifest)
+            
+            self.load()
+    
+    def build(self, manifest):
+        """Write the postings arrays for every chunk in the manifest."""
+        chunks = []
+        for relpath, entry in sorted(manifest['files'].items()):
+            for chunk in entry['chunks']:
+                chunks.append((relpath, chunk))
+        
+        count = len(chunks)
+        avg_length = sum(chunk['length'] for _, chunk in chunks) / count if count else 0
+        
+        postings = {}
+        for doc_id, (_, chunk) in enumerate(chunks):
+            for term, tf in chunk['terms'].items():
+                postings.setdefault(term, []).append((doc_id, tf))
+        
+        # Precompute each posting's BM25 contribution so a query is a gather and a sum
+        vocab = {}
+        docs = []
+        weights = []
+        for term, entries in postings.items():
+            idf = math.log(1 + (count - len(entries) + 0.5) / (len(entries) + 0.5))
+            vocab[term] = [len(docs), len(entries)]
+            for doc_id, tf in entries:
+                norm = K1 * (1 - B + B * chunks[doc_id][1]['length'] / avg_length)
+                docs.append(doc_id)
+                weights.append(idf * tf * (K1 + 1) / (tf + norm))
+        
+        # Release the current memory maps before the files are replaced
+        self.index = None
+        
+        os.makedirs(self.index_dir, exist_ok=True)
+        self.write_array('postings_docs.npy', np.array(docs, dtype=np.int32))
+        self.write_array('postings_weights.npy', np.array(weights, dtype=np.float32))
+        self.write_json('chunks.json', [
+            {'source': relpath, 'title': chunk['title'], 'text': chunk['text']} for relpath, chunk in chunks
+        ])
+        self.write_json('vocab.json', vocab)
+        self.write_json('manifest.json', manifest)
+    
+    def load(self):
+        """Memory-map the index files."""
+        try:
+            chunks = self.read_json('chunks.json', [])
+            vocab = self.read_json('vocab.json', {})
+            postings_docs = np.load(os.path.join(self.index_dir, 'postings_docs.npy'), mmap_mode='r')
+            postings_weights = np.load(os.path.join(self.index_dir, 'postings_weights.npy'), mmap_mode='r')
+        except (OSError, ValueError):
+            self.index = None
+            return
+        self.index = (chunks, vocab, postings_docs, postings_weights)
+    
+    def search(self, query, k=3):
+        """Return the top-k passages for the query, best first."""
+        self.refresh()
+        index = self.index
+        if index is None or not index[0]:
+            return []
+        chunks, vocab, postings_docs, postings_weights = index
+        
+        scores = np.zeros(len(chunks), dtype=np.float32)
+        for term in set(terms_of(query)):
+            if term in vocab:
+                offset, length = vocab[term]
+                scores[postings_docs[offset:offset + length]] += postings_weights[offset:offset + length]
+        
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        
+        return [dict(chunks[i], score=float(scores[i])) for i in top if scores[i] > 0]
+    
+    def get_context(self, query, k=3, max_chars=1500):
+        """Format the top passages as prompt context."""
+        passages = []
+        used = 0
+        
+        for result in self.search(query, k):
+            passage = f"[{result['title']}] {result['text']}"
+            if used + len(passage) > max_chars:
+                break
+            passages.append(passage)
+            used += len(passage)
+        
+        if not passages:
+            return None
+        
+        return "Local advisory notes:\n" + '\n'.join(passages)
+    
+    def read_json(self, name, default):
+        """Read a JSON index file."""
+        try:
+            with open(os.path.join(self.index_dir, name), encoding='utf-8') as index_file:
+                return json.load(index_file)
+        except (OSError, ValueError):
+            return default
+    
+    def write_json(self, name, data):
+        """Atomically write a JSON index file."""
+        path = os.path.join(self.index_dir, name)
+        with open(path + '.tmp', 'w', encoding='utf-8') as index_file:
+            json.dump(data, index_file, ensure_ascii=False)
+        os.replace(path + '.tmp', path)
+    
+    def write_array(self, name, array):
+        """Atomically write a numpy index file."""
+        path = os.path.join(self.index_dir, name)
+        with open(path + '.tmp', 'wb') as index_file:
+            np.save(index_file, array)
+        os.replace(path + '.tmp', path)
+
+# Global knowledge index instance
+knowledge_index = KnowledgeIndex()
\ No newline at end of file
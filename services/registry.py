@@ -0,0 +1,45 @@
+"""Lazily constructed services shared by every session."""
+
+import sys
+import time
+import logging
+import importlib
+import streamlit as st
+
+logger = logging.getLogger(__name__)
+
+# Service name -> (module, global instance) it is built from
+SERVICES = {
+    'translator': ('config.translation', 'translator_service'),
+    'voice': ('config.voice', 'voice_service'),
+    'weather': ('services.weather', 'weather_service'),
+    'soil': ('services.soil', 'soil_service'),
+    'disease_detection': ('services.disease_detection', 'disease_detection_service'),
+    'ai_chat': ('services.ai_chat', 'ai_chat_service'),
+    'context': ('services.context', 'context_assembler'),
+    'report': ('services.report', 'farm_report_service')
+}
+
+# Seconds each service module took to import and construct. A service
+# module imported by another one counts towards that one.
+SERVICE_TIMINGS = {}
+
+def load_service(name):
+    """Import a service module and return its instance."""
+    module_name, attribute = SERVICES[name]
+    imported = module_name in sys.modules
+    start = time.perf_counter()
+    service = getattr(importlib.import_module(module_name), attribute)
+    if not imported and name not in SERVICE_TIMINGS:
+        SERVICE_TIMINGS[name] = time.perf_counter() - start
+        logger.info("Service %s ready in %.3fs", name, SERVICE_TIMINGS[name])
+    return service
+
+@st.cache_resource(show_spinner=False)
+def get_service(name):
+    """Get a shared service, importing and constructing it on first use.
+    
+    The instance is cached as a resource, so every session shares it and
+    concurrent first requests wait for a single construction.
+    """
+    return load_service(name)
\ No newline at end of file
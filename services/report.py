@@ -0,0 +1,141 @@
+"""One-shot farm report built from all services concurrently."""
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from config.translation import translator_service
+from services.weather import weather_service
+from services.soil import soil_service
+from services.disease_detection import disease_detection_service
+from services.ai_chat import ai_chat_service
+from services.context import context_assembler
+
+# Question the advice section answers for the report's location
+ADVICE_QUESTION = "What should I do on my farm this week, given the current weather and soil?"
+
+class FarmReportService:
+    """Build a localized farm report with every section fetched in parallel.
+    
+    Current weather, forecast, soil, each crop image and the advice all start
+    at once on a shared pool, so the report takes about as long as its
+    slowest section. Sections that miss the deadline or fail are left out.
+    """
+    
+    def __init__(self, deadline=None, max_workers=None):
+        self.deadline = deadline if deadline is not None else float(os.getenv('FARM_REPORT_DEADLINE', '30'))
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers or int(os.getenv('FARM_REPORT_WORKERS', '16')),
+            thread_name_prefix='farm-report'
+        )
+    
+    def build(self, location, language='en', images=()):
+        """Build the report for a location and optional crop images.
+        
+        Returns a dict with each finished section, the charts, a
+        summary text for speech and the seconds each section took.
+        """
+        lat, lon = location['latitude'], location['longitude']
+        start = time.perf_counter()
+        timings = {}
+        
+        def timed(name, function, *args):
+            section_start = time.perf_counter()
+            try:
+                return function(*args)
+            finally:
+                timings[name] = time.perf_counter() - section_start
+        
+        futures = {
+            self.executor.submit(timed, 'weather', self.weather_section, lat, lon, language): 'weather',
+            self.executor.submit(timed, 'forecast', self.forecast_section, lat, lon): 'forecast',
+            self.executor.submit(timed, 'soil', self.soil_section, lat, lon, language): 'soil',
+            self.executor.submit(timed, 'advice', self.advice_section, location, language): 'advice'
+        }
+        for index, image in enumerate(images, 1):
+            name = f'disease {index}'
+            futures[self.executor.submit(timed, name, self.disease_section, image, language)] = name
+        
+        done, _ = wait(futures, timeout=self.deadline)
+        
+        report = {'weather': None, 'soil': None, 'advice': None, 'diseases': [], 'charts': [], 'missing': []}
+        for future, name in futures.items():
+            try:
+                result = future.result() if future in done else None
+            except Exception:
+                result = None
+            
+            if not result:
+                report['missing'].append(name)
+            elif name == 'forecast':
+                report['charts'].insert(0, result)
+            elif name == 'soil':
+                report['soil'], charts = result
+                report['charts'].extend(charts)
+            elif name.startswith('disease'):
+                report['diseases'].append(result)
+            else:
+                report[name] = result
+        
+        report['summary'] = self.summarize(report, language)
+        report['timings'] = dict(timings, total=time.perf_counter() - start)
+        return report
+    
+    def dedent(self, text):
+        """Drop the template indentation of a localized report."""
+        return '\n'.join(line.strip() for line in text.strip().splitlines())
+    
+    def weather_section(self, lat, lon, language):
+        """Current weather with advice for farmers."""
+        weather_data = weather_service.get_current_weather(lat, lon)
+        if not weather_data:
+            return None
+        return self.dedent(weather_service.format_weather_for_farmers(weather_data, language))
+    
+    def forecast_section(self, lat, lon):
+        """Forecast chart."""
+        forecast_data = weather_service.get_weather_forecast(lat, lon)
+        if not forecast_data:
+            return None
+        return weather_service.create_weather_chart(forecast_data)
+    
+    def soil_section(self, lat, lon, language):
+        """Soil interpretation and its charts."""
+        soil_data = soil_service.get_soil_data(lat, lon)
+        if not soil_data:
+            return None
+        
+        analysis = self.dedent(soil_service.interpret_soil_data(soil_data, language))
+        charts = [soil_service.create_soil_chart(soil_data), soil_service.create_soil_properties_chart(soil_data)]
+        return analysis, [chart for chart in charts if chart]
+    
+    def disease_section(self, image, language):
+        """Disease detection results for one crop image."""
+        predictions = disease_detection_service.detect_disease(image)
+        if not predictions:
+            return None
+        return disease_detection_service.format_detection_results(predictions, language)
+    
+    def advice_section(self, location, language):
+        """Advice for the week; its weather and soil fetches coalesce with the report's own."""
+        context = context_assembler.gather('crop_management', location)
+        return ai_chat_service.get_farming_response(ADVICE_QUESTION, language, context, 'en')
+    
+    def summarize(self, report, language):
+        """Join the report sections under their headings, for reading aloud."""
+        ui_text = translator_service.get_ui_text
+        sections = [
+            ('weather_title', [report['weather']]),
+            ('soil_title', [report['soil']]),
+            ('disease_title', report['diseases']),
+            ('advisory_title', [report['advice']])
+        ]
+        
+        parts = []
+        for heading, texts in sections:
+            texts = [text.strip() for text in texts if text]
+            if texts:
+                parts.append(ui_text(heading, language) + '\n' + '\n\n'.join(texts))
+        return '\n\n'.join(parts)
+
+# Global farm report service instance
+farm_report_service = FarmReportService()
\ No newline at end of file
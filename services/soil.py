@@ -1,15 +1,20 @@
 """Soil analysis service using SoilGrids API."""
 
+import os
 import requests
 import streamlit as st
 import plotly.graph_objects as go
 import plotly.express as px
 import pandas as pd
+from utils.singleflight import single_flight
+from utils.metrics import span
+from config.templates import message_catalog
 
 class SoilService:
     def __init__(self):
-        self.base_url = "https://rest.soilgrids.org"
+        self.base_url = os.getenv('SOILGRIDS_BASE_URL', "https://rest.soilgrids.org")
     
+    @single_flight('soil.data')
     def get_soil_data(self, lat, lon):
         """Get soil data from SoilGrids API."""
         try:
@@ -35,7 +40,11 @@ class SoilService:
                     'value': 'mean'
                 }
                 
-                response = requests.get(url, params=params, timeout=10)
+                with span('soilgrids.query') as request_span:
+                    response = requests.get(url, params=params, timeout=10)
+                    if response.status_code != 200:
+                        request_span.fail()
+                
                 if response.status_code == 200:
                     data = response.json()
                     if 'properties' in data and prop in data['properties']:
@@ -55,8 +64,10 @@ class SoilService:
     
     def interpret_soil_data(self, soil_data, language='en'):
         """Interpret soil data for farmers."""
+        msg = message_catalog.render
+        
         if not soil_data:
-            return "Soil data not available."
+            return msg('soil.unavailable', language)
         
         interpretation = []
         recommendations = []
@@ -65,24 +76,24 @@ class SoilService:
         if 'phh2o' in soil_data:
             ph = soil_data['phh2o'] / 10  # Convert from pH*10 to pH
             if ph < 6.0:
-                interpretation.append(f"🔴 Soil is acidic (pH: {ph:.1f})")
-                recommendations.append("Consider adding lime to reduce acidity")
+                interpretation.append(msg('soil.acidic', language, ph=ph))
+                recommendations.append(msg('soil.add_lime', language))
             elif ph > 8.0:
-                interpretation.append(f"🔵 Soil is alkaline (pH: {ph:.1f})")
-                recommendations.append("Consider adding organic matter or sulfur")
+                interpretation.append(msg('soil.alkaline', language, ph=ph))
+                recommendations.append(msg('soil.add_sulfur', language))
             else:
-                interpretation.append(f"🟢 Soil pH is good (pH: {ph:.1f})")
+                interpretation.append(msg('soil.ph_good', language, ph=ph))
         
         # Organic carbon
         if 'soc' in soil_data:
             soc = soil_data['soc'] / 10  # Convert to g/kg
             if soc < 10:
-                interpretation.append(f"🔴 Low organic matter ({soc:.1f} g/kg)")
-                recommendations.append("Add compost or organic fertilizers")
+                interpretation.append(msg('soil.low_organic', language, soc=soc))
+                recommendations.append(msg('soil.add_compost', language))
             elif soc > 30:
-                interpretation.append(f"🟢 High organic matter ({soc:.1f} g/kg)")
+                interpretation.append(msg('soil.high_organic', language, soc=soc))
             else:
-                interpretation.append(f"🟡 Moderate organic matter ({soc:.1f} g/kg)")
+                interpretation.append(msg('soil.moderate_organic', language, soc=soc))
         
         # Soil texture
         if all(k in soil_data for k in ['sand', 'clay', 'silt']):
@@ -91,30 +102,30 @@ class SoilService:
             silt = soil_data['silt'] / 10
             
             if clay > 40:
-                interpretation.append("🟤 Clay soil - good for water retention")
-                recommendations.append("Ensure good drainage, avoid overwatering")
+                interpretation.append(msg('soil.clay', language))
+                recommendations.append(msg('soil.clay_advice', language))
             elif sand > 60:
-                interpretation.append("🟡 Sandy soil - good drainage")
-                recommendations.append("Water more frequently, add organic matter")
+                interpretation.append(msg('soil.sandy', language))
+                recommendations.append(msg('soil.sandy_advice', language))
             else:
-                interpretation.append("🟢 Loamy soil - ideal for most crops")
+                interpretation.append(msg('soil.loamy', language))
         
         # Nitrogen
         if 'nitrogen' in soil_data:
             nitrogen = soil_data['nitrogen'] / 100  # Convert to g/kg
             if nitrogen < 1:
-                interpretation.append(f"🔴 Low nitrogen ({nitrogen:.2f} g/kg)")
-                recommendations.append("Apply nitrogen-rich fertilizers")
+                interpretation.append(msg('soil.low_nitrogen', language, nitrogen=nitrogen))
+                recommendations.append(msg('soil.add_nitrogen', language))
             else:
-                interpretation.append(f"🟢 Adequate nitrogen ({nitrogen:.2f} g/kg)")
+                interpretation.append(msg('soil.nitrogen_ok', language, nitrogen=nitrogen))
         
         result = f"""
-        🌱 Soil Analysis Results:
+        {msg('soil.title', language)}
         
         {chr(10).join([f'• {item}' for item in interpretation])}
         
-        🧑‍🌾 Recommendations:
-        {chr(10).join([f'• {rec}' for rec in recommendations]) if recommendations else '• Your soil conditions are generally good for farming.'}
+        {msg('soil.recommendations_title', language)}
+        {chr(10).join([f'• {rec}' for rec in recommendations]) if recommendations else f"• {msg('soil.good', language)}"}
         """
         
         return result
@@ -6,12 +6,16 @@ import os
 from datetime import datetime
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
+from utils.singleflight import single_flight
+from utils.metrics import span
+from config.templates import message_catalog
 
 class WeatherService:
     def __init__(self):
         self.api_key = os.getenv('OPENWEATHER_API_KEY')
-        self.base_url = "http://api.openweathermap.org/data/2.5"
+        self.base_url = os.getenv('OPENWEATHER_BASE_URL', "http://api.openweathermap.org/data/2.5")
     
+    @single_flight('weather.current')
     def get_current_weather(self, lat, lon):
         """Get current weather data."""
         if not self.api_key:
@@ -27,14 +31,16 @@ class WeatherService:
                 'units': 'metric'
             }
             
-            response = requests.get(url, params=params, timeout=10)
-            response.raise_for_status()
+            with span('openweather.current'):
+                response = requests.get(url, params=params, timeout=10)
+                response.raise_for_status()
             
             return response.json()
         except requests.exceptions.RequestException as e:
             st.error(f"Weather API error: {e}")
             return None
     
+    @single_flight('weather.forecast')
     def get_weather_forecast(self, lat, lon, days=5):
         """Get weather forecast."""
         if not self.api_key:
@@ -50,8 +56,9 @@ class WeatherService:
                 'cnt': days * 8  # 8 forecasts per day (3-hour intervals)
             }
             
-            response = requests.get(url, params=params, timeout=10)
-            response.raise_for_status()
+            with span('openweather.forecast'):
+                response = requests.get(url, params=params, timeout=10)
+                response.raise_for_status()
             
             return response.json()
         except requests.exceptions.RequestException as e:
@@ -60,8 +67,10 @@ class WeatherService:
     
     def format_weather_for_farmers(self, weather_data, language='en'):
         """Format weather data in farmer-friendly language."""
+        msg = message_catalog.render
+        
         if not weather_data:
-            return "Weather data not available."
+            return msg('weather.unavailable', language)
         
         temp = weather_data['main']['temp']
         humidity = weather_data['main']['humidity']
@@ -72,33 +81,48 @@ class WeatherService:
         advice = []
         
         if temp > 35:
-            advice.append("Very hot weather - ensure adequate irrigation and shade for crops.")
+            advice.append(msg('weather.hot', language))
         elif temp < 10:
-            advice.append("Cold weather - protect sensitive crops from frost.")
+            advice.append(msg('weather.cold', language))
         
         if humidity > 80:
-            advice.append("High humidity - watch for fungal diseases.")
+            advice.append(msg('weather.humid', language))
         elif humidity < 30:
-            advice.append("Low humidity - increase watering frequency.")
+            advice.append(msg('weather.dry', language))
         
         if wind_speed > 10:
-            advice.append("Strong winds - secure tall crops and check for damage.")
+            advice.append(msg('weather.windy', language))
         
         if 'rain' in description.lower():
-            advice.append("Rain expected - postpone spraying and harvesting if possible.")
+            advice.append(msg('weather.rain', language))
         
         weather_summary = f"""
-        🌡️ Temperature: {temp}°C
-        💧 Humidity: {humidity}%
-        🌤️ Conditions: {description.title()}
-        💨 Wind Speed: {wind_speed} m/s
+        {msg('weather.temperature', language, temp=temp)}
+        {msg('weather.humidity', language, humidity=humidity)}
+        {msg('weather.conditions', language, conditions=self.describe_conditions(weather_data, language))}
+        {msg('weather.wind', language, wind_speed=wind_speed)}
         
-        🧑‍🌾 Farming Advice:
-        {' '.join([f'• {tip}' for tip in advice]) if advice else '• Weather conditions are favorable for normal farming activities.'}
+        {msg('weather.advice_title', language)}
+        {' '.join([f'• {tip}' for tip in advice]) if advice else f"• {msg('weather.favorable', language)}"}
         """
         
         return weather_summary
     
+    def describe_conditions(self, weather_data, language='en'):
+        """Name the weather conditions in the given language."""
+        description = weather_data['weather'][0]['description']
+        if language == 'en':
+            return description.title()
+        
+        # OpenWeather condition groups with a pre-translated name
+        group = weather_data['weather'][0].get('main', '').lower()
+        if group in ('mist', 'haze', 'fog', 'smoke', 'dust'):
+            group = 'mist'
+        if group in ('clear', 'clouds', 'rain', 'drizzle', 'thunderstorm', 'mist'):
+            return message_catalog.render(f'condition.{group}', language)
+        
+        return description.title()
+    
     def create_weather_chart(self, forecast_data):
         """Create weather visualization chart."""
         if not forecast_data:
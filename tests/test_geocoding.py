@@ -0,0 +1,62 @@
+"""Tests for the offline nearest-place index and the geocoder's offline answers."""
+
+import numpy as np
+import pytest
+from utils.geocoding import GridIndex, Gazetteer, Geocoder, haversine_km
+
+def brute_force(index, lat, lon):
+    distances = haversine_km(lat, lon, index.latitudes, index.longitudes)
+    return float(distances.min())
+
+@pytest.fixture(scope='module')
+def gazetteer():
+    return Gazetteer()
+
+def test_nearest_matches_brute_force_on_gazetteer(gazetteer):
+    index = gazetteer.grid
+    rng = np.random.default_rng(7)
+    latitudes = rng.uniform(6, 36, 3000)
+    longitudes = rng.uniform(68, 98, 3000)
+    
+    for lat, lon in zip(latitudes, longitudes):
+        point_id, distance = index.nearest(lat, lon)
+        assert distance == pytest.approx(brute_force(index, lat, lon), abs=1e-9)
+        assert distance == pytest.approx(float(haversine_km(lat, lon, index.latitudes[point_id], index.longitudes[point_id])))
+
+def test_nearest_many_matches_nearest(gazetteer):
+    index = gazetteer.grid
+    rng = np.random.default_rng(11)
+    latitudes = rng.uniform(6, 36, 2000)
+    longitudes = rng.uniform(68, 98, 2000)
+    
+    _, distances = index.nearest_many(latitudes, longitudes)
+    expected = [brute_force(index, lat, lon) for lat, lon in zip(latitudes, longitudes)]
+    assert np.allclose(distances, expected, atol=1e-9)
+
+def test_nearest_on_sparse_points_far_from_the_equator():
+    # Cells at high latitude are narrow in km, where a flat bound would stop too early
+    rng = np.random.default_rng(3)
+    index = GridIndex(rng.uniform(55, 70, 300), rng.uniform(-20, 40, 300), cell_degrees=1.0)
+    
+    for lat, lon in zip(rng.uniform(50, 75, 500), rng.uniform(-30, 50, 500)):
+        _, distance = index.nearest(lat, lon)
+        assert distance == pytest.approx(brute_force(index, lat, lon), abs=1e-9)
+
+def test_empty_index_has_no_nearest_point():
+    index = GridIndex([], [])
+    assert index.nearest(20.0, 78.0) == (None, float('inf'))
+
+def test_reverse_answers_offline_only_near_a_place(monkeypatch, gazetteer):
+    geocoder = Geocoder()
+    geocoder.gazetteer = gazetteer
+    online = []
+    monkeypatch.setattr(geocoder, 'reverse_online', lambda lat, lon: online.append((lat, lon)))
+    
+    place = gazetteer.places[0]
+    location = geocoder.reverse(place['latitude'] + 0.01, place['longitude'])
+    assert location['city'] == place['city'] and location['state'] == place['state']
+    assert online == []
+    
+    # Far out at sea nothing offline is close enough
+    assert geocoder.reverse(15.0, 60.0) is None
+    assert online == [(15.0, 60.0)]
\ No newline at end of file
@@ -0,0 +1,74 @@
+"""Tests for the BM25 advisory index."""
+
+import threading
+from services.knowledge import KnowledgeIndex
+
+RICE = """# Rice
+
+## Stem borer
+Stem borer larvae bore into the rice stem and cause dead hearts. Release
+Trichogramma egg parasitoids and remove egg masses.
+
+## Irrigation
+Keep 5 cm of standing water in the paddy until flowering.
+"""
+
+WHEAT = """# Wheat
+
+## Irrigation
+Irrigate wheat at crown root initiation, about 21 days after sowing.
+"""
+
+def make_index(tmp_path):
+    docs = tmp_path / 'docs'
+    docs.mkdir()
+    (docs / 'rice.md').write_text(RICE, encoding='utf-8')
+    (docs / 'wheat.md').write_text(WHEAT, encoding='utf-8')
+    return KnowledgeIndex(str(docs), str(tmp_path / 'index'), chunk_words=20, refresh_interval=0)
+
+def test_search_ranks_matching_passage_first(tmp_path):
+    index = make_index(tmp_path)
+    results = index.search("stem borer in rice")
+    
+    assert results[0]['title'] == 'Stem borer'
+    assert [result['score'] for result in results] == sorted((result['score'] for result in results), reverse=True)
+
+def test_search_without_matching_terms_is_empty(tmp_path):
+    index = make_index(tmp_path)
+    assert index.search("tractor loan") == []
+
+def test_changed_document_is_reindexed(tmp_path):
+    index = make_index(tmp_path)
+    assert index.search("mustard aphids") == []
+    
+    (tmp_path / 'docs' / 'mustard.md').write_text("# Mustard\n\nSpray neem oil against mustard aphids.", encoding='utf-8')
+    assert index.search("mustard aphids")[0]['title'] == 'Mustard'
+
+def test_search_during_reload_sees_a_whole_index(tmp_path):
+    index = make_index(tmp_path)
+    index.refresh(force=True)
+    errors = []
+    stop = threading.Event()
+    
+    def reload():
+        while not stop.is_set():
+            index.load()
+    
+    def search():
+        try:
+            for _ in range(300):
+                index.search("irrigation water")
+        except Exception as e:
+            errors.append(e)
+    
+    reloader = threading.Thread(target=reload)
+    reloader.start()
+    searchers = [threading.Thread(target=search) for _ in range(4)]
+    for thread in searchers:
+        thread.start()
+    for thread in searchers:
+        thread.join()
+    stop.set()
+    reloader.join()
+    
+    assert errors == []
\ No newline at end of file
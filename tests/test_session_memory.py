@@ -0,0 +1,159 @@
+"""Tests for session memory budgets, spilling and loading."""
+
+import time
+import pytest
+from utils import session_memory as session_memory_module
+from types import SimpleNamespace
+from utils.session_memory import SessionMemory, SessionStore, Spilled, estimate_size
+
+class Chat:
+    """Stands in for the chat memory: drops half its messages on evict()."""
+    
+    def __init__(self, count):
+        self.messages = [b'x' * 1024 for _ in range(count)]
+        self.evictions = 0
+    
+    def evict(self):
+        self.evictions += 1
+        del self.messages[:len(self.messages) // 2]
+    
+    def size_bytes(self):
+        return 1024 * len(self.messages)
+
+class State(dict):
+    """Stands in for st.session_state."""
+    
+    def to_dict(self):
+        return dict(self)
+
+def make_memory(tmp_path, session_budget=64 * 1024, total_budget=1024 * 1024):
+    return SessionMemory(session_budget, total_budget, 1, str(tmp_path))
+
+def make_store(memory, tmp_path, name, idle_seconds=0):
+    store = SessionStore(name, str(tmp_path / name))
+    store.last_seen = time.time() - idle_seconds
+    memory.sessions.add(store)
+    return store
+
+def age(store, key, seconds):
+    store.used[key] -= seconds
+
+def test_estimate_size_counts_shared_objects_once():
+    block = b'x' * 10000
+    assert estimate_size([block, block]) < 2 * estimate_size(block)
+    assert estimate_size({'a': block}) > 10000
+
+def test_cold_values_spill_and_load_back(tmp_path, monkeypatch):
+    memory = make_memory(tmp_path)
+    store = make_store(memory, tmp_path, 'one')
+    monkeypatch.setattr(memory, 'store', lambda: store)
+    
+    memory.put('old', b'a' * 40000)
+    age(store, 'old', 60)
+    memory.put('new', b'b' * 40000)
+    memory.enforce(store)
+    
+    assert isinstance(store.values['old'], Spilled)
+    assert store.size <= memory.session_budget
+    assert memory.get('old') == b'a' * 40000
+    assert memory.stats()['spills'] == 1 and memory.stats()['loads'] == 1
+
+def test_loaded_value_is_not_spilled_again_right_away(tmp_path, monkeypatch):
+    memory = make_memory(tmp_path)
+    store = make_store(memory, tmp_path, 'one')
+    monkeypatch.setattr(memory, 'store', lambda: store)
+    # Unspillable widget state alone fills the budget
+    store.entries['upload'] = memory.session_budget
+    
+    memory.put('report', b'r' * 40000)
+    age(store, 'report', 60)
+    memory.enforce(store)
+    assert isinstance(store.values['report'], Spilled)
+    
+    for _ in range(3):
+        assert memory.get('report') == b'r' * 40000
+        memory.enforce(store)
+    
+    assert not isinstance(store.values['report'], Spilled)
+    assert memory.stats()['spills'] == 1 and memory.stats()['loads'] == 1
+
+def test_total_budget_shrinks_idle_sessions_to_their_share(tmp_path):
+    memory = make_memory(tmp_path, session_budget=1024 * 1024, total_budget=120 * 1024)
+    idle = make_store(memory, tmp_path, 'idle', idle_seconds=600)
+    active = make_store(memory, tmp_path, 'active')
+    
+    for index in range(4):
+        key = f'value{index}'
+        idle.values[key] = b'i' * 20000
+        idle.entries[key] = 20000
+        idle.used[key] = time.time() - 600 + index
+    active.entries['upload'] = 50000
+    
+    memory.enforce(active)
+    
+    share = memory.total_budget // 2
+    assert idle.size <= share
+    # Only down to its share, not to nothing
+    assert idle.size == 60000
+    assert sum(isinstance(value, Spilled) for value in idle.values.values()) == 1
+
+def test_other_sessions_objects_are_shrunk_by_their_own_run(tmp_path, monkeypatch):
+    memory = make_memory(tmp_path, session_budget=1024 * 1024, total_budget=100 * 1024)
+    other = make_store(memory, tmp_path, 'other', idle_seconds=600)
+    active = make_store(memory, tmp_path, 'active')
+    chat = Chat(100)
+    other.entries['chat'] = estimate_size(chat)
+    other.evictable['chat'] = lambda: chat
+    active.entries['upload'] = 60000
+    
+    memory.enforce(active)
+    assert chat.evictions == 0
+    assert other.shrink_to == memory.total_budget // 2
+    
+    # The other session's next run applies the request
+    monkeypatch.setattr(memory, 'store', lambda: other)
+    monkeypatch.setattr(session_memory_module.st, 'session_state', State(chat=chat))
+    memory.track()
+    
+    assert chat.evictions > 0
+    assert other.shrink_to is None
+    assert memory.stats()['evictions'] == chat.evictions
+
+def test_own_objects_are_shrunk_to_the_session_budget(tmp_path):
+    memory = make_memory(tmp_path, session_budget=40 * 1024)
+    store = make_store(memory, tmp_path, 'one')
+    chat = Chat(100)
+    store.entries['chat'] = estimate_size(chat)
+    store.evictable['chat'] = lambda: chat
+    size = store.size
+    
+    memory.enforce(store)
+    
+    assert chat.evictions > 0
+    assert store.size < size
+    assert store.shrink_to is None
+
+def test_fragment_reruns_track_the_session(tmp_path, monkeypatch):
+    memory = make_memory(tmp_path)
+    tracked = []
+    monkeypatch.setattr(memory, 'track', lambda: tracked.append(1))
+    monkeypatch.setattr(session_memory_module.st, 'fragment', lambda function: function, raising=False)
+    
+    @memory.fragment
+    def chat():
+        return 'shown'
+    
+    # A full run tracks once in main(), not again in each fragment
+    monkeypatch.setattr(session_memory_module, 'get_script_run_ctx', lambda: SimpleNamespace(fragment_ids_this_run=[]))
+    assert chat() == 'shown'
+    assert tracked == []
+    
+    monkeypatch.setattr(session_memory_module, 'get_script_run_ctx', lambda: SimpleNamespace(fragment_ids_this_run=['chat']))
+    assert chat() == 'shown'
+    assert tracked == [1]
+
+@pytest.mark.parametrize('kind', ['spills', 'loads', 'evictions'])
+def test_prometheus_lines_report_counters(tmp_path, kind):
+    memory = make_memory(tmp_path)
+    memory.count(kind, 3)
+    assert f'farm_session_memory_total{{kind="{kind}"}} 3' in memory.prometheus_lines()
\ No newline at end of file
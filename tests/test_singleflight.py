@@ -0,0 +1,103 @@
+"""Tests for single-flight call coalescing."""
+
+import threading
+import pytest
+from utils.singleflight import SingleFlight, single_flight
+
+def run_together(count, target):
+    """Run target on count threads and return their results in order."""
+    results = [None] * count
+    
+    def run(index):
+        try:
+            results[index] = target()
+        except Exception as e:
+            results[index] = e
+    
+    threads = [threading.Thread(target=run, args=(index,)) for index in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+def blocking(release, calls, result='done'):
+    """A function that counts its calls and waits for release."""
+    def function():
+        calls.append(1)
+        release.wait(5)
+        if isinstance(result, Exception):
+            raise result
+        return result
+    return function
+
+def test_concurrent_callers_share_one_execution():
+    group = SingleFlight('test')
+    release, calls = threading.Event(), []
+    function = blocking(release, calls)
+    timer = threading.Timer(0.2, release.set)
+    timer.start()
+    
+    results = run_together(8, lambda: group.do('key', function))
+    timer.join()
+    
+    assert results == ['done'] * 8
+    assert len(calls) == 1
+    stats = group.stats()
+    assert stats['executions'] == 1 and stats['coalesced'] == 7 and stats['in_flight'] == 0
+
+def test_error_reaches_every_waiting_caller():
+    group = SingleFlight('test')
+    release, calls = threading.Event(), []
+    function = blocking(release, calls, ValueError("backend down"))
+    timer = threading.Timer(0.2, release.set)
+    timer.start()
+    
+    results = run_together(4, lambda: group.do('key', function))
+    timer.join()
+    
+    assert len(calls) == 1
+    assert all(isinstance(result, ValueError) for result in results)
+    assert group.stats()['in_flight'] == 0
+
+def test_key_runs_again_after_it_finished():
+    group = SingleFlight('test')
+    calls = []
+    
+    for _ in range(3):
+        group.do('key', lambda: calls.append(1))
+    
+    assert len(calls) == 3
+
+def test_full_key_table_runs_uncoalesced():
+    group = SingleFlight('test', max_keys=1)
+    release, calls = threading.Event(), []
+    function = blocking(release, calls)
+    timer = threading.Timer(0.2, release.set)
+    timer.start()
+    
+    results = run_together(2, lambda: group.do(threading.get_ident(), function))
+    timer.join()
+    
+    assert results == ['done', 'done']
+    assert len(calls) == 2
+    stats = group.stats()
+    assert stats['overflow'] == 1 and stats['in_flight'] == 0
+
+def test_unhashable_arguments_run_uncoalesced():
+    @single_flight('test.unhashable')
+    def join(parts, sep=' '):
+        return sep.join(parts)
+    
+    assert join(['a', 'b']) == 'a b'
+    assert join(('a', 'b'), sep='-') == 'a-b'
+    assert join.flight.stats()['unhashable'] == 1
+
+def test_key_function_selects_arguments():
+    @single_flight('test.key', key=lambda name, verbose=False: name)
+    def greet(name, verbose=False):
+        return f"hello {name}"
+    
+    assert greet('farmer', verbose=True) == 'hello farmer'
+    with pytest.raises(TypeError):
+        greet()
\ No newline at end of file
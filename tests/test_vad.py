@@ -0,0 +1,66 @@
+"""Tests for utterance splitting of browser recordings."""
+
+import io
+import wave
+import numpy as np
+from utils.vad import read_wav, to_pcm16, split_utterances
+
+RATE = 16000
+
+def tone(seconds, amplitude=0.5, frequency=220):
+    t = np.arange(int(RATE * seconds)) / RATE
+    return (amplitude * np.sin(2 * np.pi * frequency * t)).astype(np.float32)
+
+def silence(seconds):
+    return np.random.default_rng(0).normal(0, 0.001, int(RATE * seconds)).astype(np.float32)
+
+def wav_bytes(samples, channels=1):
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as wav_file:
+        wav_file.setnchannels(channels)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(RATE)
+        wav_file.writeframes(to_pcm16(np.repeat(samples, channels)))
+    return buffer.getvalue()
+
+def test_read_wav_round_trips_and_mixes_down_stereo():
+    samples = tone(0.1)
+    mono, rate = read_wav(wav_bytes(samples))
+    stereo, _ = read_wav(wav_bytes(samples, channels=2))
+    
+    assert rate == RATE
+    assert np.allclose(mono, samples, atol=1e-4)
+    assert np.allclose(stereo, samples, atol=1e-4)
+
+def test_pauses_split_utterances_in_order():
+    samples = np.concatenate([silence(0.5), tone(1.0), silence(0.8), tone(0.6), silence(0.5)])
+    utterances = split_utterances(samples, RATE)
+    
+    assert len(utterances) == 2
+    (first_start, first_end), (second_start, second_end) = utterances
+    assert first_start < int(0.5 * RATE) < first_end < second_start < int(2.3 * RATE) < second_end
+    assert all(0 <= start < end <= len(samples) for start, end in utterances)
+
+def test_short_pause_keeps_one_utterance():
+    samples = np.concatenate([silence(0.5), tone(0.8), silence(0.2), tone(0.8), silence(0.5)])
+    assert len(split_utterances(samples, RATE)) == 1
+
+def test_speech_without_pauses_is_one_utterance():
+    for samples in (tone(2.0), np.concatenate([silence(0.1), tone(2.0)])):
+        utterances = split_utterances(samples, RATE)
+        
+        assert len(utterances) == 1
+        start, end = utterances[0]
+        assert start <= int(0.1 * RATE) and end >= len(samples) - int(0.03 * RATE)
+
+def test_clicks_and_silence_are_not_speech():
+    samples = np.concatenate([silence(1.0), tone(0.06), silence(1.0)])
+    assert split_utterances(samples, RATE) == []
+    assert split_utterances(np.zeros(10, dtype=np.float32), RATE) == []
+
+def test_long_speech_is_cut_at_the_maximum_length():
+    samples = np.concatenate([silence(0.5), tone(5.0), silence(0.5)])
+    utterances = split_utterances(samples, RATE, max_utterance_s=2)
+    
+    assert len(utterances) >= 2
+    assert all(end - start <= int(2.5 * RATE) for start, end in utterances)
\ No newline at end of file
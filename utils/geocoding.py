@@ -0,0 +1,471 @@
+"""Geocoding with a local gazetteer, a persistent cache and a shared rate limit."""
+
+import os
+import csv
+import json
+import math
+import time
+import bisect
+import sqlite3
+import threading
+from urllib.parse import urlsplit
+import numpy as np
+from geopy.geocoders import Nominatim
+from utils.text import tokenize
+from utils.singleflight import single_flight
+from utils.metrics import span, cache_stats
+
+# Ranking of gazetteer places in suggestions: bigger places first
+KIND_RANK = {'city': 0, 'town': 1, 'village': 2}
+
+def normalize_name(name):
+    """Normalize a place name for lookup."""
+    return ' '.join(tokenize(name))
+
+def make_location(latitude, longitude, city=None, district=None, state=None, country='India', address=None):
+    """Build a location record with the fields every input method fills."""
+    if not address:
+        parts = []
+        for part in [city, district, state, country]:
+            if part and part not in parts:
+                parts.append(part)
+        address = ', '.join(parts)
+    
+    return {
+        'latitude': latitude,
+        'longitude': longitude,
+        'city': city,
+        'district': district,
+        'state': state,
+        'country': country,
+        'address': address
+    }
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Great-circle distance in km; works elementwise on numpy arrays."""
+    lat1, lon1, lat2, lon2 = map(np.radians, (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * 6371.0 * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+class GridIndex:
+    """Uniform latitude/longitude grid for nearest-point queries.
+    
+    Points are bucketed into square cells. A query scans rings of cells
+    around its own until no unscanned cell can hold anything closer, so it
+    touches a handful of points instead of all of them.
+    """
+    
+    def __init__(self, latitudes, longitudes, cell_degrees=None):
+        self.latitudes = np.asarray(latitudes, dtype=np.float64)
+        self.longitudes = np.asarray(longitudes, dtype=np.float64)
+        self.cells = {}
+        
+        # About one point per cell on average: coarse for a district list, fine for villages
+        if cell_degrees is None and len(self.latitudes):
+            area = np.ptp(self.latitudes) * np.ptp(self.longitudes)
+            cell_degrees = min(2.0, max(0.02, math.sqrt(area / len(self.latitudes))))
+        self.cell_degrees = cell_degrees or 0.5
+        
+        rows = np.floor(self.latitudes / self.cell_degrees).astype(np.int64)
+        cols = np.floor(self.longitudes / self.cell_degrees).astype(np.int64)
+        for point_id, cell in enumerate(zip(rows.tolist(), cols.tolist())):
+            self.cells.setdefault(cell, []).append(point_id)
+        self.cells = {cell: np.array(ids, dtype=np.int64) for cell, ids in self.cells.items()}
+        self.blocks = {}
+        
+        # Bounding box of the occupied cells, to know when a ring search can stop
+        if self.cells:
+            self.bounds = (int(rows.min()), int(rows.max()), int(cols.min()), int(cols.max()))
+        else:
+            self.bounds = None
+    
+    def cell_of(self, lat, lon):
+        """Grid cell of a coordinate."""
+        return math.floor(lat / self.cell_degrees), math.floor(lon / self.cell_degrees)
+    
+    def ring(self, row, col, radius):
+        """Ids of the points in the cells exactly radius cells away."""
+        if radius == 0:
+            cells = [(row, col)]
+        else:
+            cells = [(row + dr, col + dc)
+                     for dr in range(-radius, radius + 1)
+                     for dc in ((-radius, radius) if abs(dr) < radius else range(-radius, radius + 1))]
+        ids = [self.cells[cell] for cell in cells if cell in self.cells]
+        return np.concatenate(ids) if ids else None
+    
+    def block(self, row, col):
+        """Ids and coordinates of the points in the 3x3 cells around a cell, cached."""
+        block = self.blocks.get((row, col))
+        if block is None:
+            if len(self.blocks) >= 65536:
+                self.blocks.clear()
+            parts = [ids for ids in (self.ring(row, col, 0), self.ring(row, col, 1)) if ids is not None]
+            ids = np.concatenate(parts) if parts else np.empty(0, dtype=np.int64)
+            block = self.blocks[(row, col)] = (ids, self.latitudes[ids], self.longitudes[ids])
+        return block
+    
+    def clearance(self, lat, radius):
+        """Lower bound, in km, on the great-circle distance to any point beyond the given ring.
+        
+        Such a point is more than radius cells away in latitude, or in
+        longitude; the second is at least the distance to the meridian that
+        far from the query, which shrinks with the cosine of its latitude.
+        """
+        span_degrees = min(90.0, radius * self.cell_degrees)
+        return 6371.0 * math.asin(math.cos(math.radians(lat)) * math.sin(math.radians(span_degrees)))
+    
+    def nearest(self, lat, lon):
+        """Return (point_id, distance_km) of the closest point, or (None, inf)."""
+        if self.bounds is None:
+            return None, math.inf
+        
+        row, col = self.cell_of(lat, lon)
+        min_row, max_row, min_col, max_col = self.bounds
+        max_ring = max(abs(row - min_row), abs(row - max_row), abs(col - min_col), abs(col - max_col))
+        best_id, best = None, math.inf
+        
+        # The 3x3 block around the cell settles almost every query
+        for radius in range(1, max(1, max_ring) + 1):
+            if radius == 1:
+                ids, latitudes, longitudes = self.block(row, col)
+            else:
+                ids = self.ring(row, col, radius)
+                if ids is not None:
+                    latitudes, longitudes = self.latitudes[ids], self.longitudes[ids]
+            
+            if ids is not None and len(ids):
+                distances = haversine_km(lat, lon, latitudes, longitudes)
+                index = int(distances.argmin())
+                if distances[index] < best:
+                    best_id, best = int(ids[index]), float(distances[index])
+            
+            if best <= self.clearance(lat, radius):
+                break
+        
+        if best_id is None:
+            return None, math.inf
+        return best_id, best
+    
+    def nearest_many(self, latitudes, longitudes):
+        """Nearest point for arrays of coordinates; returns (ids, distances_km) arrays.
+        
+        Queries that share a cell are answered together against the 3x3
+        block around it; only queries whose answer could lie further out
+        fall back to the ring search.
+        """
+        latitudes = np.asarray(latitudes, dtype=np.float64)
+        longitudes = np.asarray(longitudes, dtype=np.float64)
+        ids = np.full(len(latitudes), -1, dtype=np.int64)
+        distances = np.full(len(latitudes), np.inf)
+        
+        rows = np.floor(latitudes / self.cell_degrees).astype(np.int64)
+        cols = np.floor(longitudes / self.cell_degrees).astype(np.int64)
+        cells, groups = np.unique(np.stack([rows, cols], axis=1), axis=0, return_inverse=True)
+        groups = groups.reshape(-1)
+        
+        for group, (row, col) in enumerate(cells.tolist()):
+            members = np.nonzero(groups == group)[0]
+            candidates, candidate_latitudes, candidate_longitudes = self.block(row, col)
+            
+            if len(candidates):
+                matrix = haversine_km(latitudes[members, None], longitudes[members, None],
+                                      candidate_latitudes, candidate_longitudes)
+                best = np.argmin(matrix, axis=1)
+                ids[members] = candidates[best]
+                distances[members] = matrix[np.arange(len(members)), best]
+            
+            for member in members:
+                if distances[member] > self.clearance(latitudes[member], 1):
+                    point_id, distance = self.nearest(latitudes[member], longitudes[member])
+                    ids[member] = -1 if point_id is None else point_id
+                    distances[member] = distance
+        
+        return ids, distances
+
+class TokenBucket:
+    """Thread-safe token bucket shared by every session in the process."""
+    
+    def __init__(self, rate, capacity=1):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def acquire(self, timeout=None):
+        """Take a token, waiting up to timeout seconds; returns False if none came in time."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return True
+                wait = (1 - self.tokens) / self.rate
+            
+            if deadline is not None and now + wait > deadline:
+                return False
+            time.sleep(wait)
+
+class GeocodeCache:
+    """Persistent cache of geocoding results, including places that were not found."""
+    
+    def __init__(self, path=None):
+        self.path = path or os.getenv('GEOCODE_CACHE_PATH', os.path.join('.cache', 'geocode.sqlite3'))
+        self.lock = threading.Lock()
+        self.stats = cache_stats('geocode')
+        
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        self.connection = sqlite3.connect(self.path, check_same_thread=False)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute(
+            'CREATE TABLE IF NOT EXISTS geocode ('
+            'kind TEXT, query TEXT, result TEXT, PRIMARY KEY (kind, query))'
+        )
+        self.connection.commit()
+    
+    def get(self, kind, query):
+        """Return (found, result) for a cached query."""
+        with self.lock:
+            row = self.connection.execute(
+                'SELECT result FROM geocode WHERE kind = ? AND query = ?', (kind, query)
+            ).fetchone()
+        
+        self.stats.record(hits=row is not None, misses=row is None)
+        if row is None:
+            return False, None
+        return True, json.loads(row[0])
+    
+    def put(self, kind, query, result):
+        """Store a result (None for not found)."""
+        with self.lock:
+            self.connection.execute(
+                'INSERT OR REPLACE INTO geocode VALUES (?, ?, ?)', (kind, query, json.dumps(result))
+            )
+            self.connection.commit()
+
+class PrefixTrie:
+    """Character trie over place names that keeps the best few matches at every node.
+    
+    A lookup walks one node per typed character and returns the stored
+    list, so suggestions cost the same however many places are loaded.
+    """
+    
+    def __init__(self, limit=10):
+        self.root = {}
+        self.limit = limit
+        self.size = 0
+    
+    def insert(self, key, place_id, rank):
+        """Add a place under key; lower rank sorts first."""
+        node = self.root
+        for char in key:
+            if char not in node:
+                node[char] = {}
+                self.size += 1
+            node = node[char]
+            
+            # The empty string never clashes with a character, so it holds the matches
+            best = node.setdefault('', [])
+            entry = (rank, place_id)
+            if entry not in best:
+                bisect.insort(best, entry)
+                del best[self.limit:]
+    
+    def find(self, prefix):
+        """Return the ids of the best places whose key starts with prefix."""
+        node = self.root
+        for char in prefix:
+            node = node.get(char)
+            if node is None:
+                return []
+        return [place_id for _, place_id in node.get('', [])]
+
+class Gazetteer:
+    """Local list of Indian villages, towns and districts.
+    
+    Reads a CSV with name, kind, district, state, latitude and longitude
+    columns from GAZETTEER_PATH; a fuller village-level export in the same
+    format can replace the bundled district and town list.
+    """
+    
+    def __init__(self, path=None):
+        self.path = path or os.getenv('GAZETTEER_PATH', os.path.join('data', 'gazetteer_india.csv'))
+        self.places = []
+        self.names = {}
+        self.trie = PrefixTrie()
+        self.load()
+        self.grid = GridIndex([place['latitude'] for place in self.places], [place['longitude'] for place in self.places])
+    
+    def load(self):
+        """Read the gazetteer and index every place name."""
+        try:
+            with open(self.path, encoding='utf-8', newline='') as gazetteer_file:
+                rows = list(csv.DictReader(gazetteer_file))
+        except OSError:
+            rows = []
+        
+        for row in rows:
+            try:
+                place = make_location(
+                    float(row['latitude']),
+                    float(row['longitude']),
+                    city=row['name'],
+                    district=row.get('district') or None,
+                    state=row.get('state') or None
+                )
+            except (KeyError, ValueError):
+                continue
+            
+            place_id = len(self.places)
+            self.places.append(place)
+            
+            name = normalize_name(row['name'])
+            self.names.setdefault(name, []).append(place_id)
+            
+            # Index every word start so "ganganagar" finds "Sri Ganganagar"
+            rank = (KIND_RANK.get(row.get('kind'), len(KIND_RANK)), len(name))
+            words = name.split(' ')
+            for index in range(len(words)):
+                self.trie.insert(' '.join(words[index:]), place_id, rank)
+    
+    def suggest(self, prefix, limit=8):
+        """Places whose name has a word starting with prefix, biggest first."""
+        prefix = normalize_name(prefix)
+        if not prefix:
+            return []
+        return [self.places[place_id] for place_id in self.trie.find(prefix)[:limit]]
+    
+    def nearest(self, lat, lon):
+        """Return (place, distance_km) for the closest gazetteer place."""
+        place_id, distance = self.grid.nearest(lat, lon)
+        return (self.places[place_id] if place_id is not None else None), distance
+    
+    def nearest_many(self, latitudes, longitudes):
+        """Closest places for arrays of coordinates; returns (places, distances_km)."""
+        place_ids, distances = self.grid.nearest_many(latitudes, longitudes)
+        return [self.places[place_id] if place_id >= 0 else None for place_id in place_ids.tolist()], distances
+    
+    def lookup(self, query):
+        """Find a place by exact name, optionally followed by ", district" or ", state"."""
+        name, _, qualifier = query.partition(',')
+        place_ids = self.names.get(normalize_name(name), [])
+        qualifier = normalize_name(qualifier)
+        
+        for place_id in place_ids:
+            place = self.places[place_id]
+            if not qualifier or qualifier in (normalize_name(place['district'] or ''), normalize_name(place['state'] or '')):
+                return place
+        return None
+
+class Geocoder:
+    """Forward and reverse geocoding that only calls Nominatim when it has to.
+    
+    Known places come from the gazetteer. Everything else goes through a
+    persistent cache and then to Nominatim, behind one token bucket for the
+    whole process so the 1 request/second usage policy holds under load.
+    """
+    
+    def __init__(self):
+        self.gazetteer = Gazetteer()
+        self.cache = GeocodeCache()
+        self.limiter = TokenBucket(float(os.getenv('NOMINATIM_RATE', '1')))
+        self.wait = float(os.getenv('NOMINATIM_WAIT', '5'))
+        self.max_offline_km = float(os.getenv('REVERSE_GEOCODE_MAX_KM', '15'))
+        # NOMINATIM_URL points at a self-hosted instance (or a local stub)
+        endpoint = urlsplit(os.getenv('NOMINATIM_URL', 'https://nominatim.openstreetmap.org'))
+        self.nominatim = Nominatim(
+            user_agent=os.getenv('NOMINATIM_USER_AGENT', 'farming_assistant'),
+            timeout=10,
+            domain=endpoint.netloc + endpoint.path.rstrip('/'),
+            scheme=endpoint.scheme
+        )
+    
+    def suggest(self, prefix, limit=8):
+        """Type-ahead suggestions from the gazetteer, without any network call."""
+        return self.gazetteer.suggest(prefix, limit)
+    
+    @single_flight('geocode.search')
+    def geocode(self, query):
+        """Find a place by name; returns a location record or None."""
+        place = self.gazetteer.lookup(query)
+        if place:
+            return place
+        
+        return self.cached('search', normalize_name(query),
+                           lambda: self.nominatim.geocode(query, addressdetails=True))
+    
+    def reverse(self, lat, lon):
+        """Describe coordinates; returns a location record or None.
+        
+        The nearest gazetteer place answers offline when it is within
+        REVERSE_GEOCODE_MAX_KM; further out (or outside India) Nominatim is
+        asked instead. The gazetteer only has towns, and district and state
+        borders run between them, so the cutoff is kept short.
+        """
+        place, distance = self.gazetteer.nearest(lat, lon)
+        if place and distance <= self.max_offline_km:
+            return make_location(lat, lon, city=place['city'], district=place['district'], state=place['state'])
+        
+        location = self.reverse_online(lat, lon)
+        if location:
+            # Keep the coordinates that were asked about, not the matched feature's
+            location = dict(location, latitude=lat, longitude=lon)
+        return location
+    
+    def reverse_many(self, latitudes, longitudes):
+        """Offline reverse geocoding for arrays of coordinates; None where nothing is near."""
+        places, distances = self.gazetteer.nearest_many(latitudes, longitudes)
+        return [
+            make_location(float(lat), float(lon), city=place['city'], district=place['district'], state=place['state'])
+            if place and distance <= self.max_offline_km else None
+            for lat, lon, place, distance in zip(latitudes, longitudes, places, distances)
+        ]
+    
+    @single_flight('geocode.reverse')
+    def reverse_online(self, lat, lon):
+        """Reverse geocode with Nominatim, through the cache and the rate limit."""
+        # About 10 m of rounding lets nearby lookups share a cache entry
+        return self.cached('reverse', f"{lat:.4f},{lon:.4f}",
+                           lambda: self.nominatim.reverse((lat, lon), addressdetails=True))
+    
+    def cached(self, kind, key, request):
+        """Answer from the cache, or make a rate-limited Nominatim request and cache it."""
+        found, result = self.cache.get(kind, key)
+        if found:
+            return result
+        
+        if not self.limiter.acquire(self.wait):
+            raise TimeoutError("Geocoding service is busy, please try again in a moment")
+        
+        with span(f'nominatim.{kind}'):
+            location = request()
+        result = self.from_nominatim(location) if location else None
+        self.cache.put(kind, key, result)
+        return result
+    
+    def from_nominatim(self, location):
+        """Convert a geopy result to a location record."""
+        details = location.raw.get('address', {})
+        city = (details.get('city') or details.get('town') or details.get('village')
+                or details.get('county') or location.address.split(',')[0])
+        
+        return make_location(
+            location.latitude,
+            location.longitude,
+            city=city,
+            district=details.get('state_district') or details.get('county'),
+            state=details.get('state'),
+            country=details.get('country'),
+            address=location.address
+        )
+
+# Global geocoder instance
+geocoder = Geocoder()
\ No newline at end of file
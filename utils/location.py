@@ -1,41 +1,46 @@
 """Location utilities for the farming assistant."""
 
+import os
 import requests
 import streamlit as st
-from geopy.geocoders import Nominatim
 import json
+from utils.geocoding import geocoder, make_location
+from utils.metrics import span
 
 def get_user_location():
     """Get user location using IP geolocation as fallback."""
     try:
         # Try to get location from IP
-        response = requests.get('http://ip-api.com/json/', timeout=5)
+        with span('ip_api.lookup') as request_span:
+            response = requests.get(os.getenv('IP_GEOLOCATION_URL', 'http://ip-api.com/json/'), timeout=5)
+            if response.status_code != 200:
+                request_span.fail()
         if response.status_code == 200:
             data = response.json()
             if data['status'] == 'success':
-                return {
-                    'latitude': data['lat'],
-                    'longitude': data['lon'],
-                    'city': data['city'],
-                    'region': data['regionName'],
-                    'country': data['country']
-                }
+                # Same fields as the other input methods, from the offline index; IP data is the fallback
+                return geocoder.reverse_many([data['lat']], [data['lon']])[0] or make_location(
+                    data['lat'],
+                    data['lon'],
+                    city=data['city'],
+                    state=data['regionName'],
+                    country=data['country']
+                )
     except Exception as e:
         st.error(f"Error getting location: {e}")
     
     return None
 
 def reverse_geocode(lat, lon):
-    """Get address from coordinates."""
+    """Get a location record for coordinates."""
     try:
-        geolocator = Nominatim(user_agent="farming_assistant")
-        location = geolocator.reverse(f"{lat}, {lon}")
+        location = geocoder.reverse(lat, lon)
         if location:
-            return location.address
+            return location
     except Exception as e:
         st.error(f"Error in reverse geocoding: {e}")
     
-    return f"Lat: {lat}, Lon: {lon}"
+    return make_location(lat, lon, country=None, address=f"Lat: {lat}, Lon: {lon}")
 
 def get_location_input():
     """Get location input from user with multiple options."""
@@ -53,7 +58,7 @@ def get_location_input():
             with st.spinner("Detecting location..."):
                 location_data = get_user_location()
                 if location_data:
-                    st.success(f"Location detected: {location_data['city']}, {location_data['region']}")
+                    st.success(f"Location detected: {location_data['address']}")
                     st.session_state.location = location_data
                 else:
                     st.error("Could not detect location automatically. Please try manual input.")
@@ -67,29 +72,29 @@ def get_location_input():
         
         if st.button("📍 Use These Coordinates"):
             if lat != 0.0 and lon != 0.0:
-                address = reverse_geocode(lat, lon)
-                location_data = {
-                    'latitude': lat,
-                    'longitude': lon,
-                    'address': address
-                }
+                location_data = reverse_geocode(lat, lon)
                 st.session_state.location = location_data
-                st.success(f"Location set: {address}")
+                st.success(f"Location set: {location_data['address']}")
     
     elif location_method == "City name":
         city_name = st.text_input("Enter your city name:")
+        
+        # Offer known places from the local gazetteer as the name is typed
+        suggestions = geocoder.suggest(city_name) if city_name else []
+        if suggestions:
+            suggestion = st.selectbox(
+                "Matching places:",
+                options=suggestions,
+                format_func=lambda place: place['address']
+            )
+        
         if st.button("🔍 Find City") and city_name:
             try:
-                geolocator = Nominatim(user_agent="farming_assistant")
-                location = geolocator.geocode(city_name)
+                location = suggestion if suggestions else geocoder.geocode(city_name)
                 if location:
-                    location_data = {
-                        'latitude': location.latitude,
-                        'longitude': location.longitude,
-                        'address': location.address
-                    }
+                    location_data = location
                     st.session_state.location = location_data
-                    st.success(f"Location found: {location.address}")
+                    st.success(f"Location found: {location['address']}")
                 else:
                     st.error("City not found. Please check the spelling.")
             except Exception as e:
@@ -0,0 +1,199 @@
+"""Lightweight latency spans, cache counters and Prometheus export."""
+
+import os
+import time
+import random
+import bisect
+import threading
+from utils.singleflight import FLIGHT_GROUPS
+
+# Histogram bucket upper bounds in seconds, from a cache hit to a slow model
+BUCKETS = [0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60]
+
+# Fraction of spans whose latency is recorded; calls and errors are always counted
+SAMPLE_RATE = float(os.getenv('METRICS_SAMPLE_RATE', '1'))
+
+class SpanStats:
+    """Latency histogram and call and error counts for one span name."""
+    
+    def __init__(self, name):
+        self.name = name
+        self.lock = threading.Lock()
+        self.buckets = [0] * (len(BUCKETS) + 1)
+        self.total = 0.0
+        self.sampled = 0
+        self.calls = 0
+        self.errors = 0
+    
+    def record(self, seconds, error=False):
+        """Count a call, with its latency if it was sampled."""
+        with self.lock:
+            self.calls += 1
+            if error:
+                self.errors += 1
+            if seconds is not None:
+                self.buckets[bisect.bisect_left(BUCKETS, seconds)] += 1
+                self.total += seconds
+                self.sampled += 1
+    
+    def percentile(self, q):
+        """Estimate a latency percentile (0-100) by interpolating within its bucket."""
+        with self.lock:
+            buckets, sampled = list(self.buckets), self.sampled
+        if not sampled:
+            return None
+        
+        rank = q / 100 * sampled
+        seen = 0
+        for index, count in enumerate(buckets):
+            if count and seen + count >= rank:
+                lower = BUCKETS[index - 1] if index > 0 else 0
+                upper = BUCKETS[index] if index < len(BUCKETS) else BUCKETS[-1]
+                return lower + (upper - lower) * (rank - seen) / count
+            seen += count
+        return BUCKETS[-1]
+    
+    def snapshot(self):
+        """Get the counts and the main percentiles."""
+        with self.lock:
+            calls, errors, sampled, total = self.calls, self.errors, self.sampled, self.total
+        return {
+            'span': self.name,
+            'calls': calls,
+            'errors': errors,
+            'error_rate': errors / calls if calls else 0.0,
+            'mean': total / sampled if sampled else None,
+            'p50': self.percentile(50),
+            'p95': self.percentile(95),
+            'p99': self.percentile(99)
+        }
+
+class CacheStats:
+    """Hit and miss counts for one cache."""
+    
+    def __init__(self, name):
+        self.name = name
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    def record(self, hits=0, misses=0):
+        """Count cache hits and misses."""
+        with self.lock:
+            self.hits += hits
+            self.misses += misses
+    
+    def snapshot(self):
+        """Get the counts and the hit ratio."""
+        with self.lock:
+            hits, misses = self.hits, self.misses
+        return {
+            'cache': self.name,
+            'hits': hits,
+            'misses': misses,
+            'hit_ratio': hits / (hits + misses) if hits + misses else None
+        }
+
+# Every span and cache, by name
+SPANS = {}
+CACHES = {}
+_registry_lock = threading.Lock()
+
+# Functions returning extra exposition lines, registered by modules that
+# only exist in some processes (e.g. session memory in the Streamlit app)
+COLLECTORS = []
+
+def span_stats(name):
+    """Get the stats for a span name, creating them on first use."""
+    stats = SPANS.get(name)
+    if stats is None:
+        with _registry_lock:
+            stats = SPANS.setdefault(name, SpanStats(name))
+    return stats
+
+def cache_stats(name):
+    """Get the stats for a cache name, creating them on first use."""
+    stats = CACHES.get(name)
+    if stats is None:
+        with _registry_lock:
+            stats = CACHES.setdefault(name, CacheStats(name))
+    return stats
+
+class Span:
+    """Context manager that times a block and records it under a span name.
+    
+    An exception leaving the block counts as an error and is re-raised;
+    fail() marks an error that was handled inside the block.
+    """
+    
+    def __init__(self, name):
+        self.stats = span_stats(name)
+        self.start = None
+        self.failed = False
+    
+    def __enter__(self):
+        if SAMPLE_RATE >= 1 or random.random() < SAMPLE_RATE:
+            self.start = time.perf_counter()
+        return self
+    
+    def __exit__(self, exc_type, exc, traceback):
+        seconds = time.perf_counter() - self.start if self.start is not None else None
+        self.stats.record(seconds, error=self.failed or exc_type is not None)
+        return False
+    
+    def fail(self):
+        """Count this call as an error."""
+        self.failed = True
+
+def span(name):
+    """Time a block: `with span('openweather.current'): ...`."""
+    return Span(name)
+
+def register_collector(collect):
+    """Add a function returning Prometheus exposition lines to render_prometheus()."""
+    with _registry_lock:
+        COLLECTORS.append(collect)
+
+def _label(value):
+    """Escape a Prometheus label value."""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def render_prometheus():
+    """Render every metric in the Prometheus text exposition format."""
+    lines = [
+        '# HELP farm_span_seconds Latency of external calls and model invocations.',
+        '# TYPE farm_span_seconds histogram'
+    ]
+    spans = sorted(SPANS.values(), key=lambda stats: stats.name)
+    for stats in spans:
+        with stats.lock:
+            buckets, total, sampled = list(stats.buckets), stats.total, stats.sampled
+        name = _label(stats.name)
+        cumulative = 0
+        for bound, count in zip(BUCKETS + ['+Inf'], buckets):
+            cumulative += count
+            lines.append(f'farm_span_seconds_bucket{{span="{name}",le="{bound}"}} {cumulative}')
+        lines.append(f'farm_span_seconds_sum{{span="{name}"}} {total:.6f}')
+        lines.append(f'farm_span_seconds_count{{span="{name}"}} {sampled}')
+    
+    lines += ['# HELP farm_span_calls_total Calls per span, sampled or not.', '# TYPE farm_span_calls_total counter']
+    lines += [f'farm_span_calls_total{{span="{_label(stats.name)}"}} {stats.calls}' for stats in spans]
+    lines += ['# HELP farm_span_errors_total Calls per span that failed.', '# TYPE farm_span_errors_total counter']
+    lines += [f'farm_span_errors_total{{span="{_label(stats.name)}"}} {stats.errors}' for stats in spans]
+    
+    lines += ['# HELP farm_cache_requests_total Cache lookups by result.', '# TYPE farm_cache_requests_total counter']
+    for stats in sorted(CACHES.values(), key=lambda stats: stats.name):
+        snapshot = stats.snapshot()
+        lines.append(f'farm_cache_requests_total{{cache="{_label(stats.name)}",result="hit"}} {snapshot["hits"]}')
+        lines.append(f'farm_cache_requests_total{{cache="{_label(stats.name)}",result="miss"}} {snapshot["misses"]}')
+    
+    lines += ['# HELP farm_singleflight_total Single-flight calls by outcome.', '# TYPE farm_singleflight_total counter']
+    for name, group in sorted(FLIGHT_GROUPS.items()):
+        for kind, count in group.stats().items():
+            if kind != 'in_flight':
+                lines.append(f'farm_singleflight_total{{group="{_label(name)}",kind="{kind}"}} {count}')
+    
+    for collect in list(COLLECTORS):
+        lines += collect()
+    
+    return '\n'.join(lines) + '\n'
\ No newline at end of file
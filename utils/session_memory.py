@@ -0,0 +1,329 @@
+"""Per-session memory accounting and budgets for large session state entries."""
+
+import os
+import sys
+import time
+import pickle
+import shutil
+import hashlib
+import uuid
+import weakref
+import functools
+import threading
+from collections import deque
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+from utils.metrics import register_collector
+
+# Session state key of each session's store
+STORE_KEY = '_session_memory'
+
+# Values used this recently stay in memory, so a value read on every
+# rerun is not written out and loaded back each time
+HOT_SECONDS = 30
+
+def estimate_size(value, seen=None):
+    """Approximate bytes held by a value, counting shared objects once."""
+    seen = set() if seen is None else seen
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+    
+    if isinstance(value, (bytes, bytearray, str)):
+        return sys.getsizeof(value)
+    if isinstance(value, memoryview):
+        return value.nbytes
+    if hasattr(value, 'getbuffer'):
+        # In-memory files such as uploads
+        return value.getbuffer().nbytes
+    if hasattr(value, 'getbands'):
+        # PIL images hold their decoded pixels
+        return value.width * value.height * len(value.getbands())
+    if hasattr(value, 'nbytes'):
+        return int(value.nbytes)
+    if hasattr(value, 'size_bytes'):
+        return value.size_bytes()
+    if hasattr(value, 'to_plotly_json'):
+        return estimate_size(value.to_plotly_json(), seen)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_size(key, seen) + estimate_size(item, seen) for key, item in value.items())
+    if isinstance(value, (list, tuple, set, frozenset, deque)):
+        return sys.getsizeof(value) + sum(estimate_size(item, seen) for item in value)
+    return sys.getsizeof(value)
+
+class Spilled:
+    """Stands in for a value that was written to disk."""
+    
+    def __init__(self, path, size):
+        self.path = path
+        self.size = size
+    
+    def load(self):
+        with open(self.path, 'rb') as spill_file:
+            return pickle.load(spill_file)
+
+class SessionStore:
+    """Large values of one session and the measured size of its entries.
+    
+    Lives in the session's state, so it goes away with the session.
+    """
+    
+    def __init__(self, session_id, spill_dir):
+        self.session_id = session_id
+        self.spill_dir = spill_dir
+        self.lock = threading.RLock()
+        self.values = {}
+        self.used = {}
+        self.entries = {}
+        self.evictable = {}
+        self.last_seen = time.time()
+        # Budget other sessions asked this one to shrink its objects to
+        self.shrink_to = None
+        weakref.finalize(self, shutil.rmtree, spill_dir, True)
+    
+    @property
+    def size(self):
+        return sum(self.entries.values())
+    
+    @property
+    def spilled_size(self):
+        return sum(value.size for value in self.values.values() if isinstance(value, Spilled))
+    
+    def spill(self, key):
+        """Write a value to disk and keep a Spilled marker instead; returns the bytes freed."""
+        value = self.values[key]
+        path = os.path.join(self.spill_dir, hashlib.sha1(key.encode('utf-8')).hexdigest()[:16] + '.pkl')
+        try:
+            os.makedirs(self.spill_dir, exist_ok=True)
+            with open(path, 'wb') as spill_file:
+                pickle.dump(value, spill_file, protocol=pickle.HIGHEST_PROTOCOL)
+        except (OSError, pickle.PickleError, TypeError, AttributeError):
+            return 0
+        
+        size = self.entries.pop(key, 0)
+        self.values[key] = Spilled(path, size)
+        return size
+
+class SessionMemory:
+    """Keep the memory of large session state entries within budget.
+    
+    Every script run measures the session's state entries of at least
+    SESSION_MEMORY_MIN_KB. Values stored with put() are spilled to disk,
+    least recently used first, when the session goes over
+    SESSION_MEMORY_MB or all sessions together go over
+    SESSION_MEMORY_TOTAL_MB, idle sessions first down to their share;
+    get() loads them back. Objects with an evict() method, like the chat
+    memory, are asked to shrink instead, by their own session's next run.
+    Other entries, such as widget values, are counted but left alone.
+    """
+    
+    def __init__(self, session_budget=None, total_budget=None, min_bytes=None, spill_dir=None):
+        self.session_budget = session_budget or int(float(os.getenv('SESSION_MEMORY_MB', '32')) * 2 ** 20)
+        self.total_budget = total_budget or int(float(os.getenv('SESSION_MEMORY_TOTAL_MB', '1024')) * 2 ** 20)
+        self.min_bytes = min_bytes or int(float(os.getenv('SESSION_MEMORY_MIN_KB', '16')) * 1024)
+        self.spill_dir = spill_dir or os.getenv('SESSION_SPILL_DIR', os.path.join('.cache', 'sessions'))
+        self.lock = threading.Lock()
+        self.sessions = weakref.WeakSet()
+        self.counters = {'spills': 0, 'spilled_bytes': 0, 'loads': 0, 'evictions': 0}
+    
+    def store(self):
+        """Store of the session running on this thread, or None outside a script run."""
+        ctx = get_script_run_ctx()
+        if ctx is None:
+            return None
+        
+        store = st.session_state.get(STORE_KEY)
+        if store is None:
+            store = SessionStore(ctx.session_id, os.path.join(self.spill_dir, uuid.uuid4().hex))
+            st.session_state[STORE_KEY] = store
+        with self.lock:
+            self.sessions.add(store)
+        store.last_seen = time.time()
+        return store
+    
+    def track(self):
+        """Measure the current session's entries and enforce the budgets; call once per script run."""
+        store = self.store()
+        if store is None:
+            return
+        
+        entries, evictable = {}, {}
+        for key, value in st.session_state.to_dict().items():
+            if key == STORE_KEY:
+                continue
+            size = estimate_size(value)
+            if size >= self.min_bytes:
+                entries[key] = size
+            if hasattr(value, 'evict'):
+                evictable[key] = weakref.ref(value)
+        
+        with store.lock:
+            for key, value in store.values.items():
+                if not isinstance(value, Spilled):
+                    entries[key] = store.entries.get(key) or estimate_size(value)
+            store.entries = entries
+            store.evictable = evictable
+            shrink_to, store.shrink_to = store.shrink_to, None
+        
+        if shrink_to is not None:
+            self.shrink(store, shrink_to, own=True)
+        self.enforce(store)
+    
+    def fragment(self, function):
+        """st.fragment that also calls track() when the fragment reruns on its own.
+        
+        A full script run tracks once in main(); a fragment rerun changes
+        state without running main().
+        """
+        @functools.wraps(function)
+        def run(*args, **kwargs):
+            try:
+                return function(*args, **kwargs)
+            finally:
+                ctx = get_script_run_ctx()
+                if ctx is not None and getattr(ctx, 'fragment_ids_this_run', None):
+                    self.track()
+        return st.fragment(run)
+    
+    def put(self, key, value):
+        """Keep a large value for this session; it may be spilled to disk when cold."""
+        store = self.store()
+        if store is None:
+            st.session_state[key] = value
+            return
+        
+        with store.lock:
+            store.values[key] = value
+            store.used[key] = time.time()
+            store.entries[key] = estimate_size(value)
+        self.enforce(store)
+    
+    def get(self, key, default=None):
+        """Read a value kept with put(), loading it back if it was spilled."""
+        store = self.store()
+        if store is None:
+            return st.session_state.get(key, default)
+        
+        with store.lock:
+            value = store.values.get(key, default)
+            if key in store.values:
+                store.used[key] = time.time()
+        
+        if isinstance(value, Spilled):
+            try:
+                value = value.load()
+            except (OSError, EOFError, pickle.PickleError):
+                self.pop(key)
+                return default
+            self.count('loads')
+            self.put(key, value)
+        return value
+    
+    def pop(self, key):
+        """Drop a value kept with put()."""
+        store = self.store()
+        if store is None:
+            st.session_state.pop(key, None)
+            return
+        
+        with store.lock:
+            store.values.pop(key, None)
+            store.used.pop(key, None)
+            store.entries.pop(key, None)
+    
+    def enforce(self, store):
+        """Spill or shrink entries until the session and all sessions are within budget."""
+        if store.size > self.session_budget:
+            self.shrink(store, self.session_budget, own=True)
+        
+        with self.lock:
+            stores = list(self.sessions)
+        total = sum(other.size for other in stores)
+        if total <= self.total_budget:
+            return
+        
+        # Idle sessions give up memory first, this one last, each down to its share
+        share = self.total_budget // len(stores)
+        for other in sorted(stores, key=lambda other: (other is store, other.last_seen)):
+            if other.size <= share:
+                continue
+            total -= other.size
+            self.shrink(other, share, own=other is store)
+            total += other.size
+            if total <= self.total_budget:
+                break
+    
+    def shrink(self, store, budget, own=False):
+        """Spill a session's cold values, least recently used first, then shrink evictable objects, until it fits budget.
+        
+        Objects of another session are only shrunk by that session's own
+        next run, which may be using them right now.
+        """
+        with store.lock:
+            cold = time.time() - HOT_SECONDS
+            for key in sorted(store.used, key=store.used.get):
+                if store.size <= budget or store.used[key] > cold:
+                    break
+                if key in store.entries:
+                    freed = store.spill(key)
+                    if freed:
+                        self.count('spills')
+                        self.count('spilled_bytes', freed)
+            
+            if store.size <= budget:
+                return
+            if not own:
+                store.shrink_to = budget if store.shrink_to is None else min(store.shrink_to, budget)
+                return
+            for key, reference in list(store.evictable.items()):
+                if store.size <= budget:
+                    return
+                value = reference()
+                if value is not None and store.entries.get(key):
+                    value.evict()
+                    self.count('evictions')
+                    store.entries[key] = estimate_size(value)
+    
+    def count(self, kind, amount=1):
+        """Add to one of the spill, load and eviction counters."""
+        with self.lock:
+            self.counters[kind] += amount
+    
+    def stats(self):
+        """Copy of the counters."""
+        with self.lock:
+            return dict(self.counters)
+    
+    def snapshot(self):
+        """Memory per open session, largest first."""
+        now = time.time()
+        with self.lock:
+            stores = list(self.sessions)
+        
+        rows = [{
+            'session': store.session_id[:8],
+            'bytes': store.size,
+            'spilled_bytes': store.spilled_size,
+            'idle_seconds': now - store.last_seen,
+            'entries': dict(store.entries)
+        } for store in stores]
+        return sorted(rows, key=lambda row: row['bytes'], reverse=True)
+    
+    def prometheus_lines(self):
+        """Session gauges and counters in the Prometheus text format."""
+        sessions = self.snapshot()
+        counters = self.stats()
+        lines = ['# HELP farm_sessions Sessions with tracked state.', '# TYPE farm_sessions gauge', f'farm_sessions {len(sessions)}']
+        lines += ['# HELP farm_session_memory_bytes Large session state entries, in memory and spilled to disk.', '# TYPE farm_session_memory_bytes gauge']
+        lines.append(f'farm_session_memory_bytes{{where="memory"}} {sum(row["bytes"] for row in sessions)}')
+        lines.append(f'farm_session_memory_bytes{{where="disk"}} {sum(row["spilled_bytes"] for row in sessions)}')
+        lines += ['# HELP farm_session_memory_total Session memory spills, loads and evictions.', '# TYPE farm_session_memory_total counter']
+        for kind in ('spills', 'loads', 'evictions'):
+            lines.append(f'farm_session_memory_total{{kind="{kind}"}} {counters[kind]}')
+        lines += ['# HELP farm_session_memory_spilled_bytes_total Bytes of session state written to disk.', '# TYPE farm_session_memory_spilled_bytes_total counter']
+        lines.append(f'farm_session_memory_spilled_bytes_total {counters["spilled_bytes"]}')
+        return lines
+
+# Global session memory instance
+session_memory = SessionMemory()
+register_collector(session_memory.prometheus_lines)
\ No newline at end of file
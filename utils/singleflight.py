@@ -0,0 +1,104 @@
+"""Single-flight coalescing of identical concurrent calls."""
+
+import functools
+import threading
+
+class _Call:
+    """An in-flight execution shared by every caller with the same key."""
+    
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+class SingleFlight:
+    """Run at most one execution per key at a time.
+    
+    Callers that arrive while an execution for their key is in flight wait
+    for it and receive the same result or exception. The key table is
+    bounded; when it is full, extra keys simply run uncoalesced, as do
+    keys that cannot be hashed.
+    """
+    
+    def __init__(self, name, max_keys=1024):
+        self.name = name
+        self.max_keys = max_keys
+        self.lock = threading.Lock()
+        self.calls = {}
+        self.counters = {'calls': 0, 'executions': 0, 'coalesced': 0, 'overflow': 0, 'unhashable': 0}
+    
+    def do(self, key, function, *args, **kwargs):
+        """Call function(*args, **kwargs), sharing the execution with concurrent callers of key."""
+        try:
+            hash(key)
+        except TypeError:
+            with self.lock:
+                self.counters['calls'] += 1
+                self.counters['executions'] += 1
+                self.counters['unhashable'] += 1
+            return function(*args, **kwargs)
+        
+        with self.lock:
+            self.counters['calls'] += 1
+            call = self.calls.get(key)
+            
+            if call is not None:
+                self.counters['coalesced'] += 1
+                leader = False
+            elif len(self.calls) >= self.max_keys:
+                self.counters['overflow'] += 1
+                self.counters['executions'] += 1
+                call = None
+            else:
+                call = self.calls[key] = _Call()
+                self.counters['executions'] += 1
+                leader = True
+        
+        if call is None:
+            return function(*args, **kwargs)
+        
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        
+        try:
+            call.result = function(*args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self.lock:
+                del self.calls[key]
+            call.done.set()
+    
+    def stats(self):
+        """Get a snapshot of the counters and the number of keys in flight."""
+        with self.lock:
+            return dict(self.counters, in_flight=len(self.calls))
+
+# Every single-flight group, by name
+FLIGHT_GROUPS = {}
+
+def single_flight(name=None, key=None, max_keys=1024):
+    """Decorator that coalesces concurrent calls with identical arguments.
+    
+    `key` maps the call arguments to a hashable key; by default all
+    positional and keyword arguments are used. Calls whose key cannot be
+    hashed, e.g. with a list argument, run uncoalesced.
+    """
+    def decorator(function):
+        group = SingleFlight(name or function.__qualname__, max_keys)
+        FLIGHT_GROUPS[group.name] = group
+        
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            call_key = key(*args, **kwargs) if key else (args, tuple(sorted(kwargs.items())))
+            return group.do(call_key, function, *args, **kwargs)
+        
+        wrapper.flight = group
+        return wrapper
+    
+    return decorator
\ No newline at end of file
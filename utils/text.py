@@ -0,0 +1,51 @@
+"""Text helpers shared by the language-aware services."""
+
+import re
+
+# Word characters: \w misses Indic vowel signs and viramas, so the Indic
+# blocks (Devanagari to Sinhala) and zero-width joiners are added explicitly
+WORD_PATTERN = re.compile(r'[\w\u0900-\u0DFF\u200c\u200d]+')
+
+def tokenize(text):
+    """Split text into lowercase word tokens."""
+    return WORD_PATTERN.findall(text.casefold())
+
+# Segment boundaries: line breaks (with their indentation) and sentence ends
+SEGMENT_SEPARATOR = re.compile(r'(\s*\n\s*|(?<=[.!?।॥])\s+)')
+
+def split_segments(text):
+    """Split text into alternating [segment, separator, segment, ...] pieces.
+    
+    Joining the pieces gives back the original text, so segments can be
+    processed one by one and reassembled with the layout intact.
+    """
+    return SEGMENT_SEPARATOR.split(text)
+
+# Letters of each supported language's script; Latin letters stand for English
+SCRIPT_PATTERNS = {
+    'en': re.compile(r'[A-Za-z]'),
+    'hi': re.compile(r'[\u0900-\u097F]'),
+    'bn': re.compile(r'[\u0980-\u09FF]'),
+    'ta': re.compile(r'[\u0B80-\u0BFF]'),
+    'te': re.compile(r'[\u0C00-\u0C7F]'),
+    'kn': re.compile(r'[\u0C80-\u0CFF]'),
+    'ml': re.compile(r'[\u0D00-\u0D7F]')
+}
+
+def detect_script_language(text):
+    """Guess the language of text from the script most of its letters use.
+    
+    Every supported Indian language has its own script, so counting letters
+    is enough to tell them apart without a network call. Returns None when
+    the text has no letters of a known script.
+    """
+    counts = {language: len(pattern.findall(text)) for language, pattern in SCRIPT_PATTERNS.items()}
+    language = max(counts, key=counts.get)
+    return language if counts[language] else None
+
+# Speaker marks for chat messages rendered as Markdown
+CHAT_ICONS = {'user': '🧑‍🌾', 'assistant': '🤖'}
+
+def format_chat_message(message):
+    """Render a chat history message as a Markdown block for the transcript."""
+    return f"{CHAT_ICONS.get(message['role'], '💬')} {message['content']}\n\n"
\ No newline at end of file
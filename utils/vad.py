@@ -0,0 +1,78 @@
+"""Voice activity detection for speech recorded in the browser."""
+
+import io
+import wave
+import numpy as np
+
+def read_wav(data):
+    """Decode WAV bytes into mono float32 samples in [-1, 1] and the sample rate."""
+    with wave.open(io.BytesIO(data)) as wav_file:
+        rate = wav_file.getframerate()
+        width = wav_file.getsampwidth()
+        channels = wav_file.getnchannels()
+        frames = wav_file.readframes(wav_file.getnframes())
+    
+    if width == 1:
+        samples = (np.frombuffer(frames, dtype=np.uint8).astype(np.float32) - 128) / 128
+    else:
+        dtype = {2: np.int16, 4: np.int32}[width]
+        samples = np.frombuffer(frames, dtype=dtype).astype(np.float32) / float(2 ** (8 * width - 1))
+    
+    if channels > 1:
+        samples = samples[:len(samples) - len(samples) % channels].reshape(-1, channels).mean(axis=1)
+    return samples, rate
+
+def to_pcm16(samples):
+    """Encode float samples as 16-bit little-endian PCM bytes."""
+    return (np.clip(samples, -1, 1) * 32767).astype('<i2').tobytes()
+
+def split_utterances(samples, rate, frame_ms=30, margin_db=12, max_floor_db=-40, min_speech_ms=250,
+                     min_silence_ms=400, max_utterance_s=15, padding_ms=150):
+    """Split a recording into utterances; returns (start, end) sample ranges.
+    
+    A frame is speech when its energy is margin_db above the noise floor,
+    estimated from the quietest frames of the same recording but never
+    above max_floor_db (dBFS), so speech without pauses is not taken for
+    noise. An utterance ends after min_silence_ms of non-speech, or at
+    max_utterance_s so no single chunk gets too long for the recognizer.
+    """
+    frame = max(1, int(rate * frame_ms / 1000))
+    count = len(samples) // frame
+    if count == 0:
+        return []
+    
+    frames = samples[:count * frame].reshape(count, frame)
+    energy = 10 * np.log10(np.mean(frames ** 2, axis=1) + 1e-10)
+    threshold = max(min(np.percentile(energy, 10), max_floor_db) + margin_db, -50)
+    voiced = energy > threshold
+    
+    min_speech = max(1, min_speech_ms // frame_ms)
+    min_silence = max(1, min_silence_ms // frame_ms)
+    max_frames = int(max_utterance_s * 1000 / frame_ms)
+    padding = int(rate * padding_ms / 1000)
+    
+    utterances = []
+    start = None
+    speech = silence = 0
+    
+    for index in range(count + 1):
+        is_voiced = index < count and voiced[index]
+        
+        if start is None:
+            if is_voiced:
+                start, speech, silence = index, 1, 0
+            continue
+        
+        if is_voiced:
+            speech += 1
+            silence = 0
+        else:
+            silence += 1
+        
+        if index == count or silence >= min_silence or index - start >= max_frames:
+            if speech >= min_speech:
+                end = index - silence + 1
+                utterances.append((max(0, start * frame - padding), min(len(samples), end * frame + padding)))
+            start = None
+    
+    return utterances
\ No newline at end of file